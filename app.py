@@ -1,26 +1,45 @@
-from flask import Flask, render_template, request, jsonify, send_file, url_for, jsonify
+from flask import Flask, render_template, request, jsonify, send_file, url_for, jsonify, Response
 from flask_cors import CORS  # Add CORS import
 from bs4 import BeautifulSoup
-import pandas as pd
 import os
 import asyncio
 import aiohttp
 from datetime import datetime, timedelta
-from concurrent.futures import ThreadPoolExecutor
-from urllib.parse import quote, urlencode
 import time
 import random
 from fake_useragent import UserAgent
 from aiohttp_retry import RetryClient, ExponentialRetry
 import json
+import shutil
+import hashlib
+import threading
 import logging
 from logging.handlers import RotatingFileHandler
 import sys
 import traceback
 from functools import wraps
 from scrapers.yellowpages_scraper import YellowPagesScraper
+from scrapers.yellowpages_scraper_new import (
+    YellowPagesScraper as YellowPagesSpiderScraper,
+    get_crawl_runner
+)
 from scrapers.sulekha_scraper import SulekhaScraper
 from scrapers.justdial_scraper import JustDialScraper
+from scrapers.response_cache import ResponseCache
+from scrapers.result_cache import ResultCache, result_key
+from scrapers.rate_limiter import HostRateLimiter, THROTTLE_STATUSES
+from scrapers.circuit_breaker import CircuitBreakers, CircuitOpenError, HALF_OPEN, parse_retry_after
+from scrapers.connection_profile import ConnectionProfile
+from scrapers.proxy_pool import ProxyPool
+from scrapers.parse_pool import ParsePool
+from scrapers.job_queue import JobManager, JobError
+from scrapers.driver_pool import DriverPool, DriverPoolTimeout
+from scrapers.enrichment import WebsiteEnricher
+from scrapers.enrichment_cache import EnrichmentCache
+from scrapers.excel_export import ScrapeExcelExport, YellowPagesExcelExport
+from scrapers.pipelines import read_jsonl_feed
+from scrapers.listing_parser import parse_justdial_page
+from scrapers.http_client import get_session, get_pool_stats, configure as configure_http_client
 import re
 
 
@@ -158,6 +177,13 @@ class ScraperStats:
             'success_rate': f"{self.get_success_rate():.2f}%",
             'total_businesses_found': self.total_businesses_found,
             'session_duration': self.get_session_duration(),
+            'connection_pool': get_pool_stats(),
+            'rate_limits': scraper_utils.rate_limiter.stats(),
+            'parse_pool': parse_pool.stats(),
+            'proxy_pool': scraper_utils.proxy_pool.stats(),
+            'circuit_breakers': scraper_utils.breakers.stats(),
+            'connection_profile': connection_profile.stats(),
+            'result_cache': result_cache.stats(),
             'errors': self.errors
         }
 
@@ -170,12 +196,67 @@ def load_config():
         'max_retries': 3,
         'proxy_enabled': False,
         'proxy_list': [],
-        'rate_limit': 2,  # seconds between requests
+        'proxy_free_sources': False,  # also pool proxies from public free proxy lists
+        'proxy_check_url': 'https://www.google.com/generate_204',
+        'proxy_check_timeout': 8,  # seconds per health check
+        'proxy_check_concurrency': 50,  # health checks in flight at once
+        'proxy_refresh_minutes': 10,  # sources re-fetched and every proxy re-checked
+        'proxy_ewma_alpha': 0.3,  # weight of the newest latency/success sample
+        'rate_limit': 2,  # seconds between requests (initial per-host rate)
+        'rate_limit_burst': 2,  # requests a host may receive back to back
+        'rate_limit_max_per_second': 2.0,  # ceiling the AIMD increase can reach
+        'rate_limit_min_per_second': 0.05,  # floor after repeated 429/403 responses
+        'rate_limit_increase': 0.05,  # req/s added back per successful response
+        'rate_limit_backoff': 0.5,  # rate multiplier on 429/403
         'max_concurrent_requests': 3,
+        'connection_limit': 100,  # pooled connections shared by all fetch paths
+        'connection_limit_per_host': 8,
+        'keepalive_timeout': 30,  # seconds
+        'dns_cache_ttl': 300,  # seconds
+        'parse_workers': 0,  # 0 = pick from CPU count
+        'parse_pool_mode': 'process',  # 'thread' for parsers that release the GIL
+        'parse_queue_size': 4,  # fetched pages waiting to be parsed
+        'job_workers': 2,  # scrape jobs running at the same time
+        'job_result_ttl_minutes': 60,  # how long finished job results are kept
+        'result_cache_path': os.path.join('cache', 'results.sqlite3'),  # finished results per search
+        'result_cache_files_dir': os.path.join('cache', 'results'),  # their workbooks and feeds
+        'result_cache_ttl_hours': 6,  # repeat searches are answered from the cache for this long
+        'result_cache_stale_hours': 48,  # then still answered, while one background job refreshes them
+        'result_cache_refresh_lease_minutes': 30,  # a refresh that has not finished by then may be retried
+        # 'selenium' drives pooled Chrome; 'scrapy' runs YellowPagesSpider in the crawler process
+        'yellowpages_engine': 'selenium',
+        'scrapy_profile': 'default',  # 'throughput': more parallel, keep-alive crawls (scrapy engine)
+        'crawl_jobs_dir': os.path.join('cache', 'crawls'),  # resumable state of unfinished spider crawls
+        'driver_pool_size': 2,  # warm Chrome instances for YellowPages; 0 = one browser per job
+        'driver_max_uses': 20,  # leases before a browser is replaced
+        'driver_max_age_minutes': 60,
+        'driver_max_memory_mb': 1500,  # browser + renderer RSS (needs psutil)
+        'driver_lease_timeout': 900,  # seconds a job waits for a free browser
+        'enrich_max_concurrency': 10,  # business websites fetched at once
+        'enrich_per_domain': 2,  # of those, from the same host
+        'enrich_deadline': 20,  # seconds per website once its fetch starts
+        'enrichment_cache_path': os.path.join('cache', 'enrichment.sqlite3'),
+        'enrichment_cache_ttl_hours': 168,  # then revalidated with ETag/Last-Modified
+        'enrichment_cache_max_stale_days': 30,  # unvalidated entries are dropped after this
+        # HTML parser per platform: 'html.parser', 'lxml' or 'selectolax'
+        # (see `python benchmark.py parsers`); missing ones fall back to html.parser
+        'parser_backends': {
+            'justdial': 'lxml',
+            'sulekha': 'lxml',
+            'yellowpages': 'lxml'
+        },
         'user_agent_rotation': True,
         'save_raw_html': False,
         'cache_duration': 24,  # hours
-        'blocked_ip_timeout': 30,  # minutes
+        'cache_path': os.path.join('cache', 'responses.sqlite3'),
+        'cache_max_size_mb': 200,  # compressed bodies on disk
+        'blocked_ip_timeout': 30,  # minutes; longest cool-down of a blocked proxy or host
+        'breaker_path': os.path.join('cache', 'breakers.sqlite3'),  # shared by every worker
+        'breaker_failure_threshold': 3,  # 403/429s in a row that open a proxy's or host's breaker
+        'breaker_cooldown': 60,  # seconds of the first cool-down; doubles each time it reopens
+        'breaker_wait_budget': 120,  # seconds a scrape may wait out a host's cool-down before giving up on it
+        'connection_profile_ttl_minutes': 30,  # IP/country lookup reused by requests for this long
+        'connection_ip_check_seconds': 60,  # egress IP polled this often to notice VPN/proxy switches
     }
     
     try:
@@ -197,15 +278,38 @@ except Exception:
 class ScraperUtils:
     def __init__(self):
         self.config = load_config()
-        self.blocked_ips = {}
-        self.cache = {}
-        self.last_request_time = {}
-    
-    def reset_state(self):
-        """Reset all state data between requests"""
-        self.blocked_ips = {}
-        self.cache = {}
-        self.last_request_time = {}
+        # Per-host token buckets shared by every fetch path; kept across requests
+        # so the rate each site tolerates is remembered
+        self.rate_limiter = HostRateLimiter(
+            rate=1 / self.config['rate_limit'] if self.config['rate_limit'] else self.config['rate_limit_max_per_second'],
+            burst=self.config['rate_limit_burst'],
+            min_rate=self.config['rate_limit_min_per_second'],
+            max_rate=self.config['rate_limit_max_per_second'],
+            increase=self.config['rate_limit_increase'],
+            backoff=self.config['rate_limit_backoff']
+        )
+        # Shared on-disk cache, deliberately kept across requests and restarts
+        self.response_cache = ResponseCache(
+            self.config['cache_path'],
+            ttl_hours=self.config['cache_duration'],
+            max_bytes=self.config['cache_max_size_mb'] * 1024 * 1024
+        )
+        # Blocked proxies and hosts cool down here, across jobs, workers and restarts
+        self.breakers = CircuitBreakers(
+            self.config['breaker_path'],
+            failure_threshold=self.config['breaker_failure_threshold'],
+            cooldown=self.config['breaker_cooldown'],
+            max_cooldown=self.config['blocked_ip_timeout'] * 60
+        )
+        # Proxies scored by latency and success; proxy_list entries are never dropped
+        self.proxy_pool = ProxyPool(
+            static_proxies=self.config['proxy_list'],
+            check_url=self.config['proxy_check_url'],
+            check_timeout=self.config['proxy_check_timeout'],
+            check_concurrency=self.config['proxy_check_concurrency'],
+            alpha=self.config['proxy_ewma_alpha'],
+            refresh_interval=self.config['proxy_refresh_minutes'] * 60
+        )
     
     def get_random_user_agent(self):
         if ua and self.config['user_agent_rotation']:
@@ -216,49 +320,74 @@ class ScraperUtils:
         return 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
     
     def get_proxy(self):
-        if not self.config['proxy_enabled'] or not self.config['proxy_list']:
+        if not self.config['proxy_enabled']:
             return None
-        return random.choice(self.config['proxy_list'])
+        # The first use starts the background checks that keep the scores current
+        self.proxy_pool.start(job_manager.loop)
+        blocked = {key[len('proxy:'):] for key in self.breakers.blocked('proxy:')}
+        return self.proxy_pool.choose(exclude=blocked)
     
     def is_ip_blocked(self, ip):
-        if ip in self.blocked_ips:
-            block_time = self.blocked_ips[ip]
-            if datetime.now() - block_time < timedelta(minutes=self.config['blocked_ip_timeout']):
-                return True
-            del self.blocked_ips[ip]
-        return False
+        return bool(self.breakers.retry_after(f'proxy:{ip}'))
     
-    def mark_ip_blocked(self, ip):
-        self.blocked_ips[ip] = datetime.now()
+    def mark_ip_blocked(self, ip, retry_after=0):
+        self.breakers.record_failure(f'proxy:{ip}', retry_after)
+    
+    def blocked_for(self, url):
+        """Seconds until url's host can be fetched again: 0 if it is not blocked or a proxy can reach it"""
+        wait = self.breakers.retry_after(f'host:{self.rate_limiter.host_for(url)}')
+        if wait and self.get_proxy():
+            return 0
+        return wait
     
     def get_from_cache(self, url):
-        if url in self.cache:
-            timestamp, data = self.cache[url]
-            if datetime.now() - timestamp < timedelta(hours=self.config['cache_duration']):
-                return data
-            del self.cache[url]
-        return None
+        return self.response_cache.get(url)
     
     def save_to_cache(self, url, data):
-        self.cache[url] = (datetime.now(), data)
+        self.response_cache.set(url, data)
+    
+    async def wait_for_breaker(self, key, deadline=None):
+        """
+        Wait until key's breaker lets a request through.
+        
+        While another request probes a half-open breaker, its outcome is waited
+        for. An open breaker is waited out if its cool-down ends before deadline
+        (time.monotonic()); otherwise CircuitOpenError is raised. Without a
+        deadline a refused request fails at once.
+        """
+        while not self.breakers.allow(key):
+            state, wait = self.breakers.status(key)
+            remaining = 0 if deadline is None else deadline - time.monotonic()
+            if state == HALF_OPEN:
+                # The probe's result is in the shared store; look again shortly
+                wait = min(wait, 0.5)
+            if wait > remaining:
+                raise CircuitOpenError(key, self.breakers.retry_after(key))
+            await asyncio.sleep(wait)
     
-    async def make_request(self, session, url, headers):
+    async def make_request(self, session, url, headers, stats=None, deadline=None):
+        """Fetch url, through a proxy if one is enabled; deadline bounds waiting for a blocked host"""
         # Check cache first
         cached_data = self.get_from_cache(url)
         if cached_data:
             print(f"Using cached data for {url}")
+            (stats or scraper_stats).cache_hits += 1
             return cached_data
         
-        # Rate limiting
-        current_time = datetime.now()
-        if url in self.last_request_time:
-            time_since_last_request = (current_time - self.last_request_time[url]).total_seconds()
-            if time_since_last_request < self.config['rate_limit']:
-                await asyncio.sleep(self.config['rate_limit'] - time_since_last_request)
+        # Per-host token bucket; concurrent page fetches queue up on it
+        await self.rate_limiter.acquire(url)
         
         # Update headers with random user agent
         headers['User-Agent'] = self.get_random_user_agent()
         
+        # Cached connection details; the lookup never runs on a request's path, and
+        # until the first one completes requests simply go without the header
+        connection_profile.start(job_manager.loop)
+        connection_info = connection_profile.current()
+        if connection_info and connection_info['country']:
+            # Add connection country to headers to help with geolocation
+            headers['Accept-Language'] = f"en-{connection_info['country']},en;q=0.9"
+        
         # Setup retry client
         retry_options = ExponentialRetry(
             attempts=self.config['max_retries'],
@@ -268,41 +397,70 @@ class ScraperUtils:
             statuses={500, 502, 503, 504}
         )
         
-        # Get proxy
+        # Wrap the shared pooled session; the RetryClient is not closed here
+        # because closing it would close the session for every other caller
+        client = RetryClient(
+            client_session=session,
+            retry_options=retry_options
+        )
+        
+        # Get proxy; proxies with an open breaker are never chosen
         proxy = self.get_proxy()
-        if proxy and not self.is_ip_blocked(proxy):
+        used_proxy = False
+        if proxy and self.breakers.allow(f'proxy:{proxy}'):
+            used_proxy = True
+            start = time.monotonic()
             try:
-                async with RetryClient(
-                    client_session=session,
-                    retry_options=retry_options,
-                    proxy=proxy
-                ) as client:
-                    async with client.get(url, headers=headers, timeout=30) as response:
+                async with client.get(url, headers=headers, timeout=30, proxy=proxy) as response:
+                    self.proxy_pool.record(proxy, response.status < 400, time.monotonic() - start)
+                    if response.status in THROTTLE_STATUSES:
+                        # This blocks the proxy, not our own rate or route to the host
+                        self.mark_ip_blocked(proxy, parse_retry_after(response.headers.get('Retry-After')))
+                        print(f"Proxy {proxy} has been blocked")
+                    else:
+                        self.breakers.record_success(f'proxy:{proxy}')
+                        self.rate_limiter.record_response(url, response.status)
                         if response.status == 200:
                             content = await response.text()
                             self.save_to_cache(url, content)
-                            self.last_request_time[url] = current_time
                             return content
-                        elif response.status == 403:
-                            self.mark_ip_blocked(proxy)
-                            print(f"Proxy {proxy} has been blocked")
                         return None
+            except (aiohttp.ClientHttpProxyError, aiohttp.ClientProxyConnectionError) as e:
+                self.proxy_pool.record(proxy, False)
+                # A CONNECT answered with an error, or a refused connection, means
+                # the proxy is turning us away; other connect errors are flakiness
+                if isinstance(e, aiohttp.ClientHttpProxyError) or isinstance(e.os_error, ConnectionRefusedError):
+                    headers_received = getattr(e, 'headers', None) or {}
+                    self.mark_ip_blocked(proxy, parse_retry_after(headers_received.get('Retry-After')))
+                    print(f"Proxy {proxy} refused the request: {str(e)}")
+                else:
+                    print(f"Error with proxy {proxy}: {str(e)}")
             except Exception as e:
+                # Timeouts, DNS and payload errors only lower the proxy's score
+                self.proxy_pool.record(proxy, False)
                 print(f"Error with proxy {proxy}: {str(e)}")
         
-        # Fallback to direct connection
+        # Fallback to direct connection, unless the host keeps refusing it
+        host_key = f'host:{self.rate_limiter.host_for(url)}'
         try:
-            async with RetryClient(
-                client_session=session,
-                retry_options=retry_options
-            ) as client:
-                async with client.get(url, headers=headers, timeout=30) as response:
-                    if response.status == 200:
-                        content = await response.text()
-                        self.save_to_cache(url, content)
-                        self.last_request_time[url] = current_time
-                        return content
-                    return None
+            await self.wait_for_breaker(host_key, deadline)
+        except CircuitOpenError:
+            (stats or scraper_stats).blocked_requests += 1
+            raise
+        try:
+            if used_proxy:
+                await self.rate_limiter.acquire(url)
+            async with client.get(url, headers=headers, timeout=30) as response:
+                self.rate_limiter.record_response(url, response.status)
+                if response.status in THROTTLE_STATUSES:
+                    self.breakers.record_failure(host_key, parse_retry_after(response.headers.get('Retry-After')))
+                else:
+                    self.breakers.record_success(host_key)
+                if response.status == 200:
+                    content = await response.text()
+                    self.save_to_cache(url, content)
+                    return content
+                return None
         except Exception as e:
             print(f"Error making request to {url}: {str(e)}")
             return None
@@ -310,6 +468,60 @@ class ScraperUtils:
 # Initialize scraper utils
 scraper_utils = ScraperUtils()
 
+# All fetch paths share one pooled aiohttp session per event loop
+configure_http_client(
+    limit=scraper_utils.config['connection_limit'],
+    limit_per_host=scraper_utils.config['connection_limit_per_host'],
+    keepalive_timeout=scraper_utils.config['keepalive_timeout'],
+    ttl_dns_cache=scraper_utils.config['dns_cache_ttl']
+)
+
+# HTML parsing runs in worker processes so it never blocks the event loop
+parse_pool = ParsePool(
+    workers=scraper_utils.config['parse_workers'] or None,
+    mode=scraper_utils.config['parse_pool_mode'],
+    queue_size=scraper_utils.config['parse_queue_size']
+)
+
+# Scrapes run as background jobs on one long-lived event loop; routes only
+# enqueue them and report their status
+job_manager = JobManager(
+    workers=scraper_utils.config['job_workers'],
+    result_ttl=scraper_utils.config['job_result_ttl_minutes'] * 60
+)
+
+# Results of finished searches; repeat searches are answered from here
+result_cache = ResultCache(
+    scraper_utils.config['result_cache_path'],
+    scraper_utils.config['result_cache_files_dir'],
+    ttl_hours=scraper_utils.config['result_cache_ttl_hours'],
+    stale_hours=scraper_utils.config['result_cache_stale_hours']
+)
+
+# Chrome instances for Selenium scrapes, started once and leased to jobs
+driver_pool = DriverPool(
+    size=scraper_utils.config['driver_pool_size'],
+    max_uses=scraper_utils.config['driver_max_uses'],
+    max_age=scraper_utils.config['driver_max_age_minutes'] * 60,
+    max_memory_mb=scraper_utils.config['driver_max_memory_mb'],
+    lease_timeout=scraper_utils.config['driver_lease_timeout']
+)
+
+# Business websites are fetched on the job loop while Selenium keeps crawling
+website_enricher = WebsiteEnricher(
+    max_concurrency=scraper_utils.config['enrich_max_concurrency'],
+    per_domain=scraper_utils.config['enrich_per_domain'],
+    deadline=scraper_utils.config['enrich_deadline'],
+    parser_backend=scraper_utils.config['parser_backends'].get('yellowpages'),
+    parse_pool=parse_pool,
+    # Website details per business website, reused by later and overlapping queries
+    cache=EnrichmentCache(
+        scraper_utils.config['enrichment_cache_path'],
+        ttl_hours=scraper_utils.config['enrichment_cache_ttl_hours'],
+        max_stale_days=scraper_utils.config['enrichment_cache_max_stale_days']
+    )
+)
+
 def clean_search_query(query):
     # Remove extra spaces and common typos
     corrections = {
@@ -416,137 +628,14 @@ def extract_location(query):
     
     return clean_search_query(category), location.title() if location else None
 
-async def scrape_page(session, url, headers):
-    max_retries = 3
-    retry_delay = 2
-    
-    for attempt in range(max_retries):
-        try:
-            print(f"Attempting to fetch URL (attempt {attempt + 1}): {url}")
-            async with session.get(url, headers=headers, timeout=30) as response:
-                print(f"Response status: {response.status} for {url}")
-                if response.status == 200:
-                    content = await response.text()
-                    print(f"Successfully fetched content from {url} (length: {len(content)})")
-                    # Print first 200 characters to see what we're getting
-                    print(f"Content preview: {content[:200]}")
-                    return content
-                elif response.status == 429:  # Too Many Requests
-                    print(f"Rate limited on {url}, waiting {retry_delay * (attempt + 1)} seconds")
-                    await asyncio.sleep(retry_delay * (attempt + 1))
-                    continue
-                else:
-                    print(f"Error status {response.status} for {url}")
-                    return None
-        except Exception as e:
-            print(f"Error fetching {url} (attempt {attempt + 1}): {str(e)}")
-            if attempt < max_retries - 1:
-                await asyncio.sleep(retry_delay * (attempt + 1))
-            else:
-                return None
-    return None
-
-async def process_listing(listing, platform='justdial'):
-    business_data = {
-        'Company Name': '',
-        'Phone': '',
-        'Email': '',
-        'Website': '',
-        'About': '',
-        'Social Links': '',
-        'Address': ''
-    }
-    
-    try:
-        if platform == 'justdial':
-            # Company Name - multiple possible class names
-            name_elem = listing.find(['span', 'a', 'h2'], {
-                'class': ['jcn', 'store-name', 'lng_cont_name', 'jsx-3349e7cd87e12d75', 'company-name']
-            })
-            if not name_elem:
-                name_elem = listing.find(['a', 'h2'], {'data-test': 'business-name'})
-            if name_elem:
-                business_data['Company Name'] = name_elem.text.strip()
-            
-            # Phone - check for multiple patterns
-            phone_elem = listing.find(['p', 'span', 'a', 'div'], {
-                'class': ['contact-info', 'mobilesv', 'tel', 'jsx-3349e7cd87e12d75 contact', 'phone-number']
-            })
-            if not phone_elem:
-                phone_elem = listing.find(['span', 'div'], {'data-test': 'phone-number'})
-            if phone_elem:
-                business_data['Phone'] = phone_elem.text.strip()
-            
-            # Address - multiple possible locations
-            addr_elem = listing.find(['p', 'span', 'div'], {
-                'class': ['address-info', 'cont_fl_addr', 'jsx-3349e7cd87e12d75 address', 'business-address']
-            })
-            if not addr_elem:
-                addr_elem = listing.find(['span', 'div'], {'data-test': 'business-address'})
-            if addr_elem:
-                business_data['Address'] = addr_elem.text.strip()
-                
-        elif platform == 'sulekha':
-            # Company Name
-            name_elem = listing.find(['h2', 'h3', 'a', 'div'], {
-                'class': ['business-name', 'bname', 'vendor-name', 'listing-name']
-            })
-            if name_elem:
-                business_data['Company Name'] = name_elem.text.strip()
-            
-            # Phone
-            phone_elem = listing.find(['p', 'span', 'div'], {
-                'class': ['phone', 'contact', 'vendor-phone', 'business-phone']
-            })
-            if phone_elem:
-                business_data['Phone'] = phone_elem.text.strip()
-            
-            # Address
-            addr_elem = listing.find(['p', 'div', 'span'], {
-                'class': ['address', 'location', 'vendor-address', 'business-location']
-            })
-            if addr_elem:
-                business_data['Address'] = addr_elem.text.strip()
-        
-        # Common processing for both platforms
-        # Website and email extraction
-        links = listing.find_all('a', href=True)
-        for link in links:
-            href = link.get('href', '').lower()
-            if 'mailto:' in href:
-                business_data['Email'] = href.replace('mailto:', '').strip()
-            elif any(domain in href for domain in ['.com', '.in', '.org', '.net', '.co.in']):
-                if not any(excluded in href for excluded in ['justdial', 'sulekha', 'facebook', 'twitter', 'linkedin', 'instagram']):
-                    business_data['Website'] = href
-        
-        # About/Description
-        about_elem = listing.find(['p', 'div', 'span'], {
-            'class': ['description', 'about', 'desc', 'business-desc', 'vendor-desc']
-        })
-        if about_elem:
-            business_data['About'] = about_elem.text.strip()
-            
-        # Social Links
-        social_links = []
-        social_platforms = ['facebook.com', 'twitter.com', 'linkedin.com', 'instagram.com']
-        for link in links:
-            href = link.get('href', '').lower()
-            if any(platform in href for platform in social_platforms):
-                social_links.append(href)
-        if social_links:
-            business_data['Social Links'] = ', '.join(social_links)
-            
-    except Exception as e:
-        print(f"Error processing listing: {str(e)}")
-        
-    # Print debug info
-    if business_data['Company Name']:
-        print(f"Found business: {business_data['Company Name']}")
-        
-    return business_data
+JUSTDIAL_URL = 'https://www.justdial.com/'
 
 @handle_errors
-async def scrape_justdial(search_query, location=None):
+async def scrape_justdial(search_query, location=None, stats=None, on_page=None):
+    # Each background job passes its own stats; direct callers share the global ones.
+    # on_page(platform, page, listings, businesses) is told about every parsed page.
+    stats = stats or scraper_stats
+    
     # Initialize empty data list
     data = []
     
@@ -569,7 +658,7 @@ async def scrape_justdial(search_query, location=None):
     }
     
     try:
-        scraper_stats.start_session()
+        stats.start_session()
         
         # Format the search query for JustDial's URL structure
         search_query = search_query.replace(' ', '-').lower()
@@ -581,401 +670,134 @@ async def scrape_justdial(search_query, location=None):
         
         logger.info(f"Starting scrape for query: {search_query} in {location}")
         
-        # Try multiple pages
+        # Fetch pages through a bounded in-flight window and hand them to the
+        # parse pool through a bounded queue, so parsing overlaps network I/O.
+        # Pages are still parsed in order, which keeps the "3 empty pages"
+        # stop rule unchanged.
         max_empty_pages = 3
-        empty_page_count = 0
-        page = 1
+        max_pages = 10
+        window = max(1, scraper_utils.config['max_concurrent_requests'])
+        # Pages wait for a cooling-down JustDial until this, then the crawl stops
+        deadline = time.monotonic() + scraper_utils.config['breaker_wait_budget']
+        parse_queue = asyncio.Queue(maxsize=parse_pool.queue_size)
+        session = get_session()
+        
+        def page_url_for(page_number):
+            return base_url if page_number == 1 else f"{base_url}/page-{page_number}"
         
-        while empty_page_count < max_empty_pages and page <= 10:
+        async def fetch_stage():
+            in_flight = {}
+            next_page = 1
             try:
-                page_url = base_url if page == 1 else f"{base_url}/page-{page}"
-                logger.info(f"Fetching page {page}: {page_url}")
+                for page in range(1, max_pages + 1):
+                    # Keep up to `window` pages in flight; the per-host token
+                    # bucket in make_request still paces the actual requests
+                    while next_page <= max_pages and len(in_flight) < window:
+                        logger.info(f"Fetching page {next_page}: {page_url_for(next_page)}")
+                        in_flight[next_page] = asyncio.create_task(
+                            scraper_utils.make_request(session, page_url_for(next_page), headers.copy(), stats, deadline)
+                        )
+                        next_page += 1
+                    
+                    try:
+                        content = await in_flight.pop(page)
+                        await parse_queue.put((page, content, None))
+                    except asyncio.CancelledError:
+                        raise
+                    except Exception as e:
+                        await parse_queue.put((page, None, e))
+            finally:
+                # Stop rule hit (or error): drop pages that are no longer needed
+                for task in in_flight.values():
+                    task.cancel()
+                if in_flight:
+                    await asyncio.gather(*in_flight.values(), return_exceptions=True)
+            await parse_queue.put(None)
+        
+        fetcher = asyncio.create_task(fetch_stage())
+        empty_page_count = 0
+        
+        try:
+            while empty_page_count < max_empty_pages:
+                item = await parse_queue.get()
+                if item is None:
+                    break
+                page, content, error = item
+                
+                if isinstance(error, CircuitOpenError):
+                    # Blocked for longer than the crawl may wait; later pages would be refused too
+                    logger.warning(f"Stopping at page {page}: {str(error)}")
+                    stats.add_error('blocked', str(error))
+                    break
                 
-                async with aiohttp.ClientSession() as session:
-                    content = await scraper_utils.make_request(session, page_url, headers)
+                if error:
+                    logger.error(f"Error on page {page}: {str(error)}")
+                    stats.add_error('request', str(error))
+                    empty_page_count += 1
+                    continue
+                
+                if content:
+                    stats.successful_requests += 1
                     
-                    if content:
-                        scraper_stats.successful_requests += 1
-                        page_data = []
+                    try:
+                        result = await parse_pool.parse(
+                            parse_justdial_page, content, scraper_utils.config['parser_backends'].get('justdial')
+                        )
+                        logger.info(f"Found {result['listings']} listings on page {page}")
                         
-                        try:
-                            soup = BeautifulSoup(content, 'html.parser')
-                            listings = []
-                            
-                            # Look for different types of listing containers
-                            possible_containers = [
-                                {'class': 'store-details'},
-                                {'class': 'jsx-3349e7cd87e12d75'},
-                                {'class': 'resultbox_info'},
-                                {'class': 'business-listing'},
-                                {'class': 'lst_dt'},
-                                {'class': 'cntanr'},
-                                {'data-href': True},
-                                {'itemtype': 'http://schema.org/LocalBusiness'}
-                            ]
-                            
-                            for container in possible_containers:
-                                found = soup.find_all(['div', 'li', 'section'], container)
-                                if found:
-                                    listings.extend(found)
-                            
-                            logger.info(f"Found {len(listings)} listings on page {page}")
-                            
-                            # Process each listing
-                            for listing in listings:
-                                try:
-                                    business_data = extract_business_data(listing, 'justdial')
-                                    if business_data and business_data['Company Name']:
-                                        page_data.append(business_data)
-                                        scraper_stats.total_businesses_found += 1
-                                except Exception as e:
-                                    logger.error(f"Error processing listing: {str(e)}")
-                                    scraper_stats.add_error('parsing', str(e))
-                                    continue
-                            
-                            if page_data:
-                                data.extend(page_data)
-                                empty_page_count = 0
-                            else:
-                                empty_page_count += 1
-                                logger.warning(f"No data found on page {page}")
-                            
-                        except Exception as e:
-                            logger.error(f"Error parsing page {page}: {str(e)}")
-                            scraper_stats.add_error('parsing', str(e))
+                        for error_message in result['errors']:
+                            logger.error(f"Error processing listing: {error_message}")
+                            stats.add_error('parsing', error_message)
+                        
+                        page_data = result['businesses']
+                        stats.total_businesses_found += len(page_data)
+                        if on_page:
+                            on_page('justdial', page, result['listings'], page_data)
+                        
+                        if page_data:
+                            data.extend(page_data)
+                            empty_page_count = 0
+                        else:
                             empty_page_count += 1
-                    else:
-                        scraper_stats.failed_requests += 1
-                        logger.error(f"Failed to fetch page {page}")
+                            logger.warning(f"No data found on page {page}")
+                        
+                    except Exception as e:
+                        logger.error(f"Error parsing page {page}: {str(e)}")
+                        stats.add_error('parsing', str(e))
                         empty_page_count += 1
-                    
-                    await asyncio.sleep(scraper_utils.config['rate_limit'])
-                    page += 1
-                    
-            except Exception as e:
-                logger.error(f"Error on page {page}: {str(e)}")
-                scraper_stats.add_error('request', str(e))
-                empty_page_count += 1
-                page += 1
-                continue
+                else:
+                    stats.failed_requests += 1
+                    logger.error(f"Failed to fetch page {page}")
+                    empty_page_count += 1
+        finally:
+            fetcher.cancel()
+            await asyncio.gather(fetcher, return_exceptions=True)
     
     except Exception as e:
         logger.error(f"Error scraping JustDial: {str(e)}")
-        scraper_stats.add_error('scraping', str(e))
+        stats.add_error('scraping', str(e))
         raise ScraperException(f"Scraping failed: {str(e)}")
     
     finally:
-        scraper_stats.end_session()
+        stats.end_session()
         logger.info("Generating scraping report...")
-        report = scraper_stats.generate_report()
+        report = stats.generate_report()
         logger.info(f"Scraping Report: {json.dumps(report, indent=2)}")
     
     return data
 
-def decode_phone_number(element):
-    """
-    Decode phone numbers from various formats including JustDial's protection mechanisms
-    """
-    if not element:
-        return ''
-        
-    # Dictionary for JustDial's number mapping (commonly used patterns)
-    jd_map = {
-        # Original mapping
-        'icon-dc': '+',
-        'icon-fe': '(',
-        'icon-hg': ')',
-        'icon-ba': '-',
-        'icon-yz': '1',
-        'icon-wx': '2',
-        'icon-vu': '3',
-        'icon-ts': '4',
-        'icon-rq': '5',
-        'icon-po': '6',
-        'icon-nm': '7',
-        'icon-lk': '8',
-        'icon-ji': '9',
-        'icon-acb': '0',
-        # Additional mappings (JustDial uses multiple patterns)
-        'dc': '+',
-        'fe': '(',
-        'hg': ')',
-        'ba': '-',
-        'yz': '1',
-        'wx': '2',
-        'vu': '3',
-        'ts': '4',
-        'rq': '5',
-        'po': '6',
-        'nm': '7',
-        'lk': '8',
-        'ji': '9',
-        'acb': '0',
-        # Newer format
-        'icon-plus': '+',
-        'icon-left': '(',
-        'icon-right': ')',
-        'icon-hyphen': '-',
-        'icon-one': '1',
-        'icon-two': '2',
-        'icon-three': '3',
-        'icon-four': '4',
-        'icon-five': '5',
-        'icon-six': '6',
-        'icon-seven': '7',
-        'icon-eight': '8',
-        'icon-nine': '9',
-        'icon-zero': '0',
-    }
-    
-    try:
-        # First try to get direct text
-        phone = element.text.strip()
-        
-        # If no direct text, try to decode JustDial format
-        if not phone or phone.isspace():
-            # Look for spans with special classes
-            spans = element.find_all(['span', 'a', 'b'], {'class': True})
-            if spans:
-                phone = ''
-                for span in spans:
-                    # Get all classes
-                    classes = span.get('class', [])
-                    # Try to match against all patterns
-                    for cls in classes:
-                        # Remove common prefixes if present
-                        cls = cls.replace('icon-', '').replace('jd-', '').replace('tel-', '')
-                        # Look up in mapping
-                        digit = jd_map.get(cls) or jd_map.get(f"icon-{cls}")
-                        if digit:
-                            phone += digit
-                            
-            # If no spans found, try to find data attributes
-            if not phone:
-                # Check various data attributes JustDial uses
-                for attr in ['data-href', 'data-phone', 'data-tel', 'data-value']:
-                    value = element.get(attr, '')
-                    if value and any(c.isdigit() for c in value):
-                        phone = value
-                        break
-                        
-        # If still no phone, try to get from 'data-href' attribute (common in mobile versions)
-        if not phone or phone.isspace():
-            phone = element.get('data-href', '')
-            
-        # If still no phone, try to get from 'href' attribute (some sites use tel: links)
-        if not phone or phone.isspace():
-            href = element.get('href', '')
-            if href.startswith('tel:'):
-                phone = href.replace('tel:', '')
-                
-        # Clean up the phone number
-        if phone:
-            # Remove all non-digit characters except +()-
-            phone = ''.join(c for c in phone if c.isdigit() or c in '+-() ')
-            # Remove any extra spaces
-            phone = ' '.join(phone.split())
-            # If it's too short or too long, it's probably not a valid phone number
-            if len(''.join(c for c in phone if c.isdigit())) < 5:
-                return ''
-            # Format the number if it looks like an Indian phone number
-            digits = ''.join(c for c in phone if c.isdigit())
-            if len(digits) == 10:
-                return f"+91 {digits[:3]}-{digits[3:6]}-{digits[6:]}"
-            elif len(digits) > 10:
-                return f"+{digits[:2]} {digits[2:5]}-{digits[5:8]}-{digits[8:]}"
-                
-        return phone
-    except Exception as e:
-        print(f"Error decoding phone number: {str(e)}")
-        return ''
-
-def extract_complete_address(listing):
-    """Extract complete address from listing with multiple fallback methods"""
-    address_parts = []
-    
-    try:
-        # Look for structured address containers
-        address_containers = []
-        
-        # Main address containers
-        address_containers.extend(listing.find_all(['div', 'p', 'span'], {
-            'class': lambda x: x and any(term in str(x).lower() 
-                for term in ['address', 'location', 'area', 'full-address', 'map-address'])
-        }))
-        
-        # JustDial specific address containers
-        address_containers.extend(listing.find_all(['div', 'p'], {
-            'class': lambda x: x and any(term in str(x).lower() 
-                for term in ['cont_fl_addr', 'address-info', 'lng_add'])
-        }))
-        
-        # Look for schema.org structured data
-        address_containers.extend(listing.find_all(['div', 'span'], {
-            'itemprop': 'address'
-        }))
-        
-        # Process each container
-        for container in address_containers:
-            # Try to find structured address parts
-            parts = {}
-            
-            # Look for specific address components
-            for part in ['streetAddress', 'addressLocality', 'addressRegion', 'postalCode']:
-                elem = container.find(['span', 'div'], {'itemprop': part})
-                if elem:
-                    parts[part] = elem.text.strip()
-            
-            # If we found structured parts, combine them
-            if parts:
-                structured_addr = ' '.join(filter(None, [
-                    parts.get('streetAddress', ''),
-                    parts.get('addressLocality', ''),
-                    parts.get('addressRegion', ''),
-                    parts.get('postalCode', '')
-                ]))
-                if structured_addr:
-                    address_parts.append(structured_addr)
-            else:
-                # If no structured parts, get the full text
-                text = container.text.strip()
-                if text:
-                    address_parts.append(text)
-        
-        # Look for address in data attributes
-        for elem in listing.find_all(['div', 'span', 'a'], {'data-address': True}):
-            addr = elem.get('data-address', '').strip()
-            if addr:
-                address_parts.append(addr)
-        
-        # Clean up and combine addresses
-        cleaned_addresses = []
-        for addr in address_parts:
-            # Basic cleanup
-            addr = addr.strip()
-            addr = ' '.join(addr.split())  # Remove extra whitespace
-            addr = addr.replace('\n', ', ').replace('\r', ', ')
-            
-            # Remove common prefixes
-            prefixes = ['address:', 'location:', 'full address:', 'map address:']
-            for prefix in prefixes:
-                if addr.lower().startswith(prefix):
-                    addr = addr[len(prefix):].strip()
-            
-            # Remove very short or invalid addresses
-            if len(addr) > 10 and not addr.isdigit():
-                cleaned_addresses.append(addr)
-        
-        # Remove duplicates while preserving order
-        seen = set()
-        final_addresses = []
-        for addr in cleaned_addresses:
-            if addr.lower() not in seen:
-                seen.add(addr.lower())
-                final_addresses.append(addr)
-        
-        # Combine all unique addresses
-        if final_addresses:
-            return ' | '.join(final_addresses)
-        
-        return ''
-        
-    except Exception as e:
-        print(f"Error extracting address: {str(e)}")
-        return ''
-
-def extract_business_data(listing, platform):
-    """Helper function to extract business data from a listing."""
-    business_data = {
-        'Company Name': '',
-        'Phone': '',
-        'Email': '',
-        'Website': '',
-        'About': '',
-        'Social Links': '',
-        'Address': '',
-        'Rating': '',
-        'Reviews Count': '',
-        'Categories': '',
-        'Working Hours': '',
-        'Features': ''
-    }
-    
-    try:
-        # Company Name with multiple fallbacks
-        for tag in ['h2', 'h3', 'a', 'span', 'div']:
-            for class_pattern in ['name', 'title', 'heading', 'bname']:
-                name_elem = listing.find(tag, {'class': lambda x: x and class_pattern in str(x).lower()})
-                if name_elem:
-                    business_data['Company Name'] = name_elem.text.strip()
-                    break
-            if business_data['Company Name']:
-                break
-        
-        # Phone number extraction (using existing enhanced code)
-        phone_numbers = set()
-        phone_containers = []
-        
-        # Direct phone elements
-        phone_containers.extend(listing.find_all(['p', 'span', 'div', 'a', 'b'], {
-            'class': lambda x: x and any(term in str(x).lower() for term in ['phone', 'mobile', 'contact', 'tel', 'mob', 'call'])
-        }))
-        
-        # Process each container for phone numbers
-        for container in phone_containers:
-            phone = decode_phone_number(container)
-            if phone:
-                phone_numbers.add(phone)
-        
-        if phone_numbers:
-            business_data['Phone'] = ' / '.join(sorted(phone_numbers))
-        
-        # Enhanced address extraction
-        business_data['Address'] = extract_complete_address(listing)
-        
-        # Website and email extraction
-        links = listing.find_all('a', href=True)
-        for link in links:
-            href = link.get('href', '').lower()
-            if 'mailto:' in href:
-                business_data['Email'] = href.replace('mailto:', '').strip()
-            elif any(domain in href for domain in ['.com', '.in', '.org', '.net', '.co.in']):
-                if not any(excluded in href for excluded in ['justdial', 'sulekha', 'facebook', 'twitter', 'linkedin', 'instagram']):
-                    business_data['Website'] = href
-        
-        # Rating extraction
-        rating_elem = listing.find(['span', 'div'], {'class': lambda x: x and 'rating' in str(x).lower()})
-        if rating_elem:
-            rating = rating_elem.text.strip()
-            import re
-            rating_match = re.search(r'(\d+(\.\d+)?)', rating)
-            if rating_match:
-                business_data['Rating'] = rating_match.group(1)
-        
-        # Reviews count extraction
-        reviews_elem = listing.find(['span', 'div'], {'class': lambda x: x and 'review' in str(x).lower()})
-        if reviews_elem:
-            reviews = reviews_elem.text.strip()
-            import re
-            count_match = re.search(r'(\d+)', reviews)
-            if count_match:
-                business_data['Reviews Count'] = count_match.group(1)
-        
-        # Clean up empty fields
-        business_data = {k: v for k, v in business_data.items() if v}
-        
-        return business_data
-        
-    except Exception as e:
-        print(f"Error extracting business data: {str(e)}")
-        return None
-
-async def scrape_sulekha(search_query, location=None):
+async def scrape_sulekha(search_query, location=None, on_page=None):
     # Initialize the scraper with the API key
-    scraper = SulekhaScraper(SCRAPER_API_KEY)
+    scraper = SulekhaScraper(
+        SCRAPER_API_KEY,
+        cache=scraper_utils.response_cache,
+        rate_limiter=scraper_utils.rate_limiter,
+        parse_pool=parse_pool,
+        parser_backend=scraper_utils.config['parser_backends'].get('sulekha')
+    )
 
     # Just call the internal scraper logic and return the data
-    data = await scraper.scrape(search_query, location)
+    data = await scraper.scrape(search_query, location, on_page=on_page)
     return data
 
 @app.route('/', methods=['GET'])
@@ -985,9 +807,6 @@ def index():
 @app.route('/scrape', methods=['POST'])
 def scrape():
     try:
-        # Reset all states at the start of each request
-        scraper_utils.reset_state()
-        
         search_query = request.form.get('search_query')
         platform = request.form.get('platform')
         
@@ -1008,215 +827,14 @@ def scrape():
             return render_template('index.html', 
                                  error='Please provide a business category (e.g., Hotels, Restaurants, Plumbers)')
         
-        # Reset stats for new session
-        global scraper_stats
-        scraper_stats = ScraperStats()
-        
-        # Create event loop and run async scraping
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        data = []
-        try:
-            logger.info(f"\nStarting scraping process...")
-            if platform == 'justdial':
-                logger.info(f"Scraping JustDial for {category} in {location}")
-                data = loop.run_until_complete(scrape_justdial(category, location))
-            elif platform == 'sulekha':
-                logger.info(f"Scraping Sulekha for {category} in {location}")
-                data = loop.run_until_complete(scrape_sulekha(category, location))
-            elif platform == 'all':
-                logger.info(f"Scraping all platforms for {category} in {location}")
-                justdial_data, sulekha_data = loop.run_until_complete(asyncio.gather(
-                    scrape_justdial(category, location),
-                    scrape_sulekha(category, location)
-                ))
-                justdial_data = justdial_data or []
-                sulekha_data = sulekha_data or []
-                data = justdial_data + sulekha_data
-        except Exception as e:
-            logger.error(f"Error during scraping: {str(e)}")
-            scraper_stats.add_error('scraping', str(e))
-            raise
-        finally:
-            loop.close()
-        
-        logger.info(f"\nScraping completed. Found {len(data)} results")
-        
-        if not data:
-            suggestions = [
-                f"Try adding a location (e.g., {category} in London)",
-                f"Try a different category (e.g., {category}s, {category} Services)",
-                "Check for spelling mistakes",
-                "Try searching on a single platform instead of all"
-            ]
-            return render_template('index.html', 
-                                 error=f'No data found for "{search_query}" on {platform}.', 
-                                 suggestions=suggestions)
-        
-        # Generate scraping report
-        report = scraper_stats.generate_report()
-        
-        try:
-            # Create meaningful filename with timestamp to ensure uniqueness
-            safe_category = category.replace(' ', '_').lower()
-            safe_location = location.replace(' ', '_').lower() if location else 'all'
-            safe_platform = platform.lower()
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            
-            filename = f"{safe_category}_{safe_location}_{safe_platform}_{timestamp}.xlsx"
-            
-            # Ensure downloads directory exists
-            os.makedirs('downloads', exist_ok=True)
-            filepath = os.path.join('downloads', filename)
-            
-            # Clean up old files before creating new one
-            try:
-                current_time = datetime.now()
-                for f in os.listdir('downloads'):
-                    if f.endswith('.xlsx'):
-                        file_path = os.path.join('downloads', f)
-                        # Remove files older than 1 hour
-                        if current_time - datetime.fromtimestamp(os.path.getctime(file_path)) > timedelta(hours=1):
-                            try:
-                                os.remove(file_path)
-                                logger.info(f"Removed old file: {f}")
-                            except Exception as e:
-                                logger.error(f"Error removing old file {f}: {str(e)}")
-            except Exception as e:
-                logger.error(f"Error during file cleanup: {str(e)}")
-            
-            # Create DataFrame with all possible columns
-            all_columns = set()
-            for item in data:
-                if isinstance(item, dict):  # Ensure item is a dictionary
-                    all_columns.update(item.keys())
-            
-            # Sort columns in a logical order
-            column_order = [
-                'Name',
-                'Phone',
-                'Email',
-                'Website',
-                'Address Line 1',
-                'Address Line 2',
-                'Owner Name',
-                'Rating',
-                'Reviews Count',
-                'Category',
-                'Categories',  # For YellowPages
-                'Description',
-                'Company Name',
-                'Source'  # For YellowPages
-            ]
-            
-            # Add any additional columns that might exist
-            remaining_columns = sorted(list(all_columns - set(column_order)))
-            column_order.extend(remaining_columns)
-            
-            # Create DataFrame with ordered columns, handle empty data case
-            if not data:
-                df = pd.DataFrame(columns=['Name'])  # Create empty DataFrame with at least Name column
-            else:
-                df = pd.DataFrame(data)
-                
-                # Ensure all expected columns exist
-                for col in column_order:
-                    if col not in df.columns:
-                        df[col] = ''
-            
-            # Reorder columns (only include columns that exist in the data)
-            existing_columns = [col for col in column_order if col in df.columns]
-            if existing_columns:  # Only reorder if there are columns
-                df = df[existing_columns]
-            
-            # Clean up the data
-            for col in df.columns:
-                # Replace empty strings and None with NaN
-                df[col] = df[col].replace(['', None], pd.NA)
-                
-                # Clean up text fields
-                if df[col].dtype == 'object':
-                    df[col] = df[col].str.strip()
-                    df[col] = df[col].str.replace('\n', ' ')
-                    df[col] = df[col].str.replace('\r', ' ')
-                    df[col] = df[col].str.replace('\t', ' ')
-                    df[col] = df[col].str.replace('  ', ' ')
-            
-            # Remove duplicates
-            duplicate_subset = ['Name']
-            if 'Phone' in df.columns:
-                duplicate_subset.append('Phone')
-            if 'Address' in df.columns:
-                duplicate_subset.append('Address')
-            
-            df = df.drop_duplicates(subset=duplicate_subset, keep='first')
-            
-            # Create Excel writer object with xlsxwriter engine
-            writer = pd.ExcelWriter(filepath, engine='xlsxwriter')
-            
-            # Write the dataframe to Excel
-            df.to_excel(writer, index=False, sheet_name='Business Data')
-            
-            # Write the scraping report to a new sheet
-            report_df = pd.DataFrame([report])
-            report_df.to_excel(writer, index=False, sheet_name='Scraping Report')
-            
-            # Get the xlsxwriter workbook and worksheet objects
-            workbook = writer.book
-            worksheet = writer.sheets['Business Data']
-            
-            # Add formats
-            header_format = workbook.add_format({
-                'bold': True,
-                'text_wrap': True,
-                'valign': 'top',
-                'fg_color': '#D7E4BC',
-                'border': 1
-            })
-            
-            # Write the column headers with the header format
-            for col_num, value in enumerate(df.columns.values):
-                worksheet.write(0, col_num, value, header_format)
-            
-            # Set column widths
-            for i, col in enumerate(df.columns):
-                max_length = max(
-                    df[col].astype(str).apply(len).max(),
-                    len(str(col))
-                ) + 2
-                worksheet.set_column(i, i, min(max_length, 50))
-            
-            # Add auto-filter
-            worksheet.autofilter(0, 0, len(df), len(df.columns) - 1)
-            
-            # Save the workbook
-            writer.close()
-            
-            logger.info(f"Created Excel file: {filename} with {len(df)} unique entries")
-            
-            # Return JSON response with file download URL and stats
-            response_data = {
-                'success': True,
-                'data': data,
-                'count': len(df),
-                'excel_file': filename,
-                'download_url': url_for('download_file', filename=filename),
-                'stats': {
-                    'total_results': len(df),
-                    'platform': platform,
-                    'query': search_query
-                }
-            }
-            return jsonify(response_data)
-            
-        except Exception as e:
-            logger.error(f"Error creating Excel file: {str(e)}")
-            scraper_stats.add_error('excel', str(e))
-            return jsonify({
-                'status': 'error',
-                'message': f'Error creating Excel file: {str(e)}. Please try again.'
-            })
+        params = dict(search_query=search_query, platform=platform, category=category, location=location)
+        key = scrape_result_key(platform, category, location)
+        job = cached_result_job('scrape', key, run_scrape_job, **params)
+        if job is None:
+            # The same search submitted while it is still running attaches to that job
+            job = job_manager.submit('scrape', run_scrape_job, flight_key=key, **params)
+            log_submission(job)
+        return jsonify(job_accepted_response(job)), 202
     
     except Exception as e:
         logger.error(f"\nError during scraping: {str(e)}")
@@ -1226,21 +844,330 @@ def scrape():
             'message': f'An error occurred while scraping: {str(e)}. Please try again.'
         })
 
+async def run_scrape_job(job, search_query, platform, category, location):
+    """Background job behind /scrape: crawl, then write the Excel file off the loop"""
+    stats = ScraperStats()
+    
+    # A JustDial that is refusing us (with no proxy to route around it) for longer
+    # than pages may wait fails the job now instead of after every page has been refused
+    justdial_wait = scraper_utils.blocked_for(JUSTDIAL_URL) if platform in ('justdial', 'all') else 0
+    if justdial_wait <= scraper_utils.config['breaker_wait_budget']:
+        justdial_wait = 0
+    if justdial_wait and platform == 'justdial':
+        raise JobError(f'JustDial is blocking our requests; try again in {justdial_wait:.0f} seconds.',
+                       status_code=503, retry_after=round(justdial_wait))
+    
+    # Rows are spooled into the export as pages arrive; the workbook is written at the end
+    os.makedirs('downloads', exist_ok=True)
+    filename = export_filename(category, location, platform)
+    export = ScrapeExcelExport(os.path.join('downloads', filename))
+    report_page = job_page_reporter(job)
+    
+    def on_page(source, page, listings, businesses):
+        export.add_many(businesses)
+        report_page(source, page, listings, businesses)
+    
+    job.update(stage='scraping')
+    
+    data = []
+    try:
+        logger.info(f"\nStarting scraping process...")
+        if platform == 'justdial':
+            logger.info(f"Scraping JustDial for {category} in {location}")
+            data = await scrape_justdial(category, location, stats, on_page)
+        elif platform == 'sulekha':
+            logger.info(f"Scraping Sulekha for {category} in {location}")
+            data = await scrape_sulekha(category, location, on_page)
+        elif platform == 'all' and justdial_wait:
+            logger.warning(f"JustDial is blocked for another {justdial_wait:.0f}s; scraping Sulekha only")
+            data = await scrape_sulekha(category, location, on_page)
+        elif platform == 'all':
+            logger.info(f"Scraping all platforms for {category} in {location}")
+            justdial_data, sulekha_data = await asyncio.gather(
+                scrape_justdial(category, location, stats, on_page),
+                scrape_sulekha(category, location, on_page)
+            )
+            justdial_data = justdial_data or []
+            sulekha_data = sulekha_data or []
+            data = justdial_data + sulekha_data
+    except Exception as e:
+        logger.error(f"Error during scraping: {str(e)}")
+        stats.add_error('scraping', str(e))
+        export.discard()
+        raise
+    
+    logger.info(f"\nScraping completed. Found {len(data or [])} results")
+    job.update(results=len(data or []))
+    
+    if not data:
+        suggestions = [
+            f"Try adding a location (e.g., {category} in London)",
+            f"Try a different category (e.g., {category}s, {category} Services)",
+            "Check for spelling mistakes",
+            "Try searching on a single platform instead of all"
+        ]
+        export.discard()
+        raise JobError(f'No data found for "{search_query}" on {platform}.', status_code=404,
+                       suggestions=suggestions)
+    
+    # Generate scraping report
+    report = stats.generate_report()
+    
+    job.update(stage='writing_excel')
+    try:
+        # Writing the workbook is blocking; keep it off the shared loop
+        count = await asyncio.get_running_loop().run_in_executor(
+            None, finish_excel_export, export, report
+        )
+    except Exception as e:
+        logger.error(f"Error creating Excel file: {str(e)}")
+        stats.add_error('excel', str(e))
+        raise JobError(f'Error creating Excel file: {str(e)}. Please try again.')
+    
+    # download_url is added by /jobs/<id>/result, which has a request context
+    result = {
+        'success': True,
+        'data': data,
+        'count': count,
+        'excel_file': filename,
+        'stats': {
+            'total_results': count,
+            'platform': platform,
+            'query': search_query
+        }
+    }
+    await cache_result(scrape_result_key(platform, category, location), result)
+    return result
+
+def scrape_result_key(platform, category, location):
+    """Result cache key of a /scrape search; category and location come from extract_location"""
+    return result_key(platform, category, location)
+
+def yellowpages_result_key(query, location, min_rating):
+    return result_key('yellowpages', clean_search_query(query), clean_search_query(location),
+                      min_rating=min_rating)
+
+async def cache_result(key, result):
+    """Keep a job's result, and copies of its download files, for repeat searches"""
+    files = {field: os.path.join('downloads', result[field])
+             for field in ('excel_file', 'feed_file') if result.get(field)}
+    # Compressing the rows and copying the workbook are blocking; keep them off the shared loop
+    await asyncio.get_running_loop().run_in_executor(None, result_cache.store, key, result, files)
+
+def cached_result_job(kind, key, func, **params):
+    """
+    A completed job holding the cached result of a search, or None if there is none.
+    
+    The cached files are copied back into downloads under their original names.
+    A stale result is still served, and one background job (func with params)
+    scrapes the search again to refresh the cache.
+    """
+    entry = result_cache.get(key)
+    if entry is None:
+        return None
+    os.makedirs('downloads', exist_ok=True)
+    for field in ('excel_file', 'feed_file'):
+        filename = entry.result.get(field)
+        if filename and not result_cache.copy_file(entry, field, os.path.join('downloads', filename)):
+            # Download is gone; scrape again rather than hand out a broken link
+            return None
+    
+    refreshing = False
+    lease = scraper_utils.config['result_cache_refresh_lease_minutes'] * 60
+    if not entry.fresh and result_cache.claim_refresh(key, lease):
+        refresh = job_manager.submit(kind, func, flight_key=key, **params)
+        refreshing = True
+        logger.info(f"Serving stale {kind} result ({entry.age / 3600:.1f}h old); refreshing in job {refresh.id}")
+    
+    result = dict(entry.result)
+    result['cache'] = {
+        'hit': True,
+        'fresh': entry.fresh,
+        'age_seconds': round(entry.age),
+        'refreshing': refreshing
+    }
+    job = job_manager.add_completed(kind, result, **params)
+    logger.info(f"Answered {kind} job {job.id} from the result cache")
+    return job
+
+def export_filename(category, location, platform):
+    """Create meaningful filename with timestamp to ensure uniqueness"""
+    safe_category = category.replace(' ', '_').lower()
+    safe_location = location.replace(' ', '_').lower() if location else 'all'
+    safe_platform = platform.lower()
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    return f"{safe_category}_{safe_location}_{safe_platform}_{timestamp}.xlsx"
+
+def remove_old_exports(max_age=timedelta(hours=1)):
+    """Remove Excel files and JSON Lines feeds older than max_age from the downloads directory"""
+    try:
+        current_time = datetime.now()
+        for f in os.listdir('downloads'):
+            if f.endswith(('.xlsx', '.jsonl')):
+                file_path = os.path.join('downloads', f)
+                if current_time - datetime.fromtimestamp(os.path.getctime(file_path)) > max_age:
+                    try:
+                        os.remove(file_path)
+                        logger.info(f"Removed old file: {f}")
+                    except Exception as e:
+                        logger.error(f"Error removing old file {f}: {str(e)}")
+    except Exception as e:
+        logger.error(f"Error during file cleanup: {str(e)}")
+
+def finish_excel_export(export, report=None):
+    """Clean up old exports, then write the spooled export; returns the number of unique rows"""
+    remove_old_exports()
+    count = export.finalize(report)
+    logger.info(f"Created Excel file: {os.path.basename(export.filepath)} with {count} unique entries")
+    return count
+
+def job_page_reporter(job):
+    """Build an on_page callback that streams per-page progress and the new rows of a job"""
+    started = time.time()
+    
+    def on_page(platform, page, listings, businesses):
+        job.progress['pages'] = job.progress.get('pages', 0) + 1
+        job.progress['businesses'] = job.progress.get('businesses', 0) + len(businesses)
+        elapsed = time.time() - started
+        job.emit('page', {
+            'platform': platform,
+            'page': page,
+            'listings': listings,
+            'accepted': len(businesses),
+            'total': job.progress['businesses'],
+            # businesses per minute since the job started
+            'rate': round(job.progress['businesses'] / elapsed * 60, 1) if elapsed else 0.0
+        })
+        if businesses:
+            # Only the rows this page added; clients append them
+            job.emit('rows', {'platform': platform, 'rows': businesses})
+    
+    return on_page
+
+def log_submission(job):
+    if job.submissions > 1:
+        logger.info(f"Attached to running {job.kind} job {job.id} ({job.submissions} submissions)")
+    else:
+        logger.info(f"Queued {job.kind} job {job.id}")
+
+def job_accepted_response(job):
+    return {
+        'success': True,
+        'job_id': job.id,
+        'status': job.status,
+        # More than one when identical submissions share this job
+        'submissions': job.submissions,
+        'status_url': url_for('job_status', job_id=job.id),
+        'events_url': url_for('job_events', job_id=job.id),
+        'result_url': url_for('job_result', job_id=job.id)
+    }
+
+@app.route('/jobs/<job_id>')
+def job_status(job_id):
+    """Report the state and progress of a background scrape job"""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'status': 'error', 'message': f'Unknown job: {job_id}'}), 404
+    
+    status = job.to_dict()
+    if job.finished:
+        status['result_url'] = url_for('job_result', job_id=job.id)
+    return jsonify(status)
+
+@app.route('/jobs/<job_id>/events')
+def job_events(job_id):
+    """
+    Stream a job's progress as Server-Sent Events.
+    
+    Event types are 'status', 'page', 'rows' (only the newly accepted rows) and
+    'done'. Every event carries an id, so a reconnecting EventSource resumes
+    after Last-Event-ID instead of replaying the stream.
+    """
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'status': 'error', 'message': f'Unknown job: {job_id}'}), 404
+    
+    try:
+        last_id = int(request.headers.get('Last-Event-ID') or request.args.get('last_event_id') or 0)
+    except ValueError:
+        last_id = 0
+    result_url = url_for('job_result', job_id=job.id)
+    
+    def stream(last_id):
+        while True:
+            events = job.events_after(last_id, timeout=15)
+            if not events:
+                # Comment line keeps proxies from closing an idle stream
+                yield ': keep-alive\n\n'
+                continue
+            for event_id, event, data in events:
+                if event == 'done':
+                    data = {**data, 'result_url': result_url}
+                payload = json.dumps(data, separators=(',', ':'), default=str)
+                yield f"id: {event_id}\nevent: {event}\ndata: {payload}\n\n"
+                last_id = event_id
+                if event == 'done':
+                    return
+    
+    return Response(stream(last_id), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+@app.route('/jobs/<job_id>/result')
+def job_result(job_id):
+    """Return a finished job's response, shaped like the old synchronous endpoints"""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'status': 'error', 'message': f'Unknown job: {job_id}'}), 404
+    
+    if not job.finished:
+        return jsonify({
+            'job_id': job.id,
+            'status': job.status,
+            'status_url': url_for('job_status', job_id=job.id)
+        }), 202
+    
+    if job.status == 'failed':
+        return jsonify({
+            'status': 'error',
+            'message': job.error,
+            **job.error_details
+        }), job.error_status or 500
+    
+    response_data = dict(job.result)
+    response_data['download_url'] = url_for('download_file', filename=job.result['excel_file'])
+    if job.result.get('feed_file'):
+        response_data['feed_url'] = url_for('download_file', filename=job.result['feed_file'])
+    return jsonify(response_data)
+
+@app.route('/http_pool_stats')
+def http_pool_stats():
+    """Expose connection reuse and DNS cache counters of the shared HTTP pool"""
+    return jsonify(get_pool_stats())
+
+# File types /download serves: Excel exports and JSON Lines feeds of spider crawls
+DOWNLOAD_MIMETYPES = {
+    '.xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    '.jsonl': 'application/x-ndjson'
+}
+
 @app.route('/download/<filename>')
 def download_file(filename):
     try:
         # Ensure the file is from the downloads directory and exists
-        if not filename.endswith('.xlsx'):
+        mimetype = DOWNLOAD_MIMETYPES.get(os.path.splitext(filename)[1].lower())
+        if mimetype is None:
             return jsonify({'error': 'Invalid file type'}), 400
             
         filepath = os.path.join('downloads', filename)
         if not os.path.exists(filepath):
             return jsonify({'error': f'File not found: {filepath}'}), 404
             
-        logger.info(f"Sending Excel file: {filepath}")
+        logger.info(f"Sending file: {filepath}")
         return send_file(
             filepath,
-            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+            mimetype=mimetype,
             as_attachment=True,
             download_name=filename
         )
@@ -1253,233 +1180,139 @@ def download_file(filename):
         }), 500
 
 class ProxyManager:
-    def __init__(self):
-        self.proxies = []
-        self.last_update = None
-        self.update_interval = timedelta(minutes=10)
+    """Free proxy list sources feeding scraper_utils.proxy_pool"""
 
-    async def get_proxies(self):
-        """Fetch fresh proxies from multiple free proxy APIs"""
-        if (self.last_update and datetime.now() - self.last_update < self.update_interval 
-            and len(self.proxies) > 0):
-            return self.proxies
+    def __init__(self, pool):
+        self.pool = pool
+        self.sources = [self.fetch_proxyscrape, self.fetch_free_proxy_list, self.fetch_geonode]
 
-        self.proxies = []
-        try:
-            # Try multiple proxy sources
-            async with aiohttp.ClientSession() as session:
-                # Source 1: ProxyScrape API
-                try:
-                    url = "https://api.proxyscrape.com/v2/?request=getproxies&protocol=http&timeout=10000&country=GB&ssl=all&anonymity=all"
-                    async with session.get(url) as response:
-                        if response.status == 200:
-                            text = await response.text()
-                            self.proxies.extend([f"http://{proxy}" for proxy in text.split()])
-                except Exception as e:
-                    print(f"Error fetching from ProxyScrape: {str(e)}")
-
-                # Source 2: Free-Proxy-List API
-                try:
-                    url = "https://www.free-proxy-list.net/"
-                    async with session.get(url) as response:
-                        if response.status == 200:
-                            text = await response.text()
-                            soup = BeautifulSoup(text, 'html.parser')
-                            table = soup.find('table')
-                            if table:
-                                rows = table.find_all('tr')
-                                for row in rows[1:]:  # Skip header row
-                                    cols = row.find_all('td')
-                                    if len(cols) >= 7:
-                                        ip = cols[0].text.strip()
-                                        port = cols[1].text.strip()
-                                        country = cols[3].text.strip()
-                                        if country == 'United Kingdom':
-                                            self.proxies.append(f"http://{ip}:{port}")
-                except Exception as e:
-                    print(f"Error fetching from Free-Proxy-List: {str(e)}")
-
-                # Source 3: GeoNode API
-                try:
-                    url = "https://proxylist.geonode.com/api/proxy-list?limit=100&page=1&sort_by=lastChecked&sort_type=desc&protocols=http%2Chttps&country=GB"
-                    async with session.get(url) as response:
-                        if response.status == 200:
-                            data = await response.json()
-                            for proxy in data.get('data', []):
-                                ip = proxy.get('ip')
-                                port = proxy.get('port')
-                                if ip and port:
-                                    self.proxies.append(f"http://{ip}:{port}")
-                except Exception as e:
-                    print(f"Error fetching from GeoNode: {str(e)}")
-
-            print(f"Found {len(self.proxies)} proxies")
-            self.last_update = datetime.now()
-        except Exception as e:
-            print(f"Error updating proxies: {str(e)}")
-
-        return self.proxies
+    async def fetch_proxyscrape(self):
+        url = "https://api.proxyscrape.com/v2/?request=getproxies&protocol=http&timeout=10000&country=GB&ssl=all&anonymity=all"
+        async with get_session().get(url) as response:
+            if response.status != 200:
+                return []
+            text = await response.text()
+            return [f"http://{proxy}" for proxy in text.split()]
 
-    async def get_working_proxy(self, test_url="https://www.justdial.com"):
-        """Test proxies and return a working one"""
-        if not self.proxies:
-            await self.get_proxies()
+    async def fetch_free_proxy_list(self):
+        url = "https://www.free-proxy-list.net/"
+        proxies = []
+        async with get_session().get(url) as response:
+            if response.status != 200:
+                return proxies
+            text = await response.text()
+        soup = BeautifulSoup(text, 'html.parser')
+        table = soup.find('table')
+        if table:
+            rows = table.find_all('tr')
+            for row in rows[1:]:  # Skip header row
+                cols = row.find_all('td')
+                if len(cols) >= 7:
+                    ip = cols[0].text.strip()
+                    port = cols[1].text.strip()
+                    country = cols[3].text.strip()
+                    if country == 'United Kingdom':
+                        proxies.append(f"http://{ip}:{port}")
+        return proxies
 
-        headers = {
-            'User-Agent': UserAgent().random,
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8'
-        }
+    async def fetch_geonode(self):
+        url = "https://proxylist.geonode.com/api/proxy-list?limit=100&page=1&sort_by=lastChecked&sort_type=desc&protocols=http%2Chttps&country=GB"
+        proxies = []
+        async with get_session().get(url) as response:
+            if response.status != 200:
+                return proxies
+            data = await response.json()
+        for proxy in data.get('data', []):
+            ip = proxy.get('ip')
+            port = proxy.get('port')
+            if ip and port:
+                proxies.append(f"http://{ip}:{port}")
+        return proxies
 
-        for proxy in self.proxies:
-            try:
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(
-                        test_url,
-                        proxy=proxy,
-                        headers=headers,
-                        timeout=10,
-                        ssl=False
-                    ) as response:
-                        if response.status == 200:
-                            print(f"Found working proxy: {proxy}")
-                            return proxy
-            except Exception:
-                continue
+    async def get_proxies(self):
+        """Fetch all sources at once into the pool and return the proxies it knows"""
+        added = await self.pool.fetch_sources(self.sources)
+        print(f"Found {added} new proxies")
+        return list(self.pool.proxies)
 
-        print("No working proxy found, fetching new proxies...")
-        self.proxies = []  # Clear existing proxies
-        await self.get_proxies()
-        return None
+    async def get_working_proxy(self):
+        """Return a proxy by weighted score, checking the pool first if none is known to work"""
+        if not self.pool.healthy():
+            await self.pool.refresh()
+        proxy = self.pool.choose()
+        if proxy is None:
+            print("No working proxy found")
+        return proxy
 
-# Initialize the proxy manager
-proxy_manager = ProxyManager()
+# Initialize the proxy manager; its sources are only fetched when enabled
+proxy_manager = ProxyManager(scraper_utils.proxy_pool)
+if scraper_utils.config['proxy_free_sources']:
+    scraper_utils.proxy_pool.sources.extend(proxy_manager.sources)
 
 async def check_connection_details():
-    """Check current connection details and log information"""
+    """Look up current connection details and log them; requests read connection_profile instead"""
     try:
         logger.info("Checking connection details...")
-        async with aiohttp.ClientSession() as session:
-            # Try multiple IP checking services
-            services = [
-                'https://ipapi.co/json/',
-                'https://api.ipify.org?format=json',
-                'https://ip.seeip.org/json'
-            ]
-            
-            connection_info = {}
-            
-            for service in services:
-                try:
-                    print(f"Trying URL: {search_url}")
-                    scraper_url = f'http://api.scraperapi.com?api_key={SCRAPER_API_KEY}&url={quote(search_url)}&render=true'
-                    async with session.get(scraper_url, headers=headers, timeout=60) as response:
-                        if response.status == 200:
-                            data = await response.json()
-                            connection_info = {
-                                'ip': data.get('ip'),
-                                'country': data.get('country_code', '').upper(),
-                                'country_name': data.get('country_name', 'Unknown'),
-                                'city': data.get('city', 'Unknown'),
-                                'region': data.get('region', 'Unknown'),
-                                'isp': data.get('org', 'Unknown')
-                            }
-                            
-                            logger.info("Connection Details:")
-                            logger.info(f"IP Address: {connection_info['ip']}")
-                            logger.info(f"Country: {connection_info['country']} ({connection_info['country_name']})")
-                            logger.info(f"City: {connection_info['city']}")
-                            logger.info(f"Region: {connection_info['region']}")
-                            logger.info(f"ISP: {connection_info['isp']}")
-                            
-                            # Check if it's likely a VPN connection
-                            is_vpn = any(vpn_term.lower() in connection_info['isp'].lower() 
-                                       for vpn_term in ['vpn', 'proxy', 'hosting', 'cloud', 'data center'])
-                            
-                            if is_vpn:
-                                logger.info("VPN connection detected")
-                            else:
-                                logger.warning("No VPN detected - using direct connection")
-                            
-                            return connection_info
-                except Exception as e:
-                    logger.error(f"Error with IP service {service}: {str(e)}")
-                    continue
-            
-            logger.error("All IP checking services failed")
-            return None
-            
+        session = get_session()
+        
+        # Try multiple IP checking services; only the first reports location and ISP
+        services = [
+            'https://ipapi.co/json/',
+            'https://api.ipify.org?format=json',
+            'https://ip.seeip.org/json'
+        ]
+        
+        connection_info = {}
+        
+        for service in services:
+            try:
+                async with session.get(service, timeout=aiohttp.ClientTimeout(total=10)) as response:
+                    if response.status == 200:
+                        data = await response.json(content_type=None)
+                        connection_info = {
+                            'ip': data.get('ip'),
+                            'country': (data.get('country_code') or '').upper(),
+                            'country_name': data.get('country_name', 'Unknown'),
+                            'city': data.get('city', 'Unknown'),
+                            'region': data.get('region', 'Unknown'),
+                            'isp': data.get('org', 'Unknown')
+                        }
+                        
+                        logger.info("Connection Details:")
+                        logger.info(f"IP Address: {connection_info['ip']}")
+                        logger.info(f"Country: {connection_info['country']} ({connection_info['country_name']})")
+                        logger.info(f"City: {connection_info['city']}")
+                        logger.info(f"Region: {connection_info['region']}")
+                        logger.info(f"ISP: {connection_info['isp']}")
+                        
+                        # Check if it's likely a VPN connection
+                        is_vpn = any(vpn_term.lower() in connection_info['isp'].lower() 
+                                   for vpn_term in ['vpn', 'proxy', 'hosting', 'cloud', 'data center'])
+                        
+                        if is_vpn:
+                            logger.info("VPN connection detected")
+                        else:
+                            logger.warning("No VPN detected - using direct connection")
+                        
+                        return connection_info
+            except Exception as e:
+                logger.error(f"Error with IP service {service}: {str(e)}")
+                continue
+        
+        logger.error("All IP checking services failed")
+        return None
+        
     except Exception as e:
         logger.error(f"Error checking connection details: {str(e)}")
         logger.error(traceback.format_exc())
         return None
 
-async def make_request_with_session(session, url, headers):
-    """Helper function to make requests with proper error handling and retries"""
-    max_retries = 3
-    retry_delay = 2
-    
-    logger.info(f"Making request to: {url}")
-    logger.debug(f"Headers: {headers}")
-    
-    # Check connection details
-    connection_info = await check_connection_details()
-    if connection_info:
-        # Add connection country to headers to help with geolocation
-        headers['Accept-Language'] = f"en-{connection_info['country']},en;q=0.9"
-        logger.debug(f"Updated headers with country: {connection_info['country']}")
-    
-    for attempt in range(max_retries):
-        try:
-            logger.info(f"Request attempt {attempt + 1}/{max_retries}")
-            
-            # Add jitter to delay
-            jitter = random.uniform(0.5, 1.5)
-            delay = retry_delay * jitter
-            logger.debug(f"Waiting {delay:.2f} seconds before request")
-            await asyncio.sleep(delay)
-            
-            # Update headers with a new random user agent
-            headers = headers.copy()
-            headers['User-Agent'] = UserAgent().random
-            logger.debug(f"Using User-Agent: {headers['User-Agent']}")
-            
-            # Make the request using system network settings (VPN if connected)
-            async with session.get(
-                url, 
-                headers=headers, 
-                timeout=30, 
-                allow_redirects=True
-            ) as response:
-                logger.info(f"Response status: {response.status}")
-                logger.debug(f"Response headers: {response.headers}")
-                
-                if response.status == 200:
-                    content = await response.text()
-                    content_length = len(content)
-                    logger.info(f"Successfully fetched content (length: {content_length})")
-                    logger.debug(f"Content preview: {content[:200]}...")
-                    return content
-                elif response.status == 403:
-                    logger.error(f"Access forbidden. Current connection might be blocked.")
-                    if connection_info:
-                        logger.error(f"Try using a different VPN server or location (Current: {connection_info['country_name']})")
-                    return None
-                else:
-                    logger.error(f"Request failed with status {response.status}")
-                    if response.status == 429:
-                        logger.error("Rate limit detected - waiting longer before retry")
-                        await asyncio.sleep(retry_delay * (attempt + 2))
-                    
-            await asyncio.sleep(retry_delay * (attempt + 1))
-            
-        except Exception as e:
-            logger.error(f"Attempt {attempt + 1} failed: {str(e)}")
-            logger.error(traceback.format_exc())
-            if attempt < max_retries - 1:
-                await asyncio.sleep(retry_delay * (attempt + 1))
-            else:
-                return None
-    return None
+# Connection details, looked up in the background; a new egress IP triggers a new lookup
+connection_profile = ConnectionProfile(
+    check_connection_details,
+    ttl=scraper_utils.config['connection_profile_ttl_minutes'] * 60,
+    ip_check_interval=scraper_utils.config['connection_ip_check_seconds']
+)
 
 @app.route('/scrape_yellowpages')
 def scrape_yellowpages_route():
@@ -1501,240 +1334,296 @@ def scrape_yellowpages_route():
                 'message': 'Both query and location parameters are required'
             }), 400
         
-        logger.info(f"Starting Yellow Pages scraping with minimum rating: {min_rating}...")
-        scraper = YellowPagesScraper()
+        params = dict(query=query, location=location, min_rating=min_rating)
+        key = yellowpages_result_key(query, location, min_rating)
+        job = cached_result_job('yellowpages', key, run_yellowpages_job, **params)
+        if job is None:
+            job = job_manager.submit('yellowpages', run_yellowpages_job, flight_key=key, **params)
+            log_submission(job)
+        return jsonify(job_accepted_response(job)), 202
+    
+    except Exception as e:
+        logger.error(f"Error in YellowPages route: {str(e)}")
+        return jsonify({
+            'status': 'error',
+            'message': f'An error occurred: {str(e)}'
+        }), 500
+
+# Job directories of spider crawls running now; one crawl per directory
+active_crawl_dirs = set()
+active_crawl_lock = threading.Lock()
+
+def crawl_job_dir(platform, query, location):
+    """JOBDIR of a search, the same every time it is run so an interrupted crawl can resume"""
+    key = hashlib.sha1(f'{query.strip().lower()}|{location.strip().lower()}'.encode('utf-8')).hexdigest()
+    return os.path.join(scraper_utils.config['crawl_jobs_dir'], f'{platform}_{key[:16]}')
+
+async def run_yellowpages_job(job, query, location, min_rating):
+    """Background job behind /scrape_yellowpages; Selenium and Excel work run in the executor"""
+    loop = asyncio.get_running_loop()
+    logger.info(f"Starting Yellow Pages scraping with minimum rating: {min_rating}...")
+    
+    # Processed rows go into the export as each page is scraped
+    os.makedirs('downloads', exist_ok=True)
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    filename = f'yellowpages_results_{timestamp}.xlsx'
+    export = YellowPagesExcelExport(os.path.join('downloads', filename))
+    processed_data = []
+    report_page = job_page_reporter(job)
+    # Website enrichment of every scraped row, in crawl order
+    enrichments = []
+    enriched = {'websites': 0}
+    
+    async def enrich(item):
+        # A copy, so rows already sent to event streams are not changed underneath them
+        record = await website_enricher.enrich(dict(item))
+        if record.get('Website'):
+            enriched['websites'] += 1
+            job.update(websites_enriched=enriched['websites'])
+        return record
+    
+    def on_page(source, page, listings, businesses):
+        # Runs in the Selenium thread; enrichment starts on the job loop right away
+        for item in businesses:
+            if isinstance(item, dict):
+                enrichments.append(asyncio.run_coroutine_threadsafe(enrich(item), loop))
+        report_page(source, page, listings, businesses)
+    
+    def scrape():
+        with driver_pool.lease() as driver:
+            job.update(stage='scraping')
+            scraper = YellowPagesScraper(
+                parser_backend=scraper_utils.config['parser_backends'].get('yellowpages'),
+                driver=driver,
+                enrich_websites=False
+            )
+            return scraper.scrape_yellowpages(query, location, on_page=on_page)
+    
+    # Every spider item is also appended to the crawl's feed as it is scraped
+    # (see scrapers/pipelines.py); the feed is moved here once the crawl completes
+    feed_file = f'yellowpages_results_{timestamp}.jsonl'
+    # Scheduler state, checkpoint and feed of the crawl, kept until it completes
+    jobdir = crawl_job_dir('yellowpages', query, location)
+    job_feed = os.path.join(jobdir, 'items.jsonl')
+    
+    def crawl():
+        # The spider fetches and caches business websites itself. Its items arrive
+        # already in export field names and are streamed, processed and exported
+        # one by one, so nothing holds the raw crawl in memory
+        job.update(stage='scraping')
+        crawled = {'items': 0}
         
+        def on_item(record):
+            crawled['items'] += 1
+            job.update(businesses=crawled['items'])
+            job.emit('rows', {'platform': 'yellowpages', 'rows': [record]})
+            new_item = process_yellowpages_item(record, min_rating)
+            if new_item:
+                processed_data.append(new_item)
+                export.add(new_item)
+        
+        with active_crawl_lock:
+            if jobdir in active_crawl_dirs:
+                raise JobError(f'A crawl for "{query}" in {location} is already running', status_code=409)
+            active_crawl_dirs.add(jobdir)
         try:
-            data = scraper.scrape_yellowpages(query, location)
-            
-            if not data:
-                return jsonify({
-                    'status': 'error',
-                    'message': 'No results found'
-                }), 404
-
-            # Create downloads directory if it doesn't exist
-            if not os.path.exists('downloads'):
-                os.makedirs('downloads')
-
-            # Generate Excel file
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            filename = f'yellowpages_results_{timestamp}.xlsx'
-            filepath = os.path.join('downloads', filename)
+            # Items saved by an earlier, interrupted run of this search come first
+            resumed = 0
+            for record in read_jsonl_feed(job_feed):
+                on_item(record)
+                resumed += 1
+            if resumed:
+                logger.info(f"Resuming YellowPages crawl in {jobdir} with {resumed} saved results")
+                job.update(resumed_results=resumed)
             
-            # Process the data to split address and handle categories
-            processed_data = []
-            for item in data:
-                if isinstance(item, dict):
-                    # Parse the address into components
-                    address = item.get('Address', '')
-                    address_parts = {
-                        'Address Line 1': '',
-                        'Address Line 2': '',
-                        'City': '',
-                        'State': '',
-                        'ZIP Code': ''
-                    }
-                    
-                    if address:
-                        # Split address by commas
-                        parts = [p.strip() for p in address.split(',')]
-                        if len(parts) >= 1:
-                            # Split street address into two lines if it contains apartment/suite info
-                            street = parts[0]
-                            addr_split = re.split(r'\s+(?:Ste|Suite|Apt|Unit|#)\s*', street, flags=re.IGNORECASE)
-                            if len(addr_split) > 1:
-                                address_parts['Address Line 1'] = addr_split[0].strip()
-                                address_parts['Address Line 2'] = f"Suite {addr_split[1].strip()}"
-                            else:
-                                # Also try to split on floor indicators
-                                addr_split = re.split(r'\s+(?:Fl|Floor|Level)\s*', street, flags=re.IGNORECASE)
-                                if len(addr_split) > 1:
-                                    address_parts['Address Line 1'] = addr_split[0].strip()
-                                    address_parts['Address Line 2'] = f"Floor {addr_split[1].strip()}"
-                                else:
-                                    address_parts['Address Line 1'] = street
-                        
-                        if len(parts) >= 2:
-                            # Last part usually contains state and ZIP
-                            last_part = parts[-1].strip()
-                            # Try to extract ZIP code
-                            zip_match = re.search(r'(\d{5}(?:-\d{4})?)', last_part)
-                            if zip_match:
-                                address_parts['ZIP Code'] = zip_match.group(1)
-                                last_part = last_part[:zip_match.start()].strip()
-                            
-                            # Extract state (assuming it's the last 2 characters before ZIP)
-                            state_match = re.search(r'([A-Z]{2})\s*$', last_part)
-                            if state_match:
-                                address_parts['State'] = state_match.group(1)
-                                last_part = last_part[:state_match.start()].strip()
+            scraper = YellowPagesSpiderScraper(profile=scraper_utils.config['scrapy_profile'])
+            scraper.scrape_yellowpages(query, location, on_item=on_item, feed_path=job_feed, jobdir=jobdir)
+            reason = scraper.stats.get('finish_reason')
+            if reason in ('shutdown', 'cancelled'):
+                raise JobError(f'Crawl stopped ({reason}); its progress is saved, '
+                               'submit the same search again to resume', status_code=503)
             
-                            # If there are parts between street and state/zip, it's the city
-                            if len(parts) == 3:
-                                address_parts['City'] = parts[1].strip()
-                            elif len(parts) == 2:
-                                address_parts['City'] = last_part
-                    
-                    # Get and validate rating
-                    rating = item.get('Rating', '')
-                    try:
-                        rating = float(rating) if rating else 0
-                    except (ValueError, TypeError):
-                        rating = 0
-                    
-                    # Skip businesses below minimum rating
-                    if rating < min_rating:
-                        continue
-                    
-                    # Create new item with processed data
-                    new_item = {
-                        'Name': item.get('Name', ''),
-                        'Rating': rating,  # Use the converted float rating
-                        'Reviews Count': item.get('Reviews Count', ''),
-                        'Phone': item.get('Phone', ''),
-                        'Email': item.get('Email', ''),
-                        'Website': item.get('Website', ''),
-                        'Address Line 1': address_parts['Address Line 1'],
-                        'Address Line 2': address_parts['Address Line 2'],
-                        'City': address_parts['City'],
-                        'State': address_parts['State'],
-                        'ZIP Code': address_parts['ZIP Code'],
-                        'Owner Name': item.get('Owner Name', ''),
-                        'Category': item.get('Categories', ''),  # Use Categories as the single category field
-                        'Description': item.get('Description', ''),
-                        'Source': item.get('Source', 'yellowpages')
-                    }
-                    
-                    # Add any additional fields that weren't explicitly handled
-                    for key, value in item.items():
-                        if key not in new_item and key not in ['Address', 'Categories', 'Category']:
-                            new_item[key] = value
-                    
-                    processed_data.append(new_item)
+            # Complete: the feed becomes a download and the crawl state is no longer needed
+            if os.path.exists(job_feed):
+                os.replace(job_feed, os.path.join('downloads', feed_file))
+            shutil.rmtree(jobdir, ignore_errors=True)
+        finally:
+            with active_crawl_lock:
+                active_crawl_dirs.discard(jobdir)
+        return crawled['items']
+    
+    use_spider = scraper_utils.config['yellowpages_engine'] == 'scrapy'
+    if not use_spider:
+        job.update(stage='waiting_for_browser')
+    
+    try:
+        data = await loop.run_in_executor(None, crawl if use_spider else scrape)
+    except DriverPoolTimeout as e:
+        cancel_enrichments(enrichments)
+        export.discard()
+        raise JobError(f'No browser available: {str(e)}', status_code=503)
+    except JobError:
+        cancel_enrichments(enrichments)
+        export.discard()
+        raise
+    except Exception as e:
+        logger.error(f"Error during YellowPages scraping: {str(e)}")
+        cancel_enrichments(enrichments)
+        export.discard()
+        raise JobError(f'Error during scraping: {str(e)}')
+    
+    if not data:
+        cancel_enrichments(enrichments)
+        export.discard()
+        raise JobError('No results found', status_code=404)
+    job.update(results=data if use_spider else len(data))
+    
+    if not use_spider:
+        job.update(stage='enriching')
+        records = await asyncio.gather(*(asyncio.wrap_future(future) for future in enrichments))
+        for record in records:
+            new_item = process_yellowpages_item(record, min_rating)
+            if new_item:
+                processed_data.append(new_item)
+                export.add(new_item)
+    
+    job.update(stage='writing_excel')
+    try:
+        count = await loop.run_in_executor(None, finish_excel_export, export)
+    except Exception as e:
+        logger.error(f"Error during YellowPages scraping: {str(e)}")
+        raise JobError(f'Error during scraping: {str(e)}')
+    
+    stats = {
+        'total_results': count,
+        'min_rating_filter': min_rating,
+        'platform': 'yellowpages',
+        'query': query,
+        'location': location
+    }
+    result = {
+        'success': True,
+        'data': processed_data,
+        'count': count,
+        'excel_file': filename,
+        'stats': stats
+    }
+    if use_spider:
+        result['feed_file'] = feed_file
+        stats['crawl_runner'] = get_crawl_runner(scraper_utils.config['scrapy_profile']).stats()
+    else:
+        stats['driver_pool'] = driver_pool.stats()
+        stats['website_enrichment'] = website_enricher.stats()
+    
+    await cache_result(yellowpages_result_key(query, location, min_rating), result)
+    return result
 
-            # Create DataFrame with processed data
-            df = pd.DataFrame(processed_data)
+def cancel_enrichments(enrichments):
+    for future in enrichments:
+        future.cancel()
 
-            # Clean up the data
-            for col in df.columns:
-                # Replace empty strings and None with NaN
-                df[col] = df[col].replace(['', None], pd.NA)
-                
-                # Clean up text fields
-                if df[col].dtype == 'object':
-                    df[col] = df[col].str.strip()
-                    df[col] = df[col].str.replace('\n', ' ')
-                    df[col] = df[col].str.replace('\r', ' ')
-                    df[col] = df[col].str.replace('\t', ' ')
-                    df[col] = df[col].str.replace('  ', ' ')
-
-            # Remove duplicates
-            duplicate_subset = ['Name', 'Phone', 'Address Line 1']
-            df = df.drop_duplicates(subset=duplicate_subset, keep='first')
-
-            # Sort by rating (descending) and reviews count (descending)
-            df['Reviews Count'] = pd.to_numeric(df['Reviews Count'], errors='coerce').fillna(0)
-            df = df.sort_values(by=['Rating', 'Reviews Count'], ascending=[False, False])
-
-            # Create Excel writer with xlsxwriter engine for formatting
-            writer = pd.ExcelWriter(filepath, engine='xlsxwriter')
-            
-            # Write the DataFrame to Excel
-            df.to_excel(writer, index=False, sheet_name='Sheet1')
-            
-            # Get the xlsxwriter workbook and worksheet objects
-            workbook = writer.book
-            worksheet = writer.sheets['Sheet1']
-            
-            # Define column widths based on content type
-            column_widths = {
-                'Name': 30,
-                'Rating': 10,
-                'Reviews Count': 12,
-                'Phone': 15,
-                'Email': 25,
-                'Website': 35,
-                'Address Line 1': 35,
-                'Address Line 2': 20,
-                'City': 20,
-                'State': 8,
-                'ZIP Code': 12,
-                'Owner Name': 25,
-                'Category': 30,
-                'Description': 50,
-                'Source': 12
-            }
-            
-            # Set column widths and add a bit of padding
-            for idx, col in enumerate(df.columns):
-                max_length = max(
-                    df[col].astype(str).apply(len).max(),  # max length of values
-                    len(col)  # length of column name
-                ) + 2  # add padding
-                
-                # Use predefined width if available, otherwise use calculated width
-                width = column_widths.get(col, max_length)
-                worksheet.set_column(idx, idx, width)
-            
-            # Add basic formatting
-            header_format = workbook.add_format({
-                'bold': True,
-                'text_wrap': True,
-                'valign': 'top',
-                'fg_color': '#D9D9D9',
-                'border': 1
-            })
-            
-            # Add number format for Rating column
-            rating_format = workbook.add_format({'num_format': '0.0'})
-            rating_col = df.columns.get_loc('Rating')
-            worksheet.set_column(rating_col, rating_col, 10, rating_format)
-            
-            # Write the column headers with the header format
-            for col_num, value in enumerate(df.columns.values):
-                worksheet.write(0, col_num, value, header_format)
-            
-            # Save the Excel file
-            writer.close()
-            
-            logger.info(f"Results saved to Excel file: {filepath}")
-            
-            # Return success response with file info
-            return jsonify({
-                'success': True,
-                'data': processed_data,
-                'count': len(df),
-                'excel_file': filename,
-                'download_url': url_for('download_file', filename=filename),
-                'stats': {
-                    'total_results': len(df),
-                    'min_rating_filter': min_rating,
-                    'platform': 'yellowpages',
-                    'query': query,
-                    'location': location
-                }
-            })
-        except Exception as e:
-            logger.error(f"Error during YellowPages scraping: {str(e)}")
-            return jsonify({
-                'status': 'error',
-                'message': f'Error during scraping: {str(e)}'
-            }), 500
-            
-    except Exception as e:
-            logger.error(f"Error during YellowPages scraping: {str(e)}")
-            return jsonify({
-                'status': 'error',
-                'message': f'Error during scraping: {str(e)}'
-            }), 500
+def process_yellowpages_item(item, min_rating):
+    """Split the address into components and apply the rating filter; None drops the item"""
+    if not isinstance(item, dict):
+        return None
+    
+    # Parse the address into components
+    address = item.get('Address', '')
+    address_parts = {
+        'Address Line 1': '',
+        'Address Line 2': '',
+        'City': '',
+        'State': '',
+        'ZIP Code': ''
+    }
 
-    except Exception as e:
-        logger.error(f"Error in YellowPages route: {str(e)}")
-        return jsonify({
-            'status': 'error',
-            'message': f'An error occurred: {str(e)}'
-        }), 500
+    if address:
+        # Split address by commas
+        parts = [p.strip() for p in address.split(',')]
+        if len(parts) >= 1:
+            # Split street address into two lines if it contains apartment/suite info
+            street = parts[0]
+            addr_split = re.split(r'\s+(?:Ste|Suite|Apt|Unit|#)\s*', street, flags=re.IGNORECASE)
+            if len(addr_split) > 1:
+                address_parts['Address Line 1'] = addr_split[0].strip()
+                address_parts['Address Line 2'] = f"Suite {addr_split[1].strip()}"
+            else:
+                # Also try to split on floor indicators
+                addr_split = re.split(r'\s+(?:Fl|Floor|Level)\s*', street, flags=re.IGNORECASE)
+                if len(addr_split) > 1:
+                    address_parts['Address Line 1'] = addr_split[0].strip()
+                    address_parts['Address Line 2'] = f"Floor {addr_split[1].strip()}"
+                else:
+                    address_parts['Address Line 1'] = street
+
+        if len(parts) >= 2:
+            # Last part usually contains state and ZIP
+            last_part = parts[-1].strip()
+            # Try to extract ZIP code
+            zip_match = re.search(r'(\d{5}(?:-\d{4})?)', last_part)
+            if zip_match:
+                address_parts['ZIP Code'] = zip_match.group(1)
+                last_part = last_part[:zip_match.start()].strip()
+
+            # Extract state (assuming it's the last 2 characters before ZIP)
+            state_match = re.search(r'([A-Z]{2})\s*$', last_part)
+            if state_match:
+                address_parts['State'] = state_match.group(1)
+                last_part = last_part[:state_match.start()].strip()
+
+            # If there are parts between street and state/zip, it's the city
+            if len(parts) == 3:
+                address_parts['City'] = parts[1].strip()
+            elif len(parts) == 2:
+                address_parts['City'] = last_part
+
+    # Get and validate rating
+    rating = item.get('Rating', '')
+    try:
+        rating = float(rating) if rating else 0
+    except (ValueError, TypeError):
+        rating = 0
+
+    # Skip businesses below minimum rating
+    if rating < min_rating:
+        return None
+
+    # Create new item with processed data
+    new_item = {
+        'Name': item.get('Name', ''),
+        'Rating': rating,  # Use the converted float rating
+        'Reviews Count': item.get('Reviews Count', ''),
+        'Phone': item.get('Phone', ''),
+        'Email': item.get('Email', ''),
+        'Website': item.get('Website', ''),
+        'Address Line 1': address_parts['Address Line 1'],
+        'Address Line 2': address_parts['Address Line 2'],
+        'City': address_parts['City'],
+        'State': address_parts['State'],
+        'ZIP Code': address_parts['ZIP Code'],
+        'Owner Name': item.get('Owner Name', ''),
+        'Category': item.get('Categories', ''),  # Use Categories as the single category field
+        'Description': item.get('Description', ''),
+        'Source': item.get('Source', 'yellowpages')
+    }
+
+    # Add any additional fields that weren't explicitly handled
+    for key, value in item.items():
+        if key not in new_item and key not in ['Address', 'Categories', 'Category']:
+            new_item[key] = value
+
+    return new_item
+
+@app.before_request
+def warm_driver_pool():
+    """Launch the pooled browsers when a process starts serving requests"""
+    # Not at import: the debug reloader's parent and a preloading WSGI master
+    # import the app too, but never serve requests or lease browsers. The
+    # spider engine never leases one, so it gets no browsers at all
+    if scraper_utils.config['yellowpages_engine'] == 'scrapy':
+        return
+    # Idempotent: only browsers that are neither running nor launching are started
+    driver_pool.start()
 
 @app.errorhandler(404)
 def not_found_error(error):
@@ -0,0 +1,408 @@
+"""
+Manual performance benchmarks for the scraping pipeline.
+
+Run one scenario at a time, e.g.:
+
+    python benchmark.py parse-pool --pages 20
+    python benchmark.py parsers debug_page.html
+    python benchmark.py extract --listings 200
+    python benchmark.py export --rows 1000 10000 100000
+    python benchmark.py clean --rows 10000
+    python benchmark.py crawl --pages 3 --listings 30
+"""
+import argparse
+import asyncio
+import importlib
+import logging
+import os
+import random
+import tempfile
+import threading
+import time
+import tracemalloc
+
+import pandas as pd
+from aiohttp import web
+
+from scrapers.listing_parser import parse_justdial_page, extract_business_data, JUSTDIAL_LISTING_CONTAINERS
+from scrapers.parse_pool import ParsePool
+from scrapers.html_parser import available_backends, find_containers
+from scrapers.sulekha_scraper import parse_sulekha_page
+from scrapers.excel_export import ScrapeExcelExport, clean_frame, text_widths
+from scrapers.crawl_runner import CrawlRunner
+from scrapers.yellowpages_spider import YellowPagesSpider
+from scrapers.yellowpages_scraper_new import SETTINGS_PROFILES
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s [%(name)s] %(levelname)s: %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+
+logger = logging.getLogger(__name__)
+
+
+def make_justdial_page(listings=40, seed=0):
+    """Build a synthetic JustDial results page with realistic listing markup"""
+    rng = random.Random(seed)
+    items = []
+    for i in range(listings):
+        digits = ''.join(str(rng.randint(0, 9)) for _ in range(10))
+        items.append(f"""
+        <li class="cntanr" data-href="https://www.justdial.com/listing/{i}">
+          <div class="store-details jsx-3349e7cd87e12d75">
+            <h2 class="store-name"><span class="lng_cont_name">Business {i} Pvt Ltd</span></h2>
+            <div class="rating-box"><span class="green-box rating">{rng.randint(10, 50) / 10}</span>
+              <span class="rt_count review">{rng.randint(1, 900)} Ratings</span></div>
+            <p class="contact-info"><span class="mobilesv">{digits}</span></p>
+            <p class="address-info cont_fl_addr">Shop No {i}, Main Road, Near Station, Andheri West, Mumbai 4000{i % 100:02d}</p>
+            <div class="business-desc">Trusted services since {1990 + i % 30}. Open all days.</div>
+            <a href="https://business{i}.co.in">Website</a>
+            <a href="mailto:info{i}@business{i}.co.in">Email</a>
+            <a href="https://facebook.com/business{i}">Facebook</a>
+          </div>
+        </li>""")
+    padding = '<script>var state = {};</script>' * 200
+    return f"<html><head>{padding}</head><body><ul class='results'>{''.join(items)}</ul></body></html>"
+
+
+async def _run_pipeline(pages, latency, window, pool):
+    """Fetch (simulated) and parse pages; return wall time and worst event-loop stall"""
+    lag = {'max': 0.0}
+    running = True
+
+    async def heartbeat():
+        # Measures how long the loop was unable to run other coroutines
+        while running:
+            start = time.perf_counter()
+            await asyncio.sleep(0.01)
+            lag['max'] = max(lag['max'], time.perf_counter() - start - 0.01)
+
+    async def fetch(content):
+        await asyncio.sleep(latency)
+        return content
+
+    monitor = asyncio.create_task(heartbeat())
+    start = time.perf_counter()
+    semaphore = asyncio.Semaphore(window)
+
+    async def handle(content):
+        async with semaphore:
+            html = await fetch(content)
+        if pool is None:
+            return parse_justdial_page(html)
+        return await pool.parse(parse_justdial_page, html)
+
+    results = await asyncio.gather(*(handle(page) for page in pages))
+    wall = time.perf_counter() - start
+    running = False
+    await monitor
+    businesses = sum(len(r['businesses']) for r in results)
+    return wall, lag['max'], businesses
+
+
+def bench_parse_pool(args):
+    pages = [make_justdial_page(args.listings, seed=i) for i in range(args.pages)]
+    logger.info(f"{args.pages} pages x {args.listings} listings, {args.latency:.2f}s simulated latency, window {args.window}")
+
+    wall, lag, found = asyncio.run(_run_pipeline(pages, args.latency, args.window, None))
+    logger.info(f"inline parse : {wall:6.2f}s wall, worst loop stall {lag * 1000:7.1f} ms, {found} businesses")
+
+    for mode in ('process', 'thread'):
+        pool = ParsePool(workers=args.workers or None, mode=mode)
+        # Warm the workers so process start-up is not counted
+        asyncio.run(_run_pipeline(pages[:1], 0, 1, pool))
+        wall, lag, found = asyncio.run(_run_pipeline(pages, args.latency, args.window, pool))
+        logger.info(f"{mode:7s} pool : {wall:6.2f}s wall, worst loop stall {lag * 1000:7.1f} ms, {found} businesses")
+        pool.shutdown()
+
+
+def _pages_per_second(func, html, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func(html)
+    return repeat / (time.perf_counter() - start), result
+
+
+def bench_parsers(args):
+    pages = {'synthetic justdial': make_justdial_page(args.listings)}
+    for path in args.files:
+        with open(path, encoding='utf-8', errors='replace') as f:
+            pages[path] = f.read()
+
+    extractors = {
+        'justdial': lambda backend: (lambda html: parse_justdial_page(html, backend)['businesses']),
+        'sulekha': lambda backend: (lambda html: parse_sulekha_page(html, 'benchmark', backend)['businesses']),
+    }
+
+    for name, html in pages.items():
+        logger.info(f"{name} ({len(html) / 1024:.0f} KiB)")
+        for platform, make_extractor in extractors.items():
+            baseline = None
+            for backend in available_backends():
+                rate, businesses = _pages_per_second(make_extractor(backend), html, args.repeat)
+                if baseline is None:
+                    baseline = businesses
+                same = 'same output' if businesses == baseline else 'OUTPUT DIFFERS from html.parser'
+                logger.info(f"  {platform:8s} {backend:11s}: {rate:8.1f} pages/s, {len(businesses)} businesses, {same}")
+
+
+def bench_extract(args):
+    html = make_justdial_page(args.listings)
+    listings = find_containers(html, ['div', 'li', 'section'], JUSTDIAL_LISTING_CONTAINERS, args.backend)
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        records = [extract_business_data(listing, 'justdial') for listing in listings]
+    elapsed = time.perf_counter() - start
+
+    calls = len(listings) * args.repeat
+    found = sum(1 for record in records if record and record.get('Company Name'))
+    logger.info(
+        f"extract_business_data: {len(listings)} containers x {args.repeat}, "
+        f"{elapsed / calls * 1e6:.1f} us per listing, {found} businesses per page"
+    )
+
+
+def make_business_records(count, seed=0):
+    """Yield scraped-looking business records (generated lazily so they are not counted)"""
+    rng = random.Random(seed)
+    for i in range(count):
+        yield {
+            'Company Name': f"Business {i} Pvt Ltd",
+            'Phone': f"+91 {rng.randint(100, 999)}-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+            'Address': f"Shop No {i},\nMain Road  Andheri West, Mumbai 4000{i % 100:02d}",
+            'Rating': f"{rng.randint(10, 50) / 10}",
+            'Reviews Count': str(rng.randint(1, 900)),
+            'Website': f"https://business{i}.co.in",
+        }
+
+
+def bench_export(args):
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'export.xlsx')
+            tracemalloc.start()
+            start = time.perf_counter()
+            export = ScrapeExcelExport(path, spool_dir=tmp)
+            export.add_many(make_business_records(rows))
+            written = export.finalize({'total_requests': rows})
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            logger.info(
+                f"{rows:7d} rows: {elapsed:6.2f}s, peak Python memory {peak / 1024 / 1024:6.1f} MiB, "
+                f"{written} rows written, {os.path.getsize(path) / 1024 / 1024:.1f} MiB file"
+            )
+
+
+def _legacy_clean_and_widths(df):
+    """Per-column cleaning and width calculation the exports used before clean_frame"""
+    for col in df.columns:
+        df[col] = df[col].replace(['', None], pd.NA)
+        if df[col].dtype == 'object':
+            df[col] = df[col].str.strip()
+            df[col] = df[col].str.replace('\n', ' ')
+            df[col] = df[col].str.replace('\r', ' ')
+            df[col] = df[col].str.replace('\t', ' ')
+            df[col] = df[col].str.replace('  ', ' ')
+    return [max(df[col].astype(str).apply(len).max(), len(str(col))) + 2 for col in df.columns]
+
+
+def _chunk_clean_and_widths(df):
+    clean_frame(df)
+    return [max(width, len(str(col))) + 2 for col, width in zip(df.columns, text_widths(df))]
+
+
+def bench_clean(args):
+    records = list(make_business_records(args.rows))
+    for label, func in (('legacy', _legacy_clean_and_widths), ('clean_frame', _chunk_clean_and_widths)):
+        elapsed = 0.0
+        for _ in range(args.repeat):
+            df = pd.DataFrame(records, dtype=object)
+            start = time.perf_counter()
+            func(df)
+            elapsed += time.perf_counter() - start
+        per_10k = elapsed / args.repeat / args.rows * 10000
+        logger.info(f"{label:11s}: {per_10k * 1000:8.1f} ms per 10k rows (clean + column widths)")
+
+
+class MockYellowPagesSpider(YellowPagesSpider):
+    """YellowPagesSpider pointed at the crawl benchmark's mock server"""
+    name = 'yellowpages_mock'
+    allowed_domains = []
+
+    def __init__(self, base_url=None, *args, **kwargs):
+        self.base_url = base_url
+        super().__init__(*args, **kwargs)
+
+    def get_search_url(self, page):
+        return f'{self.base_url}/search?page={page}'
+
+
+class MockYellowPages:
+    """
+    Local stand-in for yellowpages.com and the business websites it links to.
+
+    Search pages are served from 127.0.0.1; every business gets its own
+    website host (127.0.0.2, 127.0.0.3, ...) so it lands in its own download
+    slot, as real business domains do. With ``close_connections`` every
+    response closes its connection, like the HTTP/1.0 download handler.
+    """
+
+    def __init__(self, pages, listings, latency, port=8790):
+        self.pages = pages
+        self.listings = listings
+        self.latency = latency
+        self.port = port
+        self.close_connections = False
+        self.reset()
+
+    def reset(self):
+        self.requests = 0
+        self.connections = set()
+
+    async def _respond(self, request, text):
+        self.requests += 1
+        self.connections.add(request.transport)
+        await asyncio.sleep(self.latency)
+        response = web.Response(text=text, content_type='text/html')
+        if self.close_connections:
+            response.force_close()
+        return response
+
+    async def search(self, request):
+        page = int(request.query.get('page', 1))
+        results = []
+        for i in range(self.listings):
+            n = (page - 1) * self.listings + i
+            results.append(
+                f'<div class="result"><h2 class="business-name">Business {n}</h2>'
+                f'<div class="phones phone primary">(512) 555-{n % 10000:04d}</div>'
+                f'<a class="track-visit-website" href="http://127.0.0.{2 + n % 250}:{self.port}/">Website</a>'
+                f'<div class="street-address">{n} Main St</div><div class="locality">Austin, TX 78701</div></div>'
+            )
+        if page < self.pages:
+            results.append(f'<a class="next" href="/search?page={page + 1}">Next</a>')
+        return await self._respond(request, f"<html><body>{''.join(results)}</body></html>")
+
+    async def website(self, request):
+        host = request.host.split(':')[0]
+        return await self._respond(request, (
+            f'<html><head><meta name="description" content="Plumbing services from {host}"></head>'
+            f'<body>Contact info@{host.replace(".", "-")}.example.com or (512) 555-0100</body></html>'
+        ))
+
+    def start(self):
+        """Serve on every loopback address from a background thread"""
+        started = threading.Event()
+
+        def serve():
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            app = web.Application()
+            app.add_routes([web.get('/search', self.search), web.get('/', self.website)])
+            runner = web.AppRunner(app, access_log=None)
+            loop.run_until_complete(runner.setup())
+            loop.run_until_complete(web.TCPSite(runner, '0.0.0.0', self.port).start())
+            started.set()
+            loop.run_forever()
+
+        threading.Thread(target=serve, daemon=True).start()
+        started.wait()
+        return f'http://127.0.0.1:{self.port}'
+
+
+def _crawl_overrides(search_concurrency):
+    """Politeness delays off, so the timings show connection reuse and concurrency"""
+    return {
+        'DOWNLOAD_DELAY': 0,
+        'AUTOTHROTTLE_ENABLED': False,
+        'DOWNLOAD_SLOTS': {'127.0.0.1': {'concurrency': search_concurrency, 'delay': 0}},
+        'DEPTH_LIMIT': 0,  # crawl every mock page
+        'ENRICHMENT_CACHE_PATH': '',
+        'LOG_LEVEL': 'WARNING',
+    }
+
+
+def bench_crawl(args):
+    mock = MockYellowPages(args.pages, args.listings, args.latency, args.port)
+    base_url = mock.start()
+    logger.info(f"{args.pages} search pages x {args.listings} businesses, {args.latency * 1000:.0f} ms per response")
+
+    # label, settings module, close every connection, extra overrides
+    variants = [
+        # The old settings: HTTP/1.0 (no keep-alive) and one request at a time
+        ('http/1.0 serial', SETTINGS_PROFILES['default'], True, {'CONCURRENT_REQUESTS': 1}),
+        ('default', SETTINGS_PROFILES['default'], False, {}),
+        ('throughput', SETTINGS_PROFILES['throughput'], False, {}),
+    ]
+    for label, module, close_connections, extra in variants:
+        slots = importlib.import_module(module).DOWNLOAD_SLOTS
+        search_concurrency = 1 if extra else slots['www.yellowpages.com']['concurrency']
+        runner = CrawlRunner(module, settings={**_crawl_overrides(search_concurrency), **extra})
+        # Warm the crawler process so Scrapy start-up is not counted
+        runner.crawl('benchmark.MockYellowPagesSpider', base_url=base_url, min_results=1).wait()
+
+        mock.close_connections = close_connections
+        mock.reset()
+        start = time.perf_counter()
+        stats = runner.crawl(
+            'benchmark.MockYellowPagesSpider',
+            base_url=base_url,
+            min_results=args.pages * args.listings + 1
+        ).wait()
+        elapsed = time.perf_counter() - start
+        runner.shutdown()
+        logger.info(
+            f"{label:15s}: {elapsed:6.2f}s, {stats.get('item_scraped_count', 0)} items, "
+            f"{mock.requests} requests over {len(mock.connections)} connections"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest='scenario', required=True)
+
+    parse_pool = subparsers.add_parser('parse-pool', help='inline parsing vs ParsePool under concurrent fetches')
+    parse_pool.add_argument('--pages', type=int, default=20)
+    parse_pool.add_argument('--listings', type=int, default=40)
+    parse_pool.add_argument('--latency', type=float, default=0.5, help='simulated fetch latency in seconds')
+    parse_pool.add_argument('--window', type=int, default=3, help='pages in flight')
+    parse_pool.add_argument('--workers', type=int, default=0)
+    parse_pool.set_defaults(func=bench_parse_pool)
+
+    parsers = subparsers.add_parser('parsers', help='pages/second of each HTML parser backend')
+    parsers.add_argument('files', nargs='*', default=['debug_page.html'], help='saved HTML pages')
+    parsers.add_argument('--listings', type=int, default=40, help='listings in the synthetic JustDial page')
+    parsers.add_argument('--repeat', type=int, default=20)
+    parsers.set_defaults(func=bench_parsers)
+
+    extract = subparsers.add_parser('extract', help='per-listing cost of extract_business_data')
+    extract.add_argument('--listings', type=int, default=40)
+    extract.add_argument('--repeat', type=int, default=20)
+    extract.add_argument('--backend', default='lxml')
+    extract.set_defaults(func=bench_extract)
+
+    export = subparsers.add_parser('export', help='time and peak memory of the streaming Excel export')
+    export.add_argument('--rows', type=int, nargs='+', default=[1000, 10000, 100000])
+    export.set_defaults(func=bench_export)
+
+    clean = subparsers.add_parser('clean', help='export cleaning + column widths: legacy vs clean_frame')
+    clean.add_argument('--rows', type=int, default=10000)
+    clean.add_argument('--repeat', type=int, default=5)
+    clean.set_defaults(func=bench_clean)
+
+    crawl = subparsers.add_parser('crawl', help='YellowPagesSpider against a mock server: settings profiles compared')
+    crawl.add_argument('--pages', type=int, default=3)
+    crawl.add_argument('--listings', type=int, default=30)
+    crawl.add_argument('--latency', type=float, default=0.05, help='mock server response time in seconds')
+    crawl.add_argument('--port', type=int, default=8790)
+    crawl.set_defaults(func=bench_crawl)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,216 @@
+import os
+import time
+import sqlite3
+import logging
+import threading
+from email.utils import parsedate_to_datetime
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+def parse_retry_after(value):
+    """Seconds from a Retry-After header (delta-seconds or HTTP date), else 0"""
+    if not value:
+        return 0
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return 0
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of a request to an endpoint whose breaker is open"""
+
+    def __init__(self, key, retry_after):
+        super().__init__(f"{key} is cooling down after repeated blocks; retry in {retry_after:.0f}s")
+        self.key = key
+        self.retry_after = retry_after
+
+
+class CircuitBreakers:
+    """
+    Circuit breakers for proxies and hosts, shared by every worker process.
+
+    A breaker is keyed by a string such as ``host:www.justdial.com`` or
+    ``proxy:http://1.2.3.4:8080``. ``failure_threshold`` failures in a row
+    open it: for ``cooldown`` seconds (or the server's Retry-After, if
+    longer) ``allow`` refuses requests. Once the cool-down has passed, one
+    caller is let through as a probe (half-open). Success closes the breaker.
+    Failure opens it again for twice as long, up to ``max_cooldown``. A probe
+    that never reports back frees the slot after ``probe_timeout`` seconds.
+
+    State lives in SQLite (WAL mode, one connection per thread) like the
+    response cache, so blocks survive restarts and every Flask worker sees
+    them. A closed breaker with no recent failures has no row at all.
+    """
+
+    def __init__(self, path, failure_threshold=3, cooldown=60, max_cooldown=1800, probe_timeout=60):
+        self.path = path
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.probe_timeout = probe_timeout
+        self._local = threading.local()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = self._connect()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS breakers (
+                key TEXT PRIMARY KEY,
+                state TEXT NOT NULL,
+                failures INTEGER NOT NULL,
+                opens INTEGER NOT NULL,
+                open_until REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+
+    def _connect(self):
+        """Return the SQLite connection for the current thread"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def status(self, key):
+        """(state, seconds until key may be tried again) of key's breaker
+
+        For a half-open breaker the seconds are how long its probe may still take.
+        """
+        try:
+            row = self._connect().execute(
+                "SELECT state, open_until FROM breakers WHERE key = ?", (key,)
+            ).fetchone()
+        except Exception as e:
+            logger.error(f"Error reading circuit breaker {key}: {str(e)}")
+            return CLOSED, 0
+        if row is None or row[0] == CLOSED:
+            return CLOSED, 0
+        return row[0], max(0.0, row[1] - time.time())
+
+    def retry_after(self, key):
+        """Seconds until key may be tried again; 0 when it may be tried now"""
+        return self.status(key)[1]
+
+    def allow(self, key):
+        """Whether a request to key may go ahead; claims the probe of a half-open breaker"""
+        now = time.time()
+        try:
+            conn = self._connect()
+            row = conn.execute("SELECT state, open_until FROM breakers WHERE key = ?", (key,)).fetchone()
+            if row is None or row[0] == CLOSED:
+                return True
+            if row[1] > now:
+                return False
+            # Cool-down over: exactly one caller (in any process) gets to probe
+            claimed = conn.execute(
+                "UPDATE breakers SET state = ?, open_until = ?, updated_at = ? "
+                "WHERE key = ? AND state != ? AND open_until <= ?",
+                (HALF_OPEN, now + self.probe_timeout, now, key, CLOSED, now)
+            ).rowcount
+        except Exception as e:
+            logger.error(f"Error reading circuit breaker {key}: {str(e)}")
+            return True
+        if claimed:
+            logger.info(f"Circuit breaker {key} half-open: probing")
+        return bool(claimed)
+
+    def record_success(self, key):
+        try:
+            conn = self._connect()
+            row = conn.execute("SELECT state FROM breakers WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return
+            conn.execute("DELETE FROM breakers WHERE key = ?", (key,))
+        except Exception as e:
+            logger.error(f"Error updating circuit breaker {key}: {str(e)}")
+            return
+        if row[0] != CLOSED:
+            logger.info(f"Circuit breaker {key} closed")
+
+    def record_failure(self, key, retry_after=0):
+        """Count a block or failure of key; returns the breaker's new state"""
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT state, failures, opens, open_until, updated_at FROM breakers WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None or (row[0] == CLOSED and now - row[4] > self.max_cooldown):
+                    # Failures long ago do not count towards this run
+                    state, failures, opens, open_until = CLOSED, 0, 0, 0.0
+                else:
+                    state, failures, opens, open_until = row[:4]
+                failures += 1
+
+                if state == HALF_OPEN or (state == CLOSED and failures >= self.failure_threshold):
+                    opens += 1
+                    cooldown = min(self.max_cooldown, self.cooldown * 2 ** (opens - 1))
+                    cooldown = max(cooldown, min(retry_after or 0, self.max_cooldown))
+                    state, open_until = OPEN, now + cooldown
+                    logger.warning(f"Circuit breaker {key} open for {cooldown:.0f}s after {failures} failures")
+
+                conn.execute(
+                    "INSERT OR REPLACE INTO breakers (key, state, failures, opens, open_until, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, state, failures, opens, open_until, now)
+                )
+                # Forget endpoints that have been quiet for a long time
+                conn.execute(
+                    "DELETE FROM breakers WHERE updated_at < ? AND open_until < ?",
+                    (now - 86400, now)
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        except Exception as e:
+            logger.error(f"Error updating circuit breaker {key}: {str(e)}")
+            return None
+        return state
+
+    def blocked(self, prefix=''):
+        """Keys starting with prefix whose breaker currently refuses requests"""
+        now = time.time()
+        rows = self._connect().execute(
+            "SELECT key FROM breakers WHERE state != ? AND open_until > ? AND substr(key, 1, ?) = ?",
+            (CLOSED, now, len(prefix), prefix)
+        ).fetchall()
+        return {row[0] for row in rows}
+
+    def clear(self):
+        """Close every breaker"""
+        self._connect().execute("DELETE FROM breakers")
+
+    def stats(self):
+        """Open and half-open breakers with their failures and remaining cool-down"""
+        now = time.time()
+        rows = self._connect().execute(
+            "SELECT key, state, failures, opens, open_until FROM breakers WHERE state != ? ORDER BY key",
+            (CLOSED,)
+        ).fetchall()
+        return {
+            key: {
+                'state': state,
+                'failures': failures,
+                'opens': opens,
+                'retry_after': round(max(0.0, open_until - now), 1)
+            }
+            for key, state, failures, opens, open_until in rows
+        }
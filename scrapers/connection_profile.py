@@ -0,0 +1,119 @@
+import time
+import asyncio
+import logging
+import threading
+
+import aiohttp
+
+from .http_client import get_session
+
+logger = logging.getLogger(__name__)
+
+# Answers with nothing but the caller's IP; cheap enough to poll
+EGRESS_IP_URL = 'https://api.ipify.org?format=json'
+
+
+class ConnectionProfile:
+    """
+    Cached details of the connection requests leave through (IP, country, ISP).
+
+    ``lookup`` is the slow part: an async callable asking IP-info services
+    about the connection. Its result is kept for ``ttl`` seconds and served
+    by ``current()`` without any I/O, so requests read it at no cost. A
+    background task started by ``start`` looks the profile up again when it
+    expires, and every ``ip_check_interval`` seconds asks a lightweight
+    service for the egress IP; a different IP (a VPN or proxy switch) drops
+    the cached profile and looks it up again straight away. ``invalidate``
+    does the same on demand.
+    """
+
+    def __init__(self, lookup, ttl=1800, ip_check_interval=60, ip_url=EGRESS_IP_URL):
+        self.lookup = lookup
+        self.ttl = ttl
+        self.ip_check_interval = ip_check_interval
+        self.ip_url = ip_url
+        self.profile = None
+        self.fetched_at = None
+        self._refresher = None
+        self._changed = None
+        self._stats = {'lookups': 0, 'ip_checks': 0, 'ip_changes': 0}
+        self._lock = threading.Lock()
+
+    def current(self):
+        """The cached profile, or None if it has not been looked up yet or has expired"""
+        profile, fetched_at = self.profile, self.fetched_at
+        if profile is None or time.monotonic() - fetched_at >= self.ttl:
+            return None
+        return profile
+
+    def invalidate(self):
+        """Forget the profile, e.g. after switching VPN server; the refresher looks it up again"""
+        self.profile = None
+        self.fetched_at = None
+        changed = self._changed
+        if changed is not None:
+            changed[0].call_soon_threadsafe(changed[1].set)
+
+    async def refresh(self):
+        """Look the profile up now"""
+        self._stats['lookups'] += 1
+        profile = await self.lookup()
+        if profile:
+            self.profile = profile
+            self.fetched_at = time.monotonic()
+        return profile
+
+    async def egress_ip(self):
+        """The IP address requests currently leave from, or None if it could not be found"""
+        self._stats['ip_checks'] += 1
+        try:
+            async with get_session().get(self.ip_url, timeout=aiohttp.ClientTimeout(total=10)) as response:
+                if response.status == 200:
+                    return (await response.json(content_type=None)).get('ip')
+        except Exception as e:
+            logger.debug(f"Egress IP check failed: {e}")
+        return None
+
+    async def _refresh_forever(self):
+        changed = asyncio.Event()
+        self._changed = (asyncio.get_running_loop(), changed)
+        while True:
+            try:
+                if self.current() is None:
+                    await self.refresh()
+                else:
+                    ip = await self.egress_ip()
+                    if ip and self.profile and ip != self.profile.get('ip'):
+                        logger.info(f"Egress IP changed from {self.profile.get('ip')} to {ip}; "
+                                    "looking up the connection again")
+                        self._stats['ip_changes'] += 1
+                        self.profile = None
+                        await self.refresh()
+            except Exception as e:
+                logger.error(f"Connection profile refresh failed: {e}")
+            changed.clear()
+            try:
+                await asyncio.wait_for(changed.wait(), self.ip_check_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self, loop):
+        """Keep the profile current from a task on loop (idempotent)"""
+        with self._lock:
+            if self._refresher is None or self._refresher.done():
+                self._refresher = asyncio.run_coroutine_threadsafe(self._refresh_forever(), loop)
+
+    def stop(self):
+        with self._lock:
+            if self._refresher is not None:
+                self._refresher.cancel()
+                self._refresher = None
+
+    def stats(self):
+        profile = self.current()
+        return {
+            **self._stats,
+            'ip': profile.get('ip') if profile else None,
+            'country': profile.get('country') if profile else None,
+            'age_seconds': round(time.monotonic() - self.fetched_at, 1) if profile else None,
+        }
@@ -0,0 +1,125 @@
+import os
+import re
+import json
+import shutil
+import logging
+
+from .pipelines import read_jsonl_feed
+
+logger = logging.getLogger(__name__)
+
+# What Scrapy keeps in a JOBDIR: pending requests, seen fingerprints, spider.state
+SCRAPY_JOBDIR_FILES = ('requests.queue', 'requests.seen', 'spider.state')
+
+
+def business_key(name, phone):
+    """Identity of a listing across runs: its name and the digits of its phone number"""
+    return f"{(name or '').strip().lower()}|{re.sub(r'[^0-9]', '', phone or '')}"
+
+
+class CrawlCheckpoint:
+    """
+    Progress of a resumable crawl, kept in its JOBDIR next to Scrapy's own state.
+
+    Every search page is recorded from the moment it is requested until it
+    has been parsed and all the website requests made for its listings are
+    done. Items already emitted are read back from the crawl's JSON Lines
+    feed. A graceful stop lets in-flight requests finish, so afterwards
+    Scrapy's saved queue holds exactly the outstanding work and the crawl
+    resumes from it without fetching anything twice. After an unclean stop
+    (the process was killed) Scrapy's files were never written and are
+    discarded; the unfinished search pages are requested again instead, and
+    listings already in the feed are skipped.
+    """
+
+    def __init__(self, jobdir, feed_path=None):
+        self.jobdir = jobdir
+        self.path = os.path.join(jobdir, 'yellowpages_checkpoint.json')
+        state = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, encoding='utf-8') as f:
+                    state = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable crawl checkpoint {self.path}: {e}")
+
+        # search page url -> [website requests outstanding, page parsed]
+        self.pages = {url: list(progress) for url, progress in state.get('pages', {}).items()}
+        self.emitted = {
+            business_key(record.get('Name'), record.get('Phone'))
+            for record in (read_jsonl_feed(feed_path) if feed_path else ())
+        }
+
+        # Whether Scrapy's queue picks up where the last run stopped
+        self.from_queue = bool(state.get('clean_close')) and os.path.exists(
+            os.path.join(jobdir, 'requests.queue')
+        )
+        if not self.from_queue:
+            self._discard_scrapy_state()
+            self.pages = {url: [0, False] for url in self.pages}
+        # Until this run closes cleanly, its Scrapy state must not be trusted
+        self.clean_close = False
+        self.save()
+
+    def _discard_scrapy_state(self):
+        for name in SCRAPY_JOBDIR_FILES:
+            path = os.path.join(self.jobdir, name)
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            elif os.path.exists(path):
+                os.remove(path)
+
+    @property
+    def resuming(self):
+        return bool(self.pages) or bool(self.emitted)
+
+    @property
+    def unfinished_pages(self):
+        """Search pages to request again; none when the saved queue already has them"""
+        return [] if self.from_queue else list(self.pages)
+
+    def save(self):
+        os.makedirs(self.jobdir, exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'pages': self.pages, 'clean_close': self.clean_close}, f)
+        os.replace(tmp_path, self.path)
+
+    def page_requested(self, url):
+        if url not in self.pages:
+            self.pages[url] = [0, False]
+            self.save()
+
+    def page_parsed(self, url):
+        if url in self.pages:
+            self.pages[url][1] = True
+            self._complete(url)
+
+    def request_added(self, url):
+        if url in self.pages:
+            self.pages[url][0] += 1
+
+    def seen(self, key):
+        return key in self.emitted
+
+    def item_emitted(self, key):
+        """Record an emitted listing; False if it was already emitted"""
+        if key in self.emitted:
+            return False
+        self.emitted.add(key)
+        return True
+
+    def request_done(self, url):
+        if url in self.pages:
+            self.pages[url][0] = max(0, self.pages[url][0] - 1)
+            self._complete(url)
+
+    def _complete(self, url):
+        outstanding, parsed = self.pages[url]
+        if parsed and not outstanding:
+            del self.pages[url]
+            self.save()
+
+    def close(self, clean):
+        self.clean_close = clean
+        self.save()
@@ -0,0 +1,336 @@
+import os
+import sys
+import json
+import atexit
+import logging
+import argparse
+import itertools
+import threading
+import subprocess
+
+logger = logging.getLogger(__name__)
+
+# Crawler stats sent back with every finished crawl
+REPORTED_STATS = (
+    'item_scraped_count',
+    'finish_reason',
+    'elapsed_time_seconds',
+    'downloader/request_count',
+    'downloader/response_count',
+    'log_count/ERROR',
+)
+
+
+class CrawlError(Exception):
+    """A crawl failed or the crawler process went away"""
+
+
+def _spider_path(spider):
+    if isinstance(spider, str):
+        return spider
+    return f"{spider.__module__}.{spider.__qualname__}"
+
+
+def _serve(settings_module, overrides):
+    """Child process: one Twisted reactor running every crawl it is sent until told to stop"""
+    # Events go to the real stdout; anything spiders print goes to stderr with the logs
+    events = os.fdopen(os.dup(sys.stdout.fileno()), 'w', encoding='utf-8')
+    sys.stdout = sys.stderr
+    write_lock = threading.Lock()
+
+    def send(kind, crawl_id, payload):
+        line = json.dumps([kind, crawl_id, payload], default=str)
+        with write_lock:
+            events.write(line + '\n')
+            events.flush()
+
+    os.environ['SCRAPY_SETTINGS_MODULE'] = settings_module
+    from scrapy import signals
+    from scrapy.utils.log import configure_logging
+    from scrapy.utils.misc import load_object
+    from scrapy.utils.project import get_project_settings
+    from scrapy.utils.defer import deferred_from_coro
+    from scrapy.utils.reactor import install_reactor
+
+    settings = get_project_settings()
+    settings.setdict(overrides or {}, priority='cmdline')
+    if settings.get('TWISTED_REACTOR'):
+        install_reactor(settings['TWISTED_REACTOR'])
+    from twisted.internet import reactor
+    from scrapy.crawler import Crawler, CrawlerRunner
+
+    configure_logging(settings)
+    runner = CrawlerRunner(settings)
+    crawlers = {}
+
+    def start(crawl_id, spider_path, kwargs, crawl_settings=None):
+        try:
+            spidercls = load_object(spider_path)
+            if crawl_settings:
+                # Settings of this crawl only, e.g. its JOBDIR
+                own_settings = settings.copy()
+                own_settings.setdict(crawl_settings, priority='cmdline')
+                crawler = Crawler(spidercls, own_settings)
+            else:
+                crawler = runner.create_crawler(spidercls)
+        except Exception as e:
+            send('error', crawl_id, f"Could not load spider {spider_path}: {e}")
+            return
+
+        def item_scraped(item, **kwargs):
+            send('item', crawl_id, dict(item))
+
+        # The closure has no other reference; a weak receiver would be collected at once
+        crawler.signals.connect(item_scraped, signal=signals.item_scraped, weak=False)
+        crawlers[crawl_id] = crawler
+
+        def finished(result):
+            crawlers.pop(crawl_id, None)
+            stats = crawler.stats.get_stats() if crawler.stats else {}
+            report = {key: stats[key] for key in REPORTED_STATS if key in stats}
+            if hasattr(result, 'getErrorMessage'):
+                send('error', crawl_id, result.getErrorMessage())
+            else:
+                send('done', crawl_id, report)
+
+        runner.crawl(crawler, **kwargs).addBoth(finished)
+
+    def cancel(crawl_id):
+        crawler = crawlers.get(crawl_id)
+        if crawler is None:
+            return
+        if crawler.engine is None or not crawler.engine.running:
+            # Still starting up, and stopping now would be ignored; try again shortly
+            reactor.callLater(0.1, cancel, crawl_id)
+        else:
+            # Scrapy 2.13+ deprecates stop() in favour of stop_async()
+            stop_async = getattr(crawler, 'stop_async', None)
+            crawler.stop() if stop_async is None else deferred_from_coro(stop_async())
+
+    def stop():
+        runner.stop().addBoth(lambda _: reactor.stop())
+
+    def read_requests():
+        # Blocking reads stay off the reactor thread; EOF means the parent is gone
+        for line in sys.stdin:
+            kind, crawl_id, *args = json.loads(line)
+            if kind == 'crawl':
+                reactor.callFromThread(start, crawl_id, *args)
+            elif kind == 'cancel':
+                reactor.callFromThread(cancel, crawl_id)
+            elif kind == 'stop':
+                break
+        reactor.callFromThread(stop)
+
+    threading.Thread(target=read_requests, name='crawl-requests', daemon=True).start()
+    send('ready', None, os.getpid())
+    reactor.run(installSignalHandlers=False)
+
+
+class CrawlHandle:
+    """A crawl submitted to a CrawlRunner; items are passed to on_item as they arrive"""
+
+    def __init__(self, runner, crawl_id, on_item=None):
+        self.runner = runner
+        self.id = crawl_id
+        self.on_item = on_item
+        self.items = 0
+        self.stats = {}
+        self.error = None
+        self._done = threading.Event()
+
+    @property
+    def finished(self):
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        """Block until the crawl ends and return its stats; raises CrawlError if it failed"""
+        if not self._done.wait(timeout):
+            raise CrawlError(f"Crawl {self.id} still running after {timeout}s")
+        if self.error:
+            raise CrawlError(self.error)
+        return self.stats
+
+    def cancel(self):
+        """Ask the crawler to stop; items scraped so far are kept"""
+        self.runner.cancel(self.id)
+
+    def _finish(self, stats=None, error=None):
+        self.stats = stats or {}
+        self.error = error
+        self._done.set()
+
+
+class CrawlRunner:
+    """
+    Runs Scrapy spiders in a long-lived child process.
+
+    A Twisted reactor cannot be restarted, so instead of CrawlerProcess.start()
+    in the caller, one child process (running ``main()`` below)
+    keeps a reactor and a CrawlerRunner alive and runs every crawl it is sent,
+    several at once. Crawl requests are JSON lines on the child's stdin;
+    scraped items, completion and errors come back as JSON lines on its
+    stdout, where a dispatcher thread hands them to the matching CrawlHandle.
+    Scrapy's log goes to the app's stderr. If the child dies, its running
+    crawls fail and the next crawl starts a new one.
+    """
+
+    def __init__(self, settings_module='scrapers.scrapy_settings', settings=None, start_timeout=60):
+        self.settings_module = settings_module
+        self.settings = settings or {}
+        self.start_timeout = start_timeout
+        self._process = None
+        self._handles = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._stats = {'crawls': 0, 'items': 0, 'failed': 0, 'process_starts': 0}
+        atexit.register(self.shutdown)
+
+    def start(self):
+        """Start the crawler process if it is not running (idempotent)"""
+        with self._lock:
+            if self._process is not None and self._process.poll() is None:
+                return
+            # The child imports scrapers.* from the project root whatever the cwd
+            root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            env = dict(os.environ)
+            env['PYTHONPATH'] = os.pathsep.join(filter(None, [root, env.get('PYTHONPATH')]))
+            process = subprocess.Popen(
+                [sys.executable, '-c', 'from scrapers.crawl_runner import main; main()',
+                 '--settings', self.settings_module, '--overrides', json.dumps(self.settings)],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                env=env,
+                text=True,
+                encoding='utf-8',
+                bufsize=1
+            )
+            self._process = process
+            self._stats['process_starts'] += 1
+
+            # The child answers 'ready' before it accepts crawls
+            ready = {}
+            reader = threading.Thread(target=lambda: ready.update(line=process.stdout.readline()), daemon=True)
+            reader.start()
+            reader.join(self.start_timeout)
+            try:
+                kind, _, pid = json.loads(ready.get('line') or 'null') or (None, None, None)
+            except ValueError:
+                kind, pid = None, None
+            if kind != 'ready':
+                process.kill()
+                self._process = None
+                raise CrawlError(f"Crawler process did not start within {self.start_timeout}s")
+
+        logger.info(f"Crawler process {pid} started")
+        threading.Thread(target=self._dispatch, args=(process,), name='crawl-events', daemon=True).start()
+
+    def _send(self, process, *message):
+        try:
+            process.stdin.write(json.dumps(message) + '\n')
+            process.stdin.flush()
+        except (BrokenPipeError, OSError, ValueError) as e:
+            raise CrawlError(f"Crawler process is not accepting requests: {e}")
+
+    def crawl(self, spider, on_item=None, settings=None, **kwargs):
+        """Start spider (class or import path) with kwargs and return its CrawlHandle
+
+        settings are Scrapy settings for this crawl only, on top of the runner's.
+        """
+        self.start()
+        with self._lock:
+            handle = CrawlHandle(self, next(self._ids), on_item)
+            self._handles[handle.id] = handle
+            self._stats['crawls'] += 1
+            try:
+                self._send(self._process, 'crawl', handle.id, _spider_path(spider), kwargs, settings or {})
+            except CrawlError:
+                del self._handles[handle.id]
+                raise
+        return handle
+
+    def cancel(self, crawl_id):
+        with self._lock:
+            if crawl_id in self._handles and self._process is not None:
+                self._send(self._process, 'cancel', crawl_id)
+
+    def _dispatch(self, process):
+        for line in process.stdout:
+            try:
+                kind, crawl_id, payload = json.loads(line)
+            except ValueError:
+                logger.warning(f"Unexpected output from crawler process: {line.strip()}")
+                continue
+
+            with self._lock:
+                handle = self._handles.get(crawl_id)
+            if handle is None:
+                continue
+            if kind == 'item':
+                handle.items += 1
+                with self._lock:
+                    self._stats['items'] += 1
+                if handle.on_item is not None:
+                    try:
+                        handle.on_item(payload)
+                    except Exception:
+                        logger.exception(f"on_item callback of crawl {crawl_id} failed")
+            elif kind in ('done', 'error'):
+                with self._lock:
+                    self._handles.pop(crawl_id, None)
+                    if kind == 'error':
+                        self._stats['failed'] += 1
+                if kind == 'done':
+                    handle._finish(stats=payload)
+                else:
+                    handle._finish(error=payload)
+
+        # stdout closed: the child exited
+        self._fail_all(process, f"Crawler process exited with code {process.wait()}")
+
+    def _fail_all(self, process, reason):
+        with self._lock:
+            if self._process is not process:
+                return
+            logger.error(reason)
+            handles = list(self._handles.values())
+            self._handles.clear()
+            self._stats['failed'] += len(handles)
+            self._process = None
+        for handle in handles:
+            handle._finish(error=reason)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['running'] = len(self._handles)
+            stats['pid'] = self._process.pid if self._process is not None else None
+        return stats
+
+    def shutdown(self, timeout=10):
+        """Stop the reactor after running crawls are closed, then the process"""
+        with self._lock:
+            process = self._process
+            self._process = None
+            handles = list(self._handles.values())
+            self._handles.clear()
+        if process is not None and process.poll() is None:
+            try:
+                self._send(process, 'stop', None)
+                process.wait(timeout)
+            except (CrawlError, subprocess.TimeoutExpired):
+                process.kill()
+        for handle in handles:
+            handle._finish(error="Crawl runner shut down")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Crawler process used by CrawlRunner')
+    parser.add_argument('--settings', default='scrapers.scrapy_settings')
+    parser.add_argument('--overrides', default='{}', help='JSON object of Scrapy settings')
+    args = parser.parse_args()
+    _serve(args.settings, json.loads(args.overrides))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,362 @@
+import os
+import sys
+import time
+import queue
+import shutil
+import atexit
+import logging
+import functools
+import threading
+import subprocess
+from contextlib import contextmanager
+
+import undetected_chromedriver as uc
+
+logger = logging.getLogger(__name__)
+
+# Optional: without psutil browsers are still recycled by use count and age
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+
+class DriverPoolTimeout(Exception):
+    """No browser became free within the lease timeout"""
+
+
+@functools.lru_cache(maxsize=1)
+def get_chrome_version():
+    """Major version of the installed Chrome; detected once per process"""
+    try:
+        if sys.platform == 'win32':
+            # Common Chrome installation paths
+            possible_paths = [
+                r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+                r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
+                os.path.expanduser(r"~\AppData\Local\Google\Chrome\Application\chrome.exe")
+            ]
+            chrome_path = next((path for path in possible_paths if os.path.exists(path)), None)
+            if not chrome_path:
+                raise FileNotFoundError("Chrome executable not found.")
+            logger.info(f"Chrome executable found at: {chrome_path}")
+
+            # PowerShell command to fetch version
+            ps_cmd = f'powershell -NoProfile -Command "(Get-Item \\"{chrome_path}\\").VersionInfo.FileVersion"'
+            result = subprocess.run(ps_cmd, capture_output=True, text=True, shell=True)
+            version = result.stdout.strip()
+        else:
+            names = ('google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser',
+                     '/Applications/Google Chrome.app/Contents/MacOS/Google Chrome')
+            chrome_path = next((path for path in map(shutil.which, names) if path), None)
+            if not chrome_path:
+                raise FileNotFoundError("Chrome executable not found.")
+            logger.info(f"Chrome executable found at: {chrome_path}")
+            result = subprocess.run([chrome_path, '--version'], capture_output=True, text=True)
+            # e.g. "Google Chrome 120.0.6099.109"
+            version = result.stdout.strip().split(' ')[-1]
+
+        if not version:
+            raise Exception("Failed to detect Chrome version.")
+
+        major_version = version.split('.')[0]
+        logger.info(f"Detected Chrome version: {version} (Major: {major_version})")
+        return major_version
+
+    except Exception as e:
+        logger.error(f"Error fetching Chrome version: {e}")
+        raise
+
+
+def create_driver():
+    """Launch an undetected-chromedriver browser parked on about:blank"""
+    logger.info("Setting up undetected-chromedriver...")
+
+    options = uc.ChromeOptions()
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--disable-gpu')
+    options.add_argument('--disable-extensions')
+    options.add_argument('--window-size=1920,1080')
+    options.add_argument('--ignore-certificate-errors')
+    options.add_argument('--log-level=3')
+    options.add_argument(f'--user-agent={USER_AGENT}')
+
+    driver = uc.Chrome(
+        options=options,
+        headless=False,  # Headless mode often doesn't work well with undetected-chromedriver
+        use_subprocess=True,
+        version_main=int(get_chrome_version())
+    )
+    try:
+        driver.set_page_load_timeout(60)
+        driver.get('about:blank')
+    except Exception:
+        driver.quit()
+        raise
+    logger.info("Undetected-chromedriver is ready.")
+    return driver
+
+
+class PooledDriver:
+    def __init__(self, driver):
+        self.driver = driver
+        self.created_at = time.monotonic()
+        self.uses = 0
+
+
+class DriverPool:
+    """
+    Keeps ``size`` Chrome instances warm and leases them to scrape jobs.
+
+    ``start()`` launches the browsers in the background so requests never pay
+    for browser start-up. A leased driver is health-checked before it is
+    handed out and reset (extra tabs closed, cookies and storage cleared,
+    back on about:blank) when it is returned. Drivers that fail either step,
+    have served ``max_uses`` leases, are older than ``max_age`` seconds or
+    whose browser processes use more than ``max_memory_mb`` are quit and
+    replaced in the background. With ``size=0`` every lease launches a
+    browser and quits it afterwards.
+    """
+
+    def __init__(self, size=2, max_uses=20, max_age=3600, max_memory_mb=1500,
+                 lease_timeout=900, factory=create_driver):
+        self.size = max(0, size)
+        self.max_uses = max_uses
+        self.max_age = max_age
+        self.max_memory_mb = max_memory_mb
+        self.lease_timeout = lease_timeout
+        self.factory = factory
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        # Live drivers plus ones being launched; never more than size
+        self._total = 0
+        self._closed = False
+        self._stats = {
+            'leases': 0,
+            'launched': 0,
+            'launch_failures': 0,
+            'recycled': 0,
+            'lease_wait_seconds': 0.0,
+        }
+        if psutil is None and max_memory_mb:
+            logger.info("psutil is not installed; browsers are recycled by use count and age only")
+        atexit.register(self.shutdown)
+
+    def start(self):
+        """Launch browsers up to size in background threads (idempotent)"""
+        with self._lock:
+            missing = self.size - self._total
+            self._total += max(0, missing)
+        for _ in range(missing):
+            self._spawn_async()
+
+    def _spawn_async(self):
+        threading.Thread(target=self._spawn, name='driver-launch', daemon=True).start()
+
+    def _spawn(self):
+        """Launch one browser into the idle queue; the slot is already counted in _total"""
+        try:
+            slot = self._launch()
+        except Exception as e:
+            logger.error(f"Could not launch pooled browser: {e}")
+            with self._lock:
+                self._total -= 1
+            return
+        if self._closed:
+            self._quit(slot)
+            with self._lock:
+                self._total -= 1
+            return
+        self._idle.put(slot)
+
+    def _launch(self):
+        start = time.perf_counter()
+        try:
+            driver = self.factory()
+        except Exception:
+            with self._lock:
+                self._stats['launch_failures'] += 1
+            raise
+        with self._lock:
+            self._stats['launched'] += 1
+        logger.info(f"Browser launched in {time.perf_counter() - start:.1f}s")
+        return PooledDriver(driver)
+
+    @contextmanager
+    def lease(self, timeout=None):
+        """Borrow a ready driver for the duration of the with block"""
+        slot = self._acquire(self.lease_timeout if timeout is None else timeout)
+        try:
+            yield slot.driver
+        finally:
+            self._release(slot)
+
+    def _acquire(self, timeout):
+        if self._closed:
+            raise RuntimeError("Driver pool is shut down")
+        if self.size == 0:
+            return self._launch()
+
+        start = time.monotonic()
+        deadline = start + timeout
+        while True:
+            try:
+                slot = self._idle.get_nowait()
+            except queue.Empty:
+                slot = None
+                with self._lock:
+                    # Pre-warming failed or has not been started: launch in the caller
+                    launch = self._total < self.size
+                    if launch:
+                        self._total += 1
+                if launch:
+                    try:
+                        slot = self._launch()
+                    except Exception:
+                        with self._lock:
+                            self._total -= 1
+                        raise
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise DriverPoolTimeout(f"No browser became free within {timeout:g}s")
+                    try:
+                        # Short waits so a slot freed by a failed launch is noticed
+                        slot = self._idle.get(timeout=min(remaining, 1.0))
+                    except queue.Empty:
+                        continue
+
+            if self._healthy(slot):
+                break
+            self._retire(slot, 'failed health check')
+
+        waited = time.monotonic() - start
+        with self._lock:
+            self._stats['leases'] += 1
+            self._stats['lease_wait_seconds'] += waited
+        if waited >= 1:
+            logger.info(f"Waited {waited:.1f}s for a browser")
+        return slot
+
+    def _release(self, slot):
+        slot.uses += 1
+        if self.size == 0:
+            self._quit(slot)
+            return
+        if self._closed:
+            self._quit(slot)
+            with self._lock:
+                self._total -= 1
+            return
+
+        reason = None
+        if not self._reset(slot):
+            reason = 'reset failed'
+        elif self.max_uses and slot.uses >= self.max_uses:
+            reason = f'served {slot.uses} leases'
+        elif self.max_age and time.monotonic() - slot.created_at > self.max_age:
+            reason = 'reached max age'
+        else:
+            memory = self._memory_mb(slot)
+            if memory is not None and self.max_memory_mb and memory > self.max_memory_mb:
+                reason = f'using {memory:.0f} MiB'
+
+        if reason:
+            self._retire(slot, reason)
+        else:
+            self._idle.put(slot)
+
+    def _retire(self, slot, reason):
+        """Quit a driver and launch its replacement in the background"""
+        logger.info(f"Recycling browser: {reason}")
+        self._quit(slot)
+        with self._lock:
+            self._stats['recycled'] += 1
+            if self._closed:
+                self._total -= 1
+                return
+        # The slot stays counted in _total while its replacement launches
+        self._spawn_async()
+
+    @staticmethod
+    def _healthy(slot):
+        try:
+            return slot.driver.execute_script('return 1') == 1 and bool(slot.driver.window_handles)
+        except Exception as e:
+            logger.warning(f"Browser health check failed: {e}")
+            return False
+
+    @staticmethod
+    def _reset(slot):
+        """Close extra tabs and clear cookies and storage so the next lease starts clean"""
+        driver = slot.driver
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            try:
+                driver.execute_script('window.localStorage.clear(); window.sessionStorage.clear();')
+            except Exception:
+                pass  # about:blank and some error pages have no storage
+            try:
+                # Clears cookies of every domain, not just the current page's
+                driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+            except Exception:
+                driver.delete_all_cookies()
+            driver.get('about:blank')
+            return True
+        except Exception as e:
+            logger.warning(f"Browser reset failed: {e}")
+            return False
+
+    @staticmethod
+    def _memory_mb(slot):
+        """Resident memory of the browser and its child processes, if it can be measured"""
+        pid = getattr(slot.driver, 'browser_pid', None)
+        if psutil is None or not pid:
+            return None
+        try:
+            process = psutil.Process(pid)
+            rss = process.memory_info().rss
+            for child in process.children(recursive=True):
+                try:
+                    rss += child.memory_info().rss
+                except psutil.Error:
+                    pass
+            return rss / 1024 / 1024
+        except psutil.Error:
+            return None
+
+    @staticmethod
+    def _quit(slot):
+        try:
+            slot.driver.quit()
+        except Exception as e:
+            logger.warning(f"Error closing browser: {e}")
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['browsers'] = self._total
+        stats['size'] = self.size
+        stats['idle'] = self._idle.qsize()
+        if stats['leases']:
+            stats['avg_lease_wait_seconds'] = round(stats['lease_wait_seconds'] / stats['leases'], 2)
+        return stats
+
+    def shutdown(self):
+        """Quit every idle browser; leased ones are quit when they are returned"""
+        self._closed = True
+        while True:
+            try:
+                slot = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._quit(slot)
+            with self._lock:
+                self._total -= 1
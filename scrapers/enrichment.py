@@ -0,0 +1,302 @@
+import re
+import time
+import asyncio
+import logging
+import weakref
+from contextlib import asynccontextmanager
+from urllib.parse import urlparse
+
+import aiohttp
+
+from .html_parser import make_soup
+from .http_client import get_session
+from .parse_pool import run_parse
+
+logger = logging.getLogger(__name__)
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+}
+
+# EnrichmentCache rows holding parse_website() results
+CACHE_EXTRACTOR = 'website_details'
+
+
+def normalize_url(url):
+    # Add https:// if not present
+    if not url.startswith(('http://', 'https://')):
+        url = 'https://' + url
+    return url
+
+
+def extract_email_addresses(text):
+    """Extract email addresses from text using regex."""
+    email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
+    return list(set(re.findall(email_pattern, text)))
+
+
+def extract_phone_numbers(text):
+    """Extract phone numbers from text using regex."""
+    phone_patterns = [
+        r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b',  # Standard US format
+        r'\(\d{3}\)\s*\d{3}[-.]?\d{4}',     # (123) 456-7890
+        r'\+1[-.]?\d{3}[-.]?\d{3}[-.]?\d{4}' # +1 format
+    ]
+    phones = []
+    for pattern in phone_patterns:
+        phones.extend(re.findall(pattern, text))
+    return list(set(phones))
+
+
+def extract_license_numbers(text):
+    """Extract potential license numbers using common patterns."""
+    license_patterns = [
+        r'License\s*#?\s*(\w+[-\s]?\d+)',
+        r'License\s*Number\s*[:.]?\s*(\w+[-\s]?\d+)',
+        r'Lic\s*[:.#]?\s*(\w+[-\s]?\d+)',
+        r'Registration\s*#?\s*(\w+[-\s]?\d+)',
+        r'Cert\s*[:.#]?\s*(\w+[-\s]?\d+)'
+    ]
+    licenses = []
+    for pattern in license_patterns:
+        matches = re.finditer(pattern, text, re.IGNORECASE)
+        for match in matches:
+            licenses.append(match.group(1))
+    return list(set(licenses))
+
+
+def extract_experience(text):
+    """Extract experience information using common patterns."""
+    experience_patterns = [
+        r'(\d+)\+?\s*years?\s*(of\s*)?experience',
+        r'(established|founded|serving\s*since)\s*in?\s*(\d{4})',
+        r'since\s*(\d{4})',
+        r'est\.\s*(\d{4})',
+        r'experience\s*[:of]*\s*(\d+)\+?\s*years?'
+    ]
+    experiences = []
+    for pattern in experience_patterns:
+        matches = re.finditer(pattern, text, re.IGNORECASE)
+        for match in matches:
+            if len(match.groups()) > 1 and match.group(2):
+                # For patterns with year
+                year = int(match.group(2))
+                current_year = time.localtime().tm_year
+                years = current_year - year
+                experiences.append(f"{years} years (since {year})")
+            else:
+                # For patterns with direct year mention
+                experiences.append(f"{match.group(1)} years")
+    return list(set(experiences))
+
+
+def extract_description(soup):
+    """Extract business description from common locations in the webpage."""
+    description = ""
+
+    # Common description locations
+    description_selectors = [
+        'meta[name="description"]',
+        'meta[property="og:description"]',
+        '.about-us',
+        '.company-description',
+        '.business-description',
+        '#about',
+        '.about',
+        '.overview',
+        '.description',
+        '[id*="about"]',
+        '[class*="about"]',
+        '[id*="overview"]',
+        '[class*="overview"]'
+    ]
+
+    # Try meta descriptions first
+    for selector in description_selectors[:2]:
+        meta = soup.select_one(selector)
+        if meta and meta.get('content'):
+            description = meta['content'].strip()
+            break
+
+    # If no meta description, try content sections
+    if not description:
+        for selector in description_selectors[2:]:
+            elements = soup.select(selector)
+            for element in elements:
+                text = element.get_text(strip=True)
+                if len(text) > len(description):
+                    description = text
+
+    return description
+
+
+def parse_website(html, backend=None):
+    """Details found on a business website; module-level so it can run in the parse pool"""
+    soup = make_soup(html, backend)
+
+    # Get all text content
+    text_content = soup.get_text()
+
+    # Extract various details
+    emails = extract_email_addresses(text_content)
+    phones = extract_phone_numbers(text_content)
+    licenses = extract_license_numbers(text_content)
+    experiences = extract_experience(text_content)
+    description = extract_description(soup)
+
+    return {
+        'Website Description': description[:500] if description else "",  # Limit description length
+        'Additional Emails': ', '.join(emails) if emails else "",
+        'Additional Phones': ', '.join(phones) if phones else "",
+        'License Numbers': ', '.join(licenses) if licenses else "",
+        'Experience': ', '.join(experiences) if experiences else "",
+        'Website Status': 'Active'
+    }
+
+
+def merge_details(record, details):
+    """Copy the non-empty website details into record"""
+    for key, value in details.items():
+        if value:
+            record[key] = value
+    return record
+
+
+class WebsiteEnricher:
+    """
+    Fetches business websites concurrently and adds their details to records.
+
+    At most ``max_concurrency`` sites are fetched at once, and at most
+    ``per_domain`` from the same host. Once a fetch has its slot it gets
+    ``deadline`` seconds; when the deadline passes mid-download the part
+    already received is parsed and the record is marked 'Partial' instead
+    of being dropped. Bodies are capped at ``max_bytes`` and parsed in the
+    parse pool, never on the event loop. Semaphores are kept per event loop,
+    like the pooled HTTP session.
+
+    With an EnrichmentCache, fresh entries for a domain are returned without
+    any request, stale ones are revalidated with If-None-Match /
+    If-Modified-Since, and complete ('Active') results are stored.
+    """
+
+    def __init__(self, max_concurrency=10, per_domain=2, deadline=20, max_bytes=2 * 1024 * 1024,
+                 parser_backend=None, parse_pool=None, cache=None):
+        self.max_concurrency = max_concurrency
+        self.per_domain = per_domain
+        self.deadline = deadline
+        self.max_bytes = max_bytes
+        self.parser_backend = parser_backend
+        self.parse_pool = parse_pool
+        self.cache = cache
+        # loop -> (global semaphore, {domain: [semaphore, users]})
+        self._limits = weakref.WeakKeyDictionary()
+        self._stats = {'Active': 0, 'Partial': 0, 'Timeout': 0, 'Error': 0, 'seconds': 0.0}
+        self._cache_stats = {'cache_hits': 0, 'revalidated': 0}
+
+    @asynccontextmanager
+    async def _slot(self, domain):
+        """Hold a per-domain slot, then a global one; idle domains are forgotten"""
+        loop = asyncio.get_running_loop()
+        limits = self._limits.get(loop)
+        if limits is None:
+            limits = self._limits[loop] = (asyncio.Semaphore(self.max_concurrency), {})
+        overall, domains = limits
+        entry = domains.get(domain)
+        if entry is None:
+            entry = domains[domain] = [asyncio.Semaphore(self.per_domain), 0]
+        entry[1] += 1
+        try:
+            # Domain first, so a busy domain does not sit on global slots while it waits
+            async with entry[0], overall:
+                yield
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del domains[domain]
+
+    async def _download(self, url, body, validators):
+        """Stream the response into body['chunks'] so a deadline keeps what has arrived"""
+        session = get_session()
+        async with session.get(url, headers={**HEADERS, **validators}, allow_redirects=True) as response:
+            if response.status == 304 and validators:
+                body['not_modified'] = True
+                return
+            response.raise_for_status()
+            body['charset'] = response.charset or 'utf-8'
+            body['etag'] = response.headers.get('ETag')
+            body['last_modified'] = response.headers.get('Last-Modified')
+            size = 0
+            async for chunk in response.content.iter_chunked(64 * 1024):
+                body['chunks'].append(chunk)
+                size += len(chunk)
+                if size >= self.max_bytes:
+                    break
+
+    async def fetch_details(self, url):
+        """Website details for url; errors and timeouts are reported in 'Website Status'"""
+        url = normalize_url(url)
+        domain = urlparse(url).hostname or url
+        entry = self.cache.lookup(url, CACHE_EXTRACTOR) if self.cache else None
+        if entry is not None and entry.fresh:
+            self._cache_stats['cache_hits'] += 1
+            return dict(entry.details)
+
+        body = {'chunks': [], 'charset': 'utf-8'}
+        timed_out = False
+
+        async with self._slot(domain):
+            logger.info(f"Scraping business website: {url}")
+            start = time.perf_counter()
+            try:
+                validators = entry.validators(url) if entry is not None else {}
+                await asyncio.wait_for(self._download(url, body, validators), self.deadline)
+            except asyncio.TimeoutError:
+                timed_out = True
+            except Exception as e:
+                logger.warning(f"Error accessing website {url}: {str(e)}")
+                return self._count({'Website Status': 'Error', 'Website Error': str(e)}, start)
+
+        if body.get('not_modified'):
+            self.cache.touch(url, CACHE_EXTRACTOR)
+            self._cache_stats['revalidated'] += 1
+            return self._count(dict(entry.details), start)
+
+        if timed_out and not body['chunks']:
+            logger.warning(f"No response from website {url} within {self.deadline}s")
+            return self._count({
+                'Website Status': 'Timeout',
+                'Website Error': f'No response within {self.deadline}s'
+            }, start)
+
+        html = b''.join(body['chunks']).decode(body['charset'], errors='replace')
+        try:
+            details = await run_parse(self.parse_pool, parse_website, html, self.parser_backend)
+        except Exception as e:
+            logger.error(f"Error scraping website {url}: {str(e)}")
+            return self._count({'Website Status': 'Error', 'Website Error': str(e)}, start)
+        if timed_out:
+            details['Website Status'] = 'Partial'
+        elif self.cache is not None:
+            self.cache.store(url, CACHE_EXTRACTOR, details, body.get('etag'), body.get('last_modified'))
+        return self._count(details, start)
+
+    def _count(self, details, start):
+        self._stats[details['Website Status']] += 1
+        self._stats['seconds'] += time.perf_counter() - start
+        return details
+
+    async def enrich(self, record):
+        """Add website details to record in place (if it has a website) and return it"""
+        website = record.get('Website')
+        if website:
+            merge_details(record, await self.fetch_details(website))
+        return record
+
+    def stats(self):
+        stats = {status.lower(): count for status, count in self._stats.items() if status != 'seconds'}
+        fetched = sum(stats.values())
+        stats['websites'] = fetched
+        if fetched:
+            stats['avg_seconds'] = round(self._stats['seconds'] / fetched, 2)
+        stats.update(self._cache_stats)
+        return stats
@@ -0,0 +1,158 @@
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_domain(url):
+    """Lower-case host of url without 'www.' or port"""
+    if '://' not in url:
+        url = 'https://' + url
+    host = (urlparse(url).hostname or '').lower().rstrip('.')
+    return host[4:] if host.startswith('www.') else host
+
+
+def site_key(url):
+    """
+    Cache key of a business website: its domain, plus the path when the
+    website is a page rather than a site's root. Businesses whose "website"
+    is a page on a shared host (facebook.com/..., sites.google.com/...,
+    linktr.ee/...) each get their own entry.
+    """
+    if '://' not in url:
+        url = 'https://' + url
+    path = urlparse(url).path.rstrip('/')
+    return normalize_domain(url) + path
+
+
+class EnrichmentEntry:
+    def __init__(self, url, details, etag, last_modified, fetched_at, ttl):
+        self.url = url
+        self.details = details
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = fetched_at
+        self.fresh = time.time() - fetched_at < ttl
+
+    def validators(self, url):
+        """Conditional request headers, only when url is the page the entry was built from"""
+        headers = {}
+        if url != self.url:
+            return headers
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class EnrichmentCache:
+    """
+    Website details per business website (see ``site_key``), kept across runs.
+
+    Each row holds what one extractor (the app's enricher or the Scrapy
+    spider) found on a website, plus the page's ETag and
+    Last-Modified. Entries younger than ``ttl_hours`` are used as they are;
+    older ones are revalidated with a conditional request, and a 304 makes
+    them fresh again without downloading or parsing the page. Entries not
+    validated for ``max_stale_days`` are deleted. Storage follows
+    ResponseCache: SQLite in WAL mode with one connection per thread.
+    """
+
+    def __init__(self, path, ttl_hours=168, max_stale_days=30):
+        self.path = path
+        self.ttl = ttl_hours * 3600
+        self.max_stale = max(max_stale_days * 86400, self.ttl)
+        self._local = threading.local()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = self._connect()
+        # domain holds the site_key of the website
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS enrichment (
+                domain TEXT NOT NULL,
+                extractor TEXT NOT NULL,
+                url TEXT NOT NULL,
+                details TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                PRIMARY KEY (domain, extractor)
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_enrichment_fetched ON enrichment (fetched_at)")
+
+    def _connect(self):
+        """Return the SQLite connection for the current thread"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def lookup(self, url, extractor):
+        """Return the EnrichmentEntry for url's website (fresh or due for revalidation), or None"""
+        domain = site_key(url)
+        try:
+            row = self._connect().execute(
+                "SELECT url, details, etag, last_modified, fetched_at FROM enrichment "
+                "WHERE domain = ? AND extractor = ?", (domain, extractor)
+            ).fetchone()
+            if not row or time.time() - row[4] >= self.max_stale:
+                return None
+            if site_key(row[0]) != domain:
+                # Built from another page on the same host (rows keyed by host alone)
+                return None
+            return EnrichmentEntry(row[0], json.loads(row[1]), row[2], row[3], row[4], self.ttl)
+        except Exception as e:
+            logger.error(f"Error reading enrichment cache for {domain}: {str(e)}")
+            return None
+
+    def store(self, url, extractor, details, etag=None, last_modified=None):
+        """Save the details extracted from url's website with the page's validators"""
+        domain = site_key(url)
+        try:
+            now = time.time()
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO enrichment "
+                "(domain, extractor, url, details, etag, last_modified, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (domain, extractor, url, json.dumps(details), etag, last_modified, now)
+            )
+            conn.execute("DELETE FROM enrichment WHERE fetched_at <= ?", (now - self.max_stale,))
+        except Exception as e:
+            logger.error(f"Error writing enrichment cache for {domain}: {str(e)}")
+
+    def touch(self, url, extractor):
+        """Mark an entry fresh again after a 304 Not Modified"""
+        domain = site_key(url)
+        try:
+            self._connect().execute(
+                "UPDATE enrichment SET fetched_at = ? WHERE domain = ? AND extractor = ?",
+                (time.time(), domain, extractor)
+            )
+        except Exception as e:
+            logger.error(f"Error updating enrichment cache for {domain}: {str(e)}")
+
+    def clear(self):
+        """Remove every cached website"""
+        self._connect().execute("DELETE FROM enrichment")
+
+    def stats(self):
+        """Return the number of cached websites and how many of them are fresh"""
+        entries, fresh = self._connect().execute(
+            "SELECT COUNT(*), COALESCE(SUM(fetched_at > ?), 0) FROM enrichment",
+            (time.time() - self.ttl,)
+        ).fetchone()
+        return {'entries': entries, 'fresh': fresh}
@@ -0,0 +1,363 @@
+import os
+import json
+import hashlib
+import logging
+import tempfile
+import pandas as pd
+import xlsxwriter
+
+logger = logging.getLogger(__name__)
+
+# pandas' to_excel header style, used for sheets written without custom formatting
+PLAIN_HEADER_FORMAT = {'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'}
+
+# Records are cleaned, and column widths measured, this many rows at a time
+CHUNK_SIZE = 5000
+
+
+def _squash_whitespace(value):
+    # str.split() strips and splits on any whitespace run in one C-level pass
+    return ' '.join(value.split()) if isinstance(value, str) else value
+
+
+def clean_frame(df):
+    """
+    Normalise the text columns of df in place and return it.
+
+    Text is stripped and every whitespace run (newlines, tabs, repeated
+    spaces) becomes one space in a single pass per column; empty text
+    becomes a blank cell. Non-text cells are left alone.
+    """
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+            continue
+        cleaned = series.map(_squash_whitespace, na_action='ignore')
+        df[col] = cleaned.mask(cleaned == '')
+    return df
+
+
+def frame_records(df):
+    """Rows of df as dicts of plain Python values, with None for blank cells"""
+    df = df.astype(object)
+    return df.where(df.notna(), None).to_dict('records')
+
+
+def text_widths(df):
+    """Longest cell text of every column, from vectorised string lengths"""
+    widths = []
+    for col in df.columns:
+        values = df[col].dropna()
+        widths.append(int(values.astype(str).str.len().max()) if len(values) else 0)
+    return widths
+
+
+def cell_text(value):
+    """Text of a cell as it is written and measured for the column width"""
+    if value is None:
+        return ''
+    return value if isinstance(value, str) else str(value)
+
+
+def _row_key(values):
+    """Compact digest of the duplicate-key values; keeps the seen set small for big exports"""
+    return hashlib.blake2b(json.dumps(values, sort_keys=True, default=str).encode('utf-8'), digest_size=16).digest()
+
+
+class ExcelExport:
+    """
+    Streaming export of business records to an .xlsx file.
+
+    Records are queued as they arrive (``add``/``add_many``), cleaned in
+    chunks of CHUNK_SIZE with clean_frame and spooled to a temporary
+    JSON-lines file, so at most one chunk is held in memory. ``finalize``
+    makes one pass over the spool, dropping duplicates with a set of keys, and
+    writes the rows with xlsxwriter in constant_memory mode, measuring column
+    widths one chunk at a time. Subclasses describe the sheet layout of each
+    export.
+    """
+
+    sheet_name = 'Business Data'
+    header_format = {
+        'bold': True,
+        'text_wrap': True,
+        'valign': 'top',
+        'fg_color': '#D7E4BC',
+        'border': 1
+    }
+    # Columns in this order come first; 'fixed' keeps all of them even if empty
+    column_order = []
+    fixed_columns = True
+    # Columns that are not in column_order: 'sorted' or 'appearance' order
+    extra_columns = 'sorted'
+    duplicate_subset = ['Name']
+    column_widths = {}
+    max_width = 50
+    autofilter = True
+    # Reorder rows by sort_key() after deduplication
+    sort_rows = False
+
+    def __init__(self, filepath, spool_dir=None):
+        self.filepath = filepath
+        self.seen_columns = {}  # column -> first appearance (dict keeps order)
+        self.count = 0
+        self._pending = []  # records waiting to be cleaned as one chunk
+        spool = tempfile.NamedTemporaryFile(
+            mode='w+', encoding='utf-8', suffix='.jsonl', prefix='export_', dir=spool_dir, delete=False
+        )
+        self._spool = spool
+        self.spool_path = spool.name
+
+    def add(self, record):
+        """Queue a record; every CHUNK_SIZE records are cleaned together and spooled"""
+        if not isinstance(record, dict):
+            return
+        for key in record:
+            self.seen_columns.setdefault(key, None)
+        self._pending.append(record)
+        self.count += 1
+        if len(self._pending) >= CHUNK_SIZE:
+            self._flush_pending()
+
+    def _flush_pending(self):
+        if not self._pending:
+            return
+        chunk = clean_frame(pd.DataFrame.from_records(self._pending))
+        self._pending = []
+        for record in frame_records(chunk):
+            self._spool.write(json.dumps(record, default=str))
+            self._spool.write('\n')
+        self._spool.flush()
+
+    def add_many(self, records):
+        for record in records:
+            self.add(record)
+
+    def columns(self):
+        """Final column order, known once every record has been added"""
+        if self.fixed_columns:
+            columns = list(self.column_order)
+        else:
+            columns = [col for col in self.column_order if col in self.seen_columns]
+        extras = [col for col in self.seen_columns if col not in columns]
+        if self.extra_columns == 'sorted':
+            extras.sort()
+        return columns + extras
+
+    def duplicate_key_columns(self, columns):
+        return [col for col in self.duplicate_subset if col in columns]
+
+    def convert(self, row):
+        """Per-row conversion applied after deduplication (e.g. numeric columns)"""
+        return row
+
+    def sort_key(self, row):
+        """Sort key of a converted row when sort_rows is set"""
+        return ()
+
+    def _unique_rows(self, columns):
+        """Yield (offset, row) for the first record of every duplicate key"""
+        key_columns = self.duplicate_key_columns(columns)
+        seen = set()
+        self._spool.flush()
+        with open(self.spool_path, encoding='utf-8') as spool:
+            while True:
+                offset = spool.tell()
+                line = spool.readline()
+                if not line:
+                    break
+                record = json.loads(line)
+                row = [record.get(col) for col in columns]
+                key = _row_key([record.get(col) for col in key_columns])
+                if key in seen:
+                    continue
+                seen.add(key)
+                yield offset, row
+
+    def _ordered_rows(self, columns):
+        rows = self._unique_rows(columns)
+        if not self.sort_rows:
+            for _, row in rows:
+                yield self.convert(row)
+            return
+
+        # Only (sort key, file offset) pairs are kept in memory; rows are re-read in order
+        index = [(self.sort_key(self.convert(row)), offset) for offset, row in rows]
+        index.sort(key=lambda entry: entry[0])
+        with open(self.spool_path, encoding='utf-8') as spool:
+            for _, offset in index:
+                spool.seek(offset)
+                record = json.loads(spool.readline())
+                yield self.convert([record.get(col) for col in columns])
+
+    def write_sheet_formats(self, workbook, worksheet, columns, widths):
+        """Set the column widths (and any column formats) once all rows are written"""
+        for idx, col in enumerate(columns):
+            width = self.column_widths.get(col, min(widths[idx], self.max_width))
+            worksheet.set_column(idx, idx, width)
+
+    def finalize(self, report=None):
+        """Write the workbook and remove the spool; returns the number of unique rows"""
+        try:
+            self._flush_pending()
+            columns = self.columns() or ['Name']
+            # URLs are written as plain text: xlsxwriter keeps every hyperlink in memory
+            # until close (and Excel caps them at 65,530 per sheet)
+            workbook = xlsxwriter.Workbook(self.filepath, {'constant_memory': True, 'strings_to_urls': False})
+            worksheet = workbook.add_worksheet(self.sheet_name)
+            header_format = workbook.add_format(self.header_format)
+
+            for col_num, value in enumerate(columns):
+                worksheet.write(0, col_num, value, header_format)
+
+            # Widths include the header and two characters of padding
+            widths = [len(str(col)) + 2 for col in columns]
+            rows_written = 0
+            chunk = []
+            for row in self._ordered_rows(columns):
+                rows_written += 1
+                for col_num, value in enumerate(row):
+                    if value is not None:
+                        worksheet.write(rows_written, col_num,
+                                        value if isinstance(value, (int, float)) else cell_text(value))
+                chunk.append(row)
+                if len(chunk) >= CHUNK_SIZE:
+                    self._update_widths(widths, chunk, columns)
+                    chunk = []
+            self._update_widths(widths, chunk, columns)
+
+            self.write_sheet_formats(workbook, worksheet, columns, widths)
+            if self.autofilter:
+                worksheet.autofilter(0, 0, rows_written, len(columns) - 1)
+
+            if report is not None:
+                self._write_report(workbook, report)
+
+            workbook.close()
+            return rows_written
+        finally:
+            self.discard()
+
+    @staticmethod
+    def _update_widths(widths, rows, columns):
+        if not rows:
+            return
+        for col_num, width in enumerate(text_widths(pd.DataFrame(rows, columns=columns, dtype=object))):
+            widths[col_num] = max(widths[col_num], width + 2)
+
+    def _write_report(self, workbook, report):
+        """One-row 'Scraping Report' sheet, laid out like DataFrame([report]).to_excel"""
+        worksheet = workbook.add_worksheet('Scraping Report')
+        header_format = workbook.add_format(PLAIN_HEADER_FORMAT)
+        # constant_memory flushes a row once the next one is started, so the header row goes first
+        for col_num, key in enumerate(report):
+            worksheet.write(0, col_num, key, header_format)
+        for col_num, value in enumerate(report.values()):
+            if value is None:
+                continue
+            if not isinstance(value, (bool, int, float)):
+                value = str(value)
+            worksheet.write(1, col_num, value)
+
+    def discard(self):
+        """Drop the spool without writing (also called by finalize)"""
+        try:
+            self._spool.close()
+        finally:
+            if os.path.exists(self.spool_path):
+                os.remove(self.spool_path)
+
+
+class ScrapeExcelExport(ExcelExport):
+    """JustDial/Sulekha export behind /scrape"""
+
+    column_order = [
+        'Name',
+        'Phone',
+        'Email',
+        'Website',
+        'Address Line 1',
+        'Address Line 2',
+        'Owner Name',
+        'Rating',
+        'Reviews Count',
+        'Category',
+        'Categories',  # For YellowPages
+        'Description',
+        'Company Name',
+        'Source'  # For YellowPages
+    ]
+    duplicate_subset = ['Name', 'Phone', 'Address']
+
+
+class YellowPagesExcelExport(ExcelExport):
+    """YellowPages export: fixed widths, rating format, sorted by rating and reviews"""
+
+    sheet_name = 'Sheet1'
+    header_format = {
+        'bold': True,
+        'text_wrap': True,
+        'valign': 'top',
+        'fg_color': '#D9D9D9',
+        'border': 1
+    }
+    fixed_columns = False
+    extra_columns = 'appearance'
+    duplicate_subset = ['Name', 'Phone', 'Address Line 1']
+    column_widths = {
+        'Name': 30,
+        'Rating': 10,
+        'Reviews Count': 12,
+        'Phone': 15,
+        'Email': 25,
+        'Website': 35,
+        'Address Line 1': 35,
+        'Address Line 2': 20,
+        'City': 20,
+        'State': 8,
+        'ZIP Code': 12,
+        'Owner Name': 25,
+        'Category': 30,
+        'Description': 50,
+        'Source': 12
+    }
+    autofilter = False
+    sort_rows = True
+
+    def columns(self):
+        # Same order a DataFrame built from the records would have
+        return list(self.seen_columns)
+
+    def _index(self, name):
+        if not hasattr(self, '_column_index'):
+            self._column_index = {col: idx for idx, col in enumerate(self.columns())}
+        return self._column_index.get(name)
+
+    def convert(self, row):
+        # Reviews Count is numeric (unparseable counts become 0) so it sorts and filters
+        idx = self._index('Reviews Count')
+        if idx is not None and not isinstance(row[idx], (int, float)):
+            try:
+                row[idx] = float(row[idx])
+            except (TypeError, ValueError):
+                row[idx] = 0
+        return row
+
+    def sort_key(self, row):
+        # Rating, then Reviews Count, both descending
+        values = []
+        for name in ('Rating', 'Reviews Count'):
+            idx = self._index(name)
+            value = row[idx] if idx is not None else 0
+            values.append(-(value if isinstance(value, (int, float)) else 0))
+        return tuple(values)
+
+    def write_sheet_formats(self, workbook, worksheet, columns, widths):
+        for idx, col in enumerate(columns):
+            worksheet.set_column(idx, idx, self.column_widths.get(col, widths[idx]))
+
+        # Add number format for Rating column
+        if 'Rating' in columns:
+            rating_format = workbook.add_format({'num_format': '0.0'})
+            rating_col = columns.index('Rating')
+            worksheet.set_column(rating_col, rating_col, 10, rating_format)
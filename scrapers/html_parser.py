@@ -0,0 +1,108 @@
+import logging
+from bs4 import BeautifulSoup
+
+logger = logging.getLogger(__name__)
+
+# Optional C-backed parsers; everything falls back to 'html.parser'
+try:
+    import lxml  # noqa: F401
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as SelectolaxParser
+except ImportError:
+    try:
+        from selectolax.parser import HTMLParser as SelectolaxParser
+    except ImportError:
+        SelectolaxParser = None
+
+PARSER_BACKENDS = ('html.parser', 'lxml', 'selectolax')
+DEFAULT_BACKEND = 'lxml' if HAS_LXML else 'html.parser'
+
+_fallback_warned = set()
+
+
+def available_backends():
+    """Return the backends that can actually be used in this environment"""
+    backends = ['html.parser']
+    if HAS_LXML:
+        backends.append('lxml')
+    if SelectolaxParser is not None:
+        backends.append('selectolax')
+    return backends
+
+
+def resolve_backend(backend):
+    """Map a requested backend to an installed one (selectolax -> lxml -> html.parser)"""
+    backend = backend or DEFAULT_BACKEND
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown HTML parser backend: {backend}")
+
+    resolved = backend
+    if resolved == 'selectolax' and SelectolaxParser is None:
+        resolved = 'lxml'
+    if resolved == 'lxml' and not HAS_LXML:
+        resolved = 'html.parser'
+
+    if resolved != backend and backend not in _fallback_warned:
+        _fallback_warned.add(backend)
+        logger.warning(f"HTML parser backend '{backend}' is not installed, using '{resolved}'")
+    return resolved
+
+
+def _soup_features(backend):
+    # selectolax has no BeautifulSoup tree builder; whole documents use lxml
+    return 'lxml' if backend in ('lxml', 'selectolax') else 'html.parser'
+
+
+def make_soup(html, backend=None):
+    """Parse a full document into a BeautifulSoup tree with the fastest usable builder"""
+    return BeautifulSoup(html, _soup_features(resolve_backend(backend)))
+
+
+def _css_for(tags, attrs):
+    """Translate a find_all(tags, attrs) spec into an equivalent CSS selector"""
+    selectors = []
+    for tag in tags:
+        selector = tag
+        for name, value in attrs.items():
+            if value is True:
+                selector += f'[{name}]'
+            elif name == 'class':
+                selector += '.' + '.'.join(value.split())
+            else:
+                selector += f'[{name}="{value}"]'
+        selectors.append(selector)
+    return ', '.join(selectors)
+
+
+def find_containers(html, tags, specs, backend=None):
+    """
+    Return the elements matching each of specs, in spec order then document order.
+
+    Equivalent to concatenating soup.find_all(tags, spec) for every spec. With
+    the selectolax backend the document is scanned by Lexbor and only the
+    matched containers are rebuilt as small BeautifulSoup fragments, so the
+    existing extraction functions keep working on them unchanged.
+    """
+    backend = resolve_backend(backend)
+
+    if backend != 'selectolax':
+        soup = make_soup(html, backend)
+        containers = []
+        for spec in specs:
+            containers.extend(soup.find_all(tags, spec))
+        return containers
+
+    tree = SelectolaxParser(html)
+    fragment_features = 'lxml' if HAS_LXML else 'html.parser'
+    containers = []
+    for spec in specs:
+        for node in tree.css(_css_for(tags, spec)):
+            fragment = BeautifulSoup(node.html, fragment_features)
+            element = fragment.find(node.tag)
+            if element is not None:
+                containers.append(element)
+    return containers
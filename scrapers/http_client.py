@@ -0,0 +1,122 @@
+import asyncio
+import logging
+import threading
+import weakref
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+# Connector settings used for every pooled session
+_settings = {
+    'limit': 100,               # total open connections per session
+    'limit_per_host': 8,        # open connections per (host, port, ssl)
+    'keepalive_timeout': 30,    # seconds an idle connection is kept for reuse
+    'ttl_dns_cache': 300,       # seconds a DNS answer is reused
+}
+
+# One session per event loop; entries disappear when the loop is garbage collected
+_sessions = weakref.WeakKeyDictionary()
+
+_stats_lock = threading.Lock()
+_stats = {
+    'requests': 0,
+    'connections_created': 0,
+    'connections_reused': 0,
+    'dns_cache_hits': 0,
+    'dns_cache_misses': 0,
+    'sessions_created': 0,
+}
+
+
+def configure(limit=None, limit_per_host=None, keepalive_timeout=None, ttl_dns_cache=None):
+    """Override connector settings for sessions created after this call"""
+    overrides = {
+        'limit': limit,
+        'limit_per_host': limit_per_host,
+        'keepalive_timeout': keepalive_timeout,
+        'ttl_dns_cache': ttl_dns_cache,
+    }
+    _settings.update({k: v for k, v in overrides.items() if v is not None})
+
+
+def _count(key):
+    with _stats_lock:
+        _stats[key] += 1
+
+
+def _trace_config():
+    """Build a TraceConfig that feeds the pool statistics"""
+    trace = aiohttp.TraceConfig()
+
+    async def on_request_start(session, ctx, params):
+        _count('requests')
+
+    async def on_connection_create_end(session, ctx, params):
+        _count('connections_created')
+
+    async def on_connection_reuseconn(session, ctx, params):
+        _count('connections_reused')
+
+    async def on_dns_cache_hit(session, ctx, params):
+        _count('dns_cache_hits')
+
+    async def on_dns_cache_miss(session, ctx, params):
+        _count('dns_cache_misses')
+
+    trace.on_request_start.append(on_request_start)
+    trace.on_connection_create_end.append(on_connection_create_end)
+    trace.on_connection_reuseconn.append(on_connection_reuseconn)
+    trace.on_dns_cache_hit.append(on_dns_cache_hit)
+    trace.on_dns_cache_miss.append(on_dns_cache_miss)
+    return trace
+
+
+def get_session():
+    """
+    Return the shared ClientSession for the running event loop.
+
+    The session is created on first use and keeps its TCP/TLS connections and
+    DNS answers alive between requests, so callers must not close it; use
+    close_session() when the loop is shutting down.
+    """
+    loop = asyncio.get_running_loop()
+    session = _sessions.get(loop)
+    if session is None or session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=_settings['limit'],
+            limit_per_host=_settings['limit_per_host'],
+            keepalive_timeout=_settings['keepalive_timeout'],
+            ttl_dns_cache=_settings['ttl_dns_cache'],
+            use_dns_cache=True,
+        )
+        session = aiohttp.ClientSession(
+            connector=connector,
+            trace_configs=[_trace_config()],
+        )
+        _sessions[loop] = session
+        _count('sessions_created')
+        logger.info(
+            f"Created pooled HTTP session (limit={_settings['limit']}, "
+            f"per_host={_settings['limit_per_host']}, keepalive={_settings['keepalive_timeout']}s)"
+        )
+    return session
+
+
+async def close_session():
+    """Close the shared session of the running event loop, if any"""
+    loop = asyncio.get_running_loop()
+    session = _sessions.pop(loop, None)
+    if session is not None and not session.closed:
+        await session.close()
+
+
+def get_pool_stats():
+    """Return request, connection reuse and DNS cache counters for all pooled sessions"""
+    with _stats_lock:
+        stats = dict(_stats)
+
+    acquired = stats['connections_created'] + stats['connections_reused']
+    stats['reuse_rate'] = round(stats['connections_reused'] / acquired * 100, 2) if acquired else 0.0
+    stats['open_sessions'] = sum(1 for session in list(_sessions.values()) if not session.closed)
+    stats['settings'] = dict(_settings)
+    return stats
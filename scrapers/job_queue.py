@@ -0,0 +1,220 @@
+import time
+import uuid
+import asyncio
+import logging
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+JOB_STATES = ('queued', 'running', 'completed', 'failed')
+
+
+class JobError(Exception):
+    """Raised by a job to fail with a user-facing message and extra response fields"""
+
+    def __init__(self, message, status_code=500, **details):
+        super().__init__(message)
+        self.status_code = status_code
+        self.details = details
+
+
+class Job:
+    def __init__(self, kind, func, params):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.func = func
+        self.params = params
+        # Identical submissions while this job is unfinished share it (see JobManager.submit)
+        self.flight_key = None
+        self.submissions = 1
+        self.status = 'queued'
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.result = None
+        self.error = None
+        self.error_status = None
+        self.error_details = {}
+        # Free-form counters the job function updates while it runs
+        self.progress = {}
+        # Append-only (id, type, data) log streamed to clients; ids start at 1
+        self.events = []
+        self._events_changed = threading.Condition()
+
+    @property
+    def finished(self):
+        return self.status in ('completed', 'failed')
+
+    def emit(self, event, data):
+        """Record a progress event; safe to call from the loop or executor threads"""
+        with self._events_changed:
+            self.events.append((len(self.events) + 1, event, data))
+            self._events_changed.notify_all()
+
+    def update(self, **progress):
+        """Merge progress fields and announce them as a 'status' event"""
+        self.progress.update(progress)
+        self.emit('status', {'status': self.status, **self.progress})
+
+    def events_after(self, last_id, timeout=None):
+        """Return the events newer than last_id, waiting up to timeout for one"""
+        with self._events_changed:
+            if len(self.events) <= last_id:
+                self._events_changed.wait(timeout)
+            return self.events[last_id:]
+
+    def to_dict(self):
+        return {
+            'job_id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'params': self.params,
+            'progress': dict(self.progress),
+            'submissions': self.submissions,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'error': self.error,
+        }
+
+
+class JobManager:
+    """
+    Runs scrape jobs on a fixed number of async workers.
+
+    All jobs share one event loop that lives in a background thread for the
+    life of the process, so pooled HTTP sessions, rate limiter state and the
+    parse pool stay warm between jobs. Job functions are coroutines called as
+    ``await func(job, **params)``; blocking work inside them should go through
+    ``loop.run_in_executor``. Finished jobs are kept for ``result_ttl`` seconds.
+    A job submitted with a ``flight_key`` runs once: later submissions with
+    the same key get the queued or running job, and with it its event stream
+    and result, until it finishes.
+    """
+
+    def __init__(self, workers=2, result_ttl=3600, max_jobs=200):
+        self.workers = max(1, workers)
+        self.result_ttl = result_ttl
+        self.max_jobs = max_jobs
+        self.jobs = OrderedDict()
+        # flight_key -> unfinished job
+        self.in_flight = {}
+        self.coalesced = 0
+        self._lock = threading.Lock()
+        self._loop = None
+        self._queue = None
+        self._thread = None
+        self._started = threading.Event()
+
+    @property
+    def loop(self):
+        self.start()
+        return self._loop
+
+    def start(self):
+        """Start the loop thread and its workers (idempotent)"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run_loop, name='job-loop', daemon=True)
+            self._thread.start()
+        self._started.wait()
+
+    def _run_loop(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._queue = asyncio.Queue()
+        for i in range(self.workers):
+            self._loop.create_task(self._worker(i))
+        logger.info(f"Job manager started with {self.workers} workers")
+        self._started.set()
+        self._loop.run_forever()
+
+    async def _worker(self, number):
+        while True:
+            job = await self._queue.get()
+            job.status = 'running'
+            job.started_at = time.time()
+            job.update()
+            logger.info(f"Worker {number} running {job.kind} job {job.id}")
+            try:
+                job.result = await job.func(job, **job.params)
+                job.status = 'completed'
+            except JobError as e:
+                job.error = str(e)
+                job.error_status = e.status_code
+                job.error_details = e.details
+                job.status = 'failed'
+            except Exception as e:
+                logger.exception(f"{job.kind} job {job.id} failed")
+                job.error = str(e)
+                job.error_status = 500
+                job.status = 'failed'
+            finally:
+                job.finished_at = time.time()
+                logger.info(
+                    f"{job.kind} job {job.id} {job.status} in {job.finished_at - job.started_at:.1f}s"
+                )
+                with self._lock:
+                    if self.in_flight.get(job.flight_key) is job:
+                        del self.in_flight[job.flight_key]
+                job.emit('done', {'status': job.status, 'error': job.error})
+                self._queue.task_done()
+
+    def submit(self, kind, func, flight_key=None, **params):
+        """Queue func(job, **params) and return the Job immediately
+
+        If an unfinished job was submitted with the same flight_key, that job
+        is returned instead and nothing new is queued.
+        """
+        self.start()
+        job = Job(kind, func, params)
+        with self._lock:
+            running = self.in_flight.get(flight_key) if flight_key is not None else None
+            if running is not None:
+                running.submissions += 1
+                self.coalesced += 1
+                return running
+            self._prune()
+            self.jobs[job.id] = job
+            if flight_key is not None:
+                job.flight_key = flight_key
+                self.in_flight[flight_key] = job
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, job)
+        return job
+
+    def add_completed(self, kind, result, **params):
+        """Register a job that is already done with result (e.g. served from a cache)"""
+        job = Job(kind, None, params)
+        job.status = 'completed'
+        job.result = result
+        job.started_at = job.finished_at = time.time()
+        job.emit('done', {'status': job.status, 'error': None})
+        with self._lock:
+            self._prune()
+            self.jobs[job.id] = job
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self.jobs.get(job_id)
+
+    def _prune(self):
+        """Drop expired finished jobs, then the oldest finished ones over max_jobs"""
+        now = time.time()
+        for job_id, job in list(self.jobs.items()):
+            if job.finished and now - job.finished_at > self.result_ttl:
+                del self.jobs[job_id]
+        finished = [job_id for job_id, job in self.jobs.items() if job.finished]
+        while len(self.jobs) >= self.max_jobs and finished:
+            del self.jobs[finished.pop(0)]
+
+    def stats(self):
+        with self._lock:
+            counts = {state: 0 for state in JOB_STATES}
+            for job in self.jobs.values():
+                counts[job.status] += 1
+            counts['coalesced'] = self.coalesced
+        counts['workers'] = self.workers
+        return counts
@@ -0,0 +1,412 @@
+import re
+import time
+from bs4 import Tag
+from .html_parser import find_containers
+
+# Containers JustDial has used for a single listing over its redesigns
+JUSTDIAL_LISTING_CONTAINERS = [
+    {'class': 'store-details'},
+    {'class': 'jsx-3349e7cd87e12d75'},
+    {'class': 'resultbox_info'},
+    {'class': 'business-listing'},
+    {'class': 'lst_dt'},
+    {'class': 'cntanr'},
+    {'data-href': True},
+    {'itemtype': 'http://schema.org/LocalBusiness'}
+]
+
+def decode_phone_number(element):
+    """
+    Decode phone numbers from various formats including JustDial's protection mechanisms
+    """
+    if not element:
+        return ''
+        
+    # Dictionary for JustDial's number mapping (commonly used patterns)
+    jd_map = {
+        # Original mapping
+        'icon-dc': '+',
+        'icon-fe': '(',
+        'icon-hg': ')',
+        'icon-ba': '-',
+        'icon-yz': '1',
+        'icon-wx': '2',
+        'icon-vu': '3',
+        'icon-ts': '4',
+        'icon-rq': '5',
+        'icon-po': '6',
+        'icon-nm': '7',
+        'icon-lk': '8',
+        'icon-ji': '9',
+        'icon-acb': '0',
+        # Additional mappings (JustDial uses multiple patterns)
+        'dc': '+',
+        'fe': '(',
+        'hg': ')',
+        'ba': '-',
+        'yz': '1',
+        'wx': '2',
+        'vu': '3',
+        'ts': '4',
+        'rq': '5',
+        'po': '6',
+        'nm': '7',
+        'lk': '8',
+        'ji': '9',
+        'acb': '0',
+        # Newer format
+        'icon-plus': '+',
+        'icon-left': '(',
+        'icon-right': ')',
+        'icon-hyphen': '-',
+        'icon-one': '1',
+        'icon-two': '2',
+        'icon-three': '3',
+        'icon-four': '4',
+        'icon-five': '5',
+        'icon-six': '6',
+        'icon-seven': '7',
+        'icon-eight': '8',
+        'icon-nine': '9',
+        'icon-zero': '0',
+    }
+    
+    try:
+        # First try to get direct text
+        phone = element.text.strip()
+        
+        # If no direct text, try to decode JustDial format
+        if not phone or phone.isspace():
+            # Look for spans with special classes
+            spans = element.find_all(['span', 'a', 'b'], {'class': True})
+            if spans:
+                phone = ''
+                for span in spans:
+                    # Get all classes
+                    classes = span.get('class', [])
+                    # Try to match against all patterns
+                    for cls in classes:
+                        # Remove common prefixes if present
+                        cls = cls.replace('icon-', '').replace('jd-', '').replace('tel-', '')
+                        # Look up in mapping
+                        digit = jd_map.get(cls) or jd_map.get(f"icon-{cls}")
+                        if digit:
+                            phone += digit
+                            
+            # If no spans found, try to find data attributes
+            if not phone:
+                # Check various data attributes JustDial uses
+                for attr in ['data-href', 'data-phone', 'data-tel', 'data-value']:
+                    value = element.get(attr, '')
+                    if value and any(c.isdigit() for c in value):
+                        phone = value
+                        break
+                        
+        # If still no phone, try to get from 'data-href' attribute (common in mobile versions)
+        if not phone or phone.isspace():
+            phone = element.get('data-href', '')
+            
+        # If still no phone, try to get from 'href' attribute (some sites use tel: links)
+        if not phone or phone.isspace():
+            href = element.get('href', '')
+            if href.startswith('tel:'):
+                phone = href.replace('tel:', '')
+                
+        # Clean up the phone number
+        if phone:
+            # Remove all non-digit characters except +()-
+            phone = ''.join(c for c in phone if c.isdigit() or c in '+-() ')
+            # Remove any extra spaces
+            phone = ' '.join(phone.split())
+            # If it's too short or too long, it's probably not a valid phone number
+            if len(''.join(c for c in phone if c.isdigit())) < 5:
+                return ''
+            # Format the number if it looks like an Indian phone number
+            digits = ''.join(c for c in phone if c.isdigit())
+            if len(digits) == 10:
+                return f"+91 {digits[:3]}-{digits[3:6]}-{digits[6:]}"
+            elif len(digits) > 10:
+                return f"+{digits[:2]} {digits[2:5]}-{digits[5:8]}-{digits[8:]}"
+                
+        return phone
+    except Exception as e:
+        print(f"Error decoding phone number: {str(e)}")
+        return ''
+
+# Listing field rules, applied to the lower-cased class string of each element.
+# The order of the name tags and patterns is the priority of the old lookups.
+NAME_TAGS = ('h2', 'h3', 'a', 'span', 'div')
+NAME_CLASS_PATTERNS = ('name', 'title', 'heading', 'bname')
+PHONE_TAGS = frozenset(['p', 'span', 'div', 'a', 'b'])
+PHONE_CLASS_RE = re.compile(r'phone|mobile|contact|tel|mob|call')
+ADDRESS_TAGS = frozenset(['div', 'p', 'span'])
+ADDRESS_CLASS_RE = re.compile(r'address|location|area|full-address|map-address')
+JUSTDIAL_ADDRESS_TAGS = frozenset(['div', 'p'])
+JUSTDIAL_ADDRESS_CLASS_RE = re.compile(r'cont_fl_addr|address-info|lng_add')
+ADDRESS_PARTS = ('streetAddress', 'addressLocality', 'addressRegion', 'postalCode')
+SPAN_DIV = frozenset(['span', 'div'])
+DATA_ADDRESS_TAGS = frozenset(['div', 'span', 'a'])
+
+
+def _class_string(element):
+    value = element.attrs.get('class')
+    if not value:
+        return ''
+    if isinstance(value, str):
+        return value.lower()
+    return ' '.join(value).lower()
+
+
+def _scan_listing(listing):
+    """
+    Walk the listing once and collect the candidate element of every field.
+
+    Matches the same elements, in the same document order, as the separate
+    find/find_all calls this replaces.
+    """
+    scan = {
+        'names': {},              # (tag, pattern) -> first matching element
+        'phones': [],
+        'address': [],            # generic address containers
+        'justdial_address': [],   # JustDial specific address containers
+        'schema_address': [],     # itemprop="address"
+        'data_address': [],
+        'links': [],
+        'rating': None,
+        'reviews': None,
+        'has_address_parts': False,
+    }
+    names = scan['names']
+
+    for element in listing.descendants:
+        if not isinstance(element, Tag):
+            continue
+        tag = element.name
+        attrs = element.attrs
+        cls = _class_string(element) if 'class' in attrs else ''
+
+        if cls:
+            if tag in NAME_TAGS:
+                for pattern in NAME_CLASS_PATTERNS:
+                    if pattern in cls and (tag, pattern) not in names:
+                        names[(tag, pattern)] = element
+            if tag in PHONE_TAGS and PHONE_CLASS_RE.search(cls):
+                scan['phones'].append(element)
+            if tag in ADDRESS_TAGS and ADDRESS_CLASS_RE.search(cls):
+                scan['address'].append(element)
+            if tag in JUSTDIAL_ADDRESS_TAGS and JUSTDIAL_ADDRESS_CLASS_RE.search(cls):
+                scan['justdial_address'].append(element)
+            if tag in SPAN_DIV:
+                if scan['rating'] is None and 'rating' in cls:
+                    scan['rating'] = element
+                if scan['reviews'] is None and 'review' in cls:
+                    scan['reviews'] = element
+
+        if tag in SPAN_DIV and 'itemprop' in attrs:
+            if attrs['itemprop'] == 'address':
+                scan['schema_address'].append(element)
+            elif attrs['itemprop'] in ADDRESS_PARTS:
+                scan['has_address_parts'] = True
+        if tag in DATA_ADDRESS_TAGS and 'data-address' in attrs:
+            scan['data_address'].append(element)
+        if tag == 'a' and 'href' in attrs:
+            scan['links'].append(element)
+
+    return scan
+
+
+def _combine_address(scan):
+    """Build the address string from the containers collected by _scan_listing"""
+    address_parts = []
+    
+    try:
+        address_containers = scan['address'] + scan['justdial_address'] + scan['schema_address']
+        
+        # Process each container
+        for container in address_containers:
+            # Try to find structured address parts
+            parts = {}
+            
+            # Look for specific address components (only if the listing has any)
+            if scan['has_address_parts']:
+                for part in ADDRESS_PARTS:
+                    elem = container.find(['span', 'div'], {'itemprop': part})
+                    if elem:
+                        parts[part] = elem.text.strip()
+            
+            # If we found structured parts, combine them
+            if parts:
+                structured_addr = ' '.join(filter(None, [
+                    parts.get('streetAddress', ''),
+                    parts.get('addressLocality', ''),
+                    parts.get('addressRegion', ''),
+                    parts.get('postalCode', '')
+                ]))
+                if structured_addr:
+                    address_parts.append(structured_addr)
+            else:
+                # If no structured parts, get the full text
+                text = container.text.strip()
+                if text:
+                    address_parts.append(text)
+        
+        # Look for address in data attributes
+        for elem in scan['data_address']:
+            addr = elem.get('data-address', '').strip()
+            if addr:
+                address_parts.append(addr)
+        
+        # Clean up and combine addresses
+        cleaned_addresses = []
+        for addr in address_parts:
+            # Basic cleanup
+            addr = addr.strip()
+            addr = ' '.join(addr.split())  # Remove extra whitespace
+            addr = addr.replace('\n', ', ').replace('\r', ', ')
+            
+            # Remove common prefixes
+            prefixes = ['address:', 'location:', 'full address:', 'map address:']
+            for prefix in prefixes:
+                if addr.lower().startswith(prefix):
+                    addr = addr[len(prefix):].strip()
+            
+            # Remove very short or invalid addresses
+            if len(addr) > 10 and not addr.isdigit():
+                cleaned_addresses.append(addr)
+        
+        # Remove duplicates while preserving order
+        seen = set()
+        final_addresses = []
+        for addr in cleaned_addresses:
+            if addr.lower() not in seen:
+                seen.add(addr.lower())
+                final_addresses.append(addr)
+        
+        # Combine all unique addresses
+        if final_addresses:
+            return ' | '.join(final_addresses)
+        
+        return ''
+        
+    except Exception as e:
+        print(f"Error extracting address: {str(e)}")
+        return ''
+
+def extract_complete_address(listing):
+    """Extract complete address from listing with multiple fallback methods"""
+    try:
+        scan = _scan_listing(listing)
+    except Exception as e:
+        print(f"Error extracting address: {str(e)}")
+        return ''
+    return _combine_address(scan)
+
+def extract_business_data(listing, platform):
+    """Helper function to extract business data from a listing."""
+    business_data = {
+        'Company Name': '',
+        'Phone': '',
+        'Email': '',
+        'Website': '',
+        'About': '',
+        'Social Links': '',
+        'Address': '',
+        'Rating': '',
+        'Reviews Count': '',
+        'Categories': '',
+        'Working Hours': '',
+        'Features': ''
+    }
+    
+    try:
+        scan = _scan_listing(listing)
+
+        # Company Name with multiple fallbacks; the first pattern found for a
+        # tag decides, and an empty name moves on to the next tag
+        for tag in NAME_TAGS:
+            for class_pattern in NAME_CLASS_PATTERNS:
+                name_elem = scan['names'].get((tag, class_pattern))
+                if name_elem:
+                    business_data['Company Name'] = name_elem.text.strip()
+                    break
+            if business_data['Company Name']:
+                break
+        
+        # Phone number extraction
+        phone_numbers = set()
+        for container in scan['phones']:
+            phone = decode_phone_number(container)
+            if phone:
+                phone_numbers.add(phone)
+        
+        if phone_numbers:
+            business_data['Phone'] = ' / '.join(sorted(phone_numbers))
+        
+        # Enhanced address extraction
+        business_data['Address'] = _combine_address(scan)
+        
+        # Website and email extraction
+        for link in scan['links']:
+            href = link.get('href', '').lower()
+            if 'mailto:' in href:
+                business_data['Email'] = href.replace('mailto:', '').strip()
+            elif any(domain in href for domain in ['.com', '.in', '.org', '.net', '.co.in']):
+                if not any(excluded in href for excluded in ['justdial', 'sulekha', 'facebook', 'twitter', 'linkedin', 'instagram']):
+                    business_data['Website'] = href
+        
+        # Rating extraction
+        rating_elem = scan['rating']
+        if rating_elem:
+            rating = rating_elem.text.strip()
+            rating_match = re.search(r'(\d+(\.\d+)?)', rating)
+            if rating_match:
+                business_data['Rating'] = rating_match.group(1)
+        
+        # Reviews count extraction
+        reviews_elem = scan['reviews']
+        if reviews_elem:
+            reviews = reviews_elem.text.strip()
+            count_match = re.search(r'(\d+)', reviews)
+            if count_match:
+                business_data['Reviews Count'] = count_match.group(1)
+        
+        # Clean up empty fields
+        business_data = {k: v for k, v in business_data.items() if v}
+        
+        return business_data
+        
+    except Exception as e:
+        print(f"Error extracting business data: {str(e)}")
+        return None
+
+def parse_justdial_page(content, backend=None):
+    """
+    Parse one JustDial results page into business records.
+
+    Runs in a ParsePool worker, so it only takes and returns plain picklable
+    data: the number of listing containers found, the extracted businesses and
+    the error messages of listings that failed to parse. backend selects the
+    HTML parser (see scrapers.html_parser).
+    """
+    start = time.perf_counter()
+    businesses = []
+    errors = []
+
+    # Look for different types of listing containers
+    listings = find_containers(content, ['div', 'li', 'section'], JUSTDIAL_LISTING_CONTAINERS, backend)
+
+    # Process each listing
+    for listing in listings:
+        try:
+            business_data = extract_business_data(listing, 'justdial')
+            if business_data and business_data.get('Company Name'):
+                businesses.append(business_data)
+        except Exception as e:
+            errors.append(str(e))
+
+    return {
+        'listings': len(listings),
+        'businesses': businesses,
+        'errors': errors,
+        'parse_seconds': time.perf_counter() - start
+    }
@@ -0,0 +1,83 @@
+import logging
+
+from scrapy_user_agents.middlewares import RandomUserAgentMiddleware
+
+logger = logging.getLogger(__name__)
+
+
+class SharedRandomUserAgentMiddleware(RandomUserAgentMiddleware):
+    """
+    RandomUserAgentMiddleware that parses its user-agent list once per process.
+
+    The parent builds a UserAgentPicker from thousands of user-agent strings
+    for every crawler, which takes seconds. In the long-lived crawler process
+    (scrapers/crawl_runner.py) that cost would be paid by every crawl, so
+    pickers are kept per RANDOM_UA_* configuration and reused.
+    """
+
+    _pickers = {}
+
+    def __init__(self, crawler):
+        key = tuple(str(crawler.settings.get(name)) for name in (
+            'RANDOM_UA_FILE', 'RANDOM_UA_TYPE', 'RANDOM_UA_SAME_OS_FAMILY',
+            'RANDOM_UA_PER_PROXY', 'RANDOM_UA_FALLBACK'
+        ))
+        picker = self._pickers.get(key)
+        if picker is None:
+            super().__init__(crawler)
+            self._pickers[key] = self.ua_picker
+        else:
+            self.ua_picker = picker
+
+
+class SlotBackoffMiddleware:
+    """
+    Slows down a download slot when its site pushes back, without blocking the reactor.
+
+    A response with a status in ``SLOT_BACKOFF_HTTP_CODES`` doubles the delay
+    of the slot it came from (or raises it to the Retry-After value), capped
+    at ``SLOT_BACKOFF_MAX_DELAY``. The response is passed on unchanged, so
+    RetryMiddleware reschedules the request and the scheduler holds the retry
+    (and everything else for that slot) until the longer delay has passed.
+    Other slots are not affected. Each successful response halves the delay
+    again until the slot is back at the delay it had before backing off.
+    """
+
+    def __init__(self, crawler):
+        self.crawler = crawler
+        self.codes = set(crawler.settings.getlist('SLOT_BACKOFF_HTTP_CODES', [403, 429, 503]))
+        self.max_delay = crawler.settings.getfloat('SLOT_BACKOFF_MAX_DELAY', 60)
+        # slot key -> delay before the first backoff
+        self._base_delays = {}
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(crawler)
+
+    def process_response(self, request, response, spider):
+        key = request.meta.get('download_slot')
+        slot = self.crawler.engine.downloader.slots.get(key) if key else None
+        if slot is None:
+            return response
+
+        if response.status in self.codes:
+            base = self._base_delays.setdefault(key, slot.delay)
+            delay = max(slot.delay * 2, base, self.retry_after(response))
+            slot.delay = min(delay, self.max_delay)
+            self.crawler.stats.inc_value('slot_backoff/count')
+            logger.warning(f"{response.status} from {key}; delay for this site is now {slot.delay:.1f}s")
+        elif key in self._base_delays and 200 <= response.status < 300:
+            base = self._base_delays[key]
+            slot.delay = max(base, slot.delay / 2)
+            if slot.delay == base:
+                del self._base_delays[key]
+        return response
+
+    @staticmethod
+    def retry_after(response):
+        """Seconds from a numeric Retry-After header, else 0"""
+        value = response.headers.get('Retry-After')
+        try:
+            return float(value.decode('latin-1')) if value else 0
+        except ValueError:
+            return 0
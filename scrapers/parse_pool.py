@@ -0,0 +1,87 @@
+import os
+import time
+import atexit
+import asyncio
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+class ParsePool:
+    """
+    Runs HTML parsing off the event loop.
+
+    BeautifulSoup with 'html.parser' is pure Python and holds the GIL, so the
+    default mode is a process pool; mode='thread' suits parsers that release
+    the GIL. Parse functions must be module-level functions taking and
+    returning picklable data. The executor is created on first use so merely
+    importing the app does not fork workers.
+    """
+
+    def __init__(self, workers=None, mode='process', queue_size=4):
+        if mode not in ('process', 'thread'):
+            raise ValueError(f"Unknown parse pool mode: {mode}")
+        self.workers = workers or max(1, min(4, (os.cpu_count() or 2) - 1))
+        self.mode = mode
+        # Maximum fetched pages waiting between the fetch and parse stages
+        self.queue_size = queue_size
+        self._executor = None
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'pages_parsed': 0,
+            'parse_seconds': 0.0,  # time spent inside parse functions
+            'wait_seconds': 0.0,   # time callers waited for a result
+        }
+        atexit.register(self.shutdown)
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                if self.mode == 'process':
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.workers, thread_name_prefix='parse'
+                    )
+                logger.info(f"Started {self.mode} parse pool with {self.workers} workers")
+            return self._executor
+
+    async def parse(self, func, *args):
+        """Run func(*args) in the pool and return its result without blocking the loop"""
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        result = await loop.run_in_executor(self._get_executor(), func, *args)
+        waited = time.perf_counter() - start
+
+        with self._stats_lock:
+            self._stats['pages_parsed'] += 1
+            self._stats['wait_seconds'] += waited
+            if isinstance(result, dict) and 'parse_seconds' in result:
+                self._stats['parse_seconds'] += result['parse_seconds']
+        return result
+
+    def stats(self):
+        """Return parse counters; parse_seconds is CPU time moved off the event loop"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats['mode'] = self.mode
+        stats['workers'] = self.workers
+        if stats['pages_parsed']:
+            stats['avg_parse_ms'] = round(stats['parse_seconds'] / stats['pages_parsed'] * 1000, 2)
+        return stats
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+async def run_parse(pool, func, *args):
+    """Parse through pool if given, otherwise on the loop's default thread executor"""
+    if pool is not None:
+        return await pool.parse(func, *args)
+    return await asyncio.get_running_loop().run_in_executor(None, func, *args)
@@ -0,0 +1,98 @@
+import os
+import json
+import logging
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+
+def spider_item_to_record(item):
+    """Map a YellowPagesSpider item onto the field names of the Selenium scraper's records"""
+    address = ', '.join(filter(None, [
+        item.get('street_address', ''),
+        item.get('city', ''),
+        ' '.join(filter(None, [item.get('state', ''), item.get('zip_code', '')]))
+    ]))
+    social = item.get('social_media') or {}
+    record = {
+        'Name': item.get('name', ''),
+        'Phone': item.get('phone', ''),
+        'Address': address,
+        'Website': item.get('website', ''),
+        'Categories': item.get('categories', ''),
+        'Rating': item.get('rating', ''),
+        'Reviews Count': item.get('review_count', ''),
+        'Years in Business': item.get('years_in_business', ''),
+        'Website Description': item.get('website_description', ''),
+        'Additional Emails': ', '.join(item.get('additional_emails') or []),
+        'Additional Phones': ', '.join(item.get('additional_phones') or []),
+        'Social Media': ', '.join(social.values()) if isinstance(social, dict) else social,
+        'Source': item.get('source', 'yellowpages')
+    }
+    if item.get('website_status'):
+        record['Website Status'] = item['website_status'].title()
+        record['Website Error'] = item.get('website_error', '')
+    return record
+
+
+def read_jsonl_feed(path):
+    """Yield the records of a JSON Lines feed; a line cut short by a crash is skipped"""
+    if not os.path.exists(path):
+        return
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                logger.warning(f"Skipping incomplete line in {path}")
+
+
+class ExportFieldsPipeline:
+    """Rename spider fields to the app's export schema as each item is scraped"""
+
+    def process_item(self, item, spider):
+        return spider_item_to_record(item)
+
+
+class JsonLinesFeedPipeline:
+    """
+    Appends every item to a JSON Lines file while the crawl runs.
+
+    The file is the spider's ``feed_path`` argument, or a file per crawl in
+    the ``JSONL_FEED_DIR`` setting; without either the pipeline does nothing.
+    Each line is flushed as it is written, so a crawl that dies part-way
+    leaves every item scraped until then on disk.
+    """
+
+    def __init__(self, feed_dir=None):
+        self.feed_dir = feed_dir
+        self.path = None
+        self.file = None
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(crawler.settings.get('JSONL_FEED_DIR'))
+
+    def open_spider(self, spider):
+        path = getattr(spider, 'feed_path', None)
+        if not path and self.feed_dir:
+            path = os.path.join(self.feed_dir, f"{spider.name}_{datetime.now():%Y%m%d_%H%M%S_%f}.jsonl")
+        self.path = path
+
+    def process_item(self, item, spider):
+        if self.path and self.file is None:
+            # Opened on the first item, so crawls without results leave no empty file
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.file = open(self.path, 'a', encoding='utf-8')
+            logger.info(f"Writing items to {self.path}")
+        if self.file is not None:
+            self.file.write(json.dumps(dict(item), ensure_ascii=False, default=str) + '\n')
+            self.file.flush()
+        return item
+
+    def close_spider(self, spider):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
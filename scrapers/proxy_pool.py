@@ -0,0 +1,226 @@
+import time
+import random
+import asyncio
+import logging
+import threading
+
+import aiohttp
+
+from .http_client import get_session
+
+logger = logging.getLogger(__name__)
+
+CHECK_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8'
+}
+
+
+class ProxyHealth:
+    """Exponentially weighted latency and success rate of one proxy"""
+
+    def __init__(self, static=False):
+        self.static = static
+        self.success = None  # EWMA of 1 (worked) / 0 (failed); None until first measured
+        self.latency = None  # EWMA of seconds per successful request
+        if static:
+            # Configured by hand, so usable before the first check
+            self.success, self.latency = 1.0, 1.0
+        self.failures = 0  # consecutive failures
+        self.checked = None  # monotonic time of the last measurement
+
+    def record(self, ok, latency, alpha):
+        sample = 1.0 if ok else 0.0
+        self.success = sample if self.success is None else alpha * sample + (1 - alpha) * self.success
+        if ok and latency is not None:
+            self.latency = latency if self.latency is None else alpha * latency + (1 - alpha) * self.latency
+        self.failures = 0 if ok else self.failures + 1
+        self.checked = time.monotonic()
+
+    @property
+    def score(self):
+        """Selection weight: reliable, fast proxies first; 0 until it has worked once"""
+        if not self.success or self.latency is None:
+            return 0.0
+        return self.success ** 2 / max(self.latency, 0.05)
+
+
+class ProxyPool:
+    """
+    Pool of HTTP proxies scored by how well they have been working.
+
+    ``sources`` are async callables returning proxy URLs; a refresh fetches
+    all of them at once, then checks every known proxy against ``check_url``
+    with at most ``check_concurrency`` checks in flight and ``check_timeout``
+    seconds each. Check results and the outcome of real requests (``record``)
+    update an EWMA of each proxy's latency and success rate, and ``choose``
+    picks proxies at random weighted by success² / latency, so fast reliable
+    proxies carry most of the traffic while slower ones are still used.
+    Proxies that fail ``max_failures`` times in a row are dropped, except the
+    static ones configured by hand, and sources cannot add them back for
+    ``drop_seconds``. ``start`` keeps the pool warm by
+    refreshing it every ``refresh_interval`` seconds on a long-lived loop,
+    sooner while fewer than ``min_healthy`` proxies work.
+    """
+
+    def __init__(self, static_proxies=(), sources=(), check_url='https://www.google.com/generate_204',
+                 check_timeout=8, check_concurrency=50, alpha=0.3, min_success=0.2, max_failures=3,
+                 refresh_interval=600, min_healthy=5, drop_seconds=3600):
+        self.sources = list(sources)
+        self.check_url = check_url
+        self.check_timeout = check_timeout
+        self.check_concurrency = check_concurrency
+        self.alpha = alpha
+        self.min_success = min_success
+        self.max_failures = max_failures
+        self.refresh_interval = refresh_interval
+        self.min_healthy = min_healthy
+        self.drop_seconds = drop_seconds
+        self.proxies = {proxy: ProxyHealth(static=True) for proxy in static_proxies}
+        # proxy -> monotonic time it was dropped
+        self.dropped = {}
+        self.last_refresh = None
+        self._refresher = None
+        # Jobs share the pool on the single JobManager loop; the scores are
+        # still guarded by a thread lock (never held across awaits) so code in
+        # executor threads may choose proxies and report outcomes as well
+        self._lock = threading.Lock()
+
+    def add(self, proxies, static=False):
+        """Add proxies to the pool; returns how many were new"""
+        added = 0
+        now = time.monotonic()
+        with self._lock:
+            for proxy in proxies:
+                if now - self.dropped.get(proxy, -self.drop_seconds) < self.drop_seconds:
+                    continue
+                self.dropped.pop(proxy, None)
+                if proxy not in self.proxies:
+                    self.proxies[proxy] = ProxyHealth(static=static)
+                    added += 1
+        return added
+
+    def record(self, proxy, ok, latency=None):
+        """Update a proxy's scores with the outcome of a request or check through it"""
+        with self._lock:
+            health = self.proxies.get(proxy)
+            if health is None:
+                return
+            health.record(ok, latency, self.alpha)
+            if health.failures >= self.max_failures and not health.static:
+                del self.proxies[proxy]
+                self.dropped[proxy] = time.monotonic()
+                logger.debug(f"Dropped proxy {proxy} after {health.failures} failures in a row")
+
+    def healthy(self):
+        with self._lock:
+            return [proxy for proxy, health in self.proxies.items()
+                    if health.score and health.success >= self.min_success]
+
+    def choose(self, exclude=()):
+        """A working proxy picked by weighted score, or None if none is known to work"""
+        with self._lock:
+            candidates = [(proxy, health.score) for proxy, health in self.proxies.items()
+                          if proxy not in exclude and health.score and health.success >= self.min_success]
+        if not candidates:
+            return None
+        proxies, weights = zip(*candidates)
+        return random.choices(proxies, weights=weights)[0]
+
+    async def fetch_sources(self, sources=None):
+        """Fetch sources (default: the pool's) concurrently and add what they list; returns the number of new proxies"""
+        sources = self.sources if sources is None else sources
+        results = await asyncio.gather(*(source() for source in sources), return_exceptions=True)
+        added = 0
+        for source, result in zip(sources, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Proxy source {getattr(source, '__name__', source)} failed: {result}")
+                continue
+            added += self.add(result or ())
+        return added
+
+    async def check(self, proxy):
+        """Time one request to check_url through proxy and record the result"""
+        session = get_session()
+        start = time.monotonic()
+        try:
+            async with session.get(
+                self.check_url,
+                proxy=proxy,
+                headers=CHECK_HEADERS,
+                timeout=aiohttp.ClientTimeout(total=self.check_timeout),
+                ssl=False
+            ) as response:
+                await response.read()
+                ok = response.status < 400
+        except Exception:
+            ok = False
+        self.record(proxy, ok, time.monotonic() - start)
+        return ok
+
+    async def check_all(self, proxies=None):
+        """Check proxies (default: all known) with a bounded fan-out; returns how many work"""
+        if proxies is None:
+            with self._lock:
+                proxies = list(self.proxies)
+        limit = asyncio.Semaphore(self.check_concurrency)
+
+        async def bounded_check(proxy):
+            async with limit:
+                return await self.check(proxy)
+
+        results = await asyncio.gather(*(bounded_check(proxy) for proxy in proxies))
+        return sum(results)
+
+    async def refresh(self):
+        """Fetch the sources, then re-check every proxy"""
+        start = time.monotonic()
+        added = await self.fetch_sources() if self.sources else 0
+        working = await self.check_all()
+        self.last_refresh = time.time()
+        logger.info(f"Proxy pool refreshed in {time.monotonic() - start:.1f}s: "
+                    f"{added} new, {working} of {len(self.proxies)} working")
+        return working
+
+    async def _refresh_forever(self):
+        while True:
+            try:
+                working = await self.refresh()
+            except Exception as e:
+                logger.error(f"Proxy pool refresh failed: {e}")
+                working = 0
+            # Short of working proxies: look again soon
+            await asyncio.sleep(self.refresh_interval if working >= self.min_healthy
+                                else min(60, self.refresh_interval))
+
+    def start(self, loop):
+        """Keep the pool refreshed from a task on loop (idempotent)"""
+        with self._lock:
+            if self._refresher is None or self._refresher.done():
+                self._refresher = asyncio.run_coroutine_threadsafe(self._refresh_forever(), loop)
+
+    def stop(self):
+        with self._lock:
+            if self._refresher is not None:
+                self._refresher.cancel()
+                self._refresher = None
+
+    def stats(self):
+        with self._lock:
+            ranked = sorted(self.proxies.items(), key=lambda entry: entry[1].score, reverse=True)
+            return {
+                'proxies': len(self.proxies),
+                'healthy': sum(1 for _, health in ranked
+                               if health.score and health.success >= self.min_success),
+                'last_refresh': self.last_refresh,
+                'refreshing': self._refresher is not None and not self._refresher.done(),
+                'top': [
+                    {
+                        'proxy': proxy,
+                        'success': round(health.success, 3),
+                        'latency': round(health.latency, 3),
+                        'score': round(health.score, 2)
+                    }
+                    for proxy, health in ranked[:5] if health.score
+                ]
+            }
@@ -0,0 +1,108 @@
+import time
+import asyncio
+import logging
+import threading
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# Responses that mean "slow down" for the host that sent them
+THROTTLE_STATUSES = {403, 429}
+
+
+class TokenBucket:
+    """Token bucket for a single host whose refill rate can be adjusted at runtime"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, now):
+        """Take one token and return how long the caller must wait before using it"""
+        self.refill(now)
+        self.tokens -= 1
+        if self.tokens >= 0:
+            return 0.0
+        # A negative balance is a reservation that the refill pays back
+        return -self.tokens / self.rate
+
+
+class HostRateLimiter:
+    """
+    Per-host token-bucket rate limiter with AIMD rate adaptation.
+
+    Every host starts at ``rate`` requests per second with room for ``burst``
+    back-to-back requests. A 429/403 response multiplies the host's rate by
+    ``backoff`` (and drains its burst allowance); each successful response
+    adds ``increase`` requests per second back, up to ``max_rate``.
+    """
+
+    def __init__(self, rate=0.5, burst=2, min_rate=0.05, max_rate=2.0,
+                 increase=0.05, backoff=0.5):
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.backoff = backoff
+        self.buckets = {}
+        # Jobs share one instance on the single JobManager loop; the bucket
+        # arithmetic is still guarded by a thread lock (never held across
+        # awaits) so blocking job code in executor threads may use it as well
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def host_for(url):
+        return urlparse(url).netloc.lower() or url
+
+    def _bucket(self, host):
+        bucket = self.buckets.get(host)
+        if bucket is None:
+            bucket = self.buckets[host] = TokenBucket(self.rate, self.burst)
+        return bucket
+
+    async def acquire(self, url):
+        """Wait until the host of url may receive another request"""
+        host = self.host_for(url)
+        with self._lock:
+            delay = self._bucket(host).reserve(time.monotonic())
+        if delay > 0:
+            logger.debug(f"Rate limiting {host}: waiting {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+    def record_response(self, url, status):
+        """Adapt the host's rate to the status code it answered with"""
+        host = self.host_for(url)
+        with self._lock:
+            bucket = self._bucket(host)
+            # Settle the balance at the old rate before changing it
+            bucket.refill(time.monotonic())
+            if status in THROTTLE_STATUSES:
+                old_rate = bucket.rate
+                bucket.rate = max(self.min_rate, bucket.rate * self.backoff)
+                bucket.tokens = min(bucket.tokens, 0.0)
+                logger.warning(
+                    f"{host} answered {status}; rate {old_rate:.3f} -> {bucket.rate:.3f} req/s"
+                )
+            elif 200 <= status < 400:
+                bucket.rate = min(self.max_rate, bucket.rate + self.increase)
+
+    def stats(self):
+        """Return the current rate and token balance of every known host"""
+        with self._lock:
+            now = time.monotonic()
+            result = {}
+            for host, bucket in self.buckets.items():
+                bucket.refill(now)
+                result[host] = {
+                    'rate_per_second': round(bucket.rate, 3),
+                    'tokens': round(bucket.tokens, 2),
+                    'burst': bucket.burst,
+                }
+            return result
@@ -0,0 +1,124 @@
+import os
+import time
+import zlib
+import sqlite3
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """
+    Disk-backed HTTP response cache shared by every worker process.
+
+    Bodies are stored zlib-compressed in a SQLite database (WAL mode), so the
+    cache survives restarts and can be read and written by several Flask
+    workers at once. Entries expire after ``ttl_hours`` and the least recently
+    used ones are evicted whenever the stored bodies exceed ``max_bytes``.
+    """
+
+    def __init__(self, path, ttl_hours=24, max_bytes=200 * 1024 * 1024, compress_level=6):
+        self.path = path
+        self.ttl = ttl_hours * 3600
+        self.max_bytes = max_bytes
+        self.compress_level = compress_level
+        self._local = threading.local()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = self._connect()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at)")
+
+    def _connect(self):
+        """Return the SQLite connection for the current thread"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, url):
+        """Return the cached body for url, or None if missing or expired"""
+        try:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT body, created_at FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+            if not row:
+                return None
+
+            body, created_at = row
+            now = time.time()
+            if now - created_at >= self.ttl:
+                conn.execute("DELETE FROM responses WHERE url = ?", (url,))
+                return None
+
+            conn.execute("UPDATE responses SET accessed_at = ? WHERE url = ?", (now, url))
+            return zlib.decompress(body).decode('utf-8')
+        except Exception as e:
+            logger.error(f"Error reading cache entry for {url}: {str(e)}")
+            return None
+
+    def set(self, url, text):
+        """Store a response body and evict old entries if the cache is full"""
+        try:
+            body = zlib.compress(text.encode('utf-8'), self.compress_level)
+            now = time.time()
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (url, body, size, created_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (url, body, len(body), now, now)
+                )
+                self._evict(conn, now)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        except Exception as e:
+            logger.error(f"Error writing cache entry for {url}: {str(e)}")
+
+    def _evict(self, conn, now):
+        """Drop expired entries, then least recently used ones until under max_bytes"""
+        conn.execute("DELETE FROM responses WHERE created_at <= ?", (now - self.ttl,))
+
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        excess = total - self.max_bytes
+        victims = []
+        for url, size in conn.execute("SELECT url, size FROM responses ORDER BY accessed_at ASC"):
+            victims.append((url,))
+            excess -= size
+            if excess <= 0:
+                break
+        conn.executemany("DELETE FROM responses WHERE url = ?", victims)
+        logger.info(f"Evicted {len(victims)} entries from response cache")
+
+    def clear(self):
+        """Remove every cached response"""
+        self._connect().execute("DELETE FROM responses")
+
+    def stats(self):
+        """Return the number of entries and compressed bytes currently stored"""
+        entries, size = self._connect().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        return {'entries': entries, 'bytes': size, 'max_bytes': self.max_bytes}
@@ -0,0 +1,185 @@
+import os
+import json
+import time
+import zlib
+import shutil
+import sqlite3
+import hashlib
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+def result_key(platform, category, location, **filters):
+    """
+    Cache key of a search: platform, category, location and filters with case,
+    spacing and filter order normalised away. Callers pass the category and
+    location already canonicalised (clean_search_query / extract_location).
+    """
+    def canonical(value):
+        return ' '.join(str(value or '').lower().split())
+
+    parts = [canonical(platform), canonical(category), canonical(location), sorted(filters.items())]
+    return hashlib.sha1(json.dumps(parts, default=str).encode('utf-8')).hexdigest()
+
+
+class CachedResult:
+    def __init__(self, key, result, files, created_at, ttl):
+        self.key = key
+        self.result = result
+        self.files = files
+        self.created_at = created_at
+        self.age = time.time() - created_at
+        self.fresh = self.age < ttl
+
+
+class ResultCache:
+    """
+    Finished scrape results per search, shared by every worker process.
+
+    Results are stored zlib-compressed JSON in SQLite (WAL mode, one
+    connection per thread), like ResponseCache; files a result refers to
+    (its Excel workbook) are copied into ``files_dir`` because the originals
+    in downloads/ are cleaned up after an hour. An entry is fresh for
+    ``ttl_hours``; for ``stale_hours`` after that it is still served, but the
+    caller should refresh it in the background (stale-while-revalidate).
+    ``claim_refresh`` makes sure only one worker does that per entry.
+    """
+
+    def __init__(self, path, files_dir, ttl_hours=6, stale_hours=48, compress_level=6):
+        self.path = path
+        self.files_dir = files_dir
+        self.ttl = ttl_hours * 3600
+        self.max_age = self.ttl + stale_hours * 3600
+        self.compress_level = compress_level
+        self._local = threading.local()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        os.makedirs(files_dir, exist_ok=True)
+
+        conn = self._connect()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS results (
+                key TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                files TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                refresh_until REAL NOT NULL DEFAULT 0
+            )
+        """)
+
+    def _connect(self):
+        """Return the SQLite connection for the current thread"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        """Return the CachedResult for key (fresh or stale), or None if missing or too old"""
+        try:
+            row = self._connect().execute(
+                "SELECT body, files, created_at FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if not row:
+                return None
+            body, files, created_at = row
+            if time.time() - created_at >= self.max_age:
+                self.delete(key)
+                return None
+            result = json.loads(zlib.decompress(body).decode('utf-8'))
+            return CachedResult(key, result, json.loads(files), created_at, self.ttl)
+        except Exception as e:
+            logger.error(f"Error reading cached result {key}: {str(e)}")
+            return None
+
+    def store(self, key, result, files=None):
+        """Save a job result; files maps result fields to the paths of files to keep with it"""
+        try:
+            stored = {}
+            for field, path in (files or {}).items():
+                if path and os.path.exists(path):
+                    target = os.path.join(self.files_dir, f"{key}_{field}{os.path.splitext(path)[1]}")
+                    partial = f"{target}.{threading.get_ident()}.tmp"
+                    shutil.copyfile(path, partial)
+                    os.replace(partial, target)
+                    stored[field] = target
+            body = zlib.compress(json.dumps(result, default=str).encode('utf-8'), self.compress_level)
+            now = time.time()
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO results (key, body, files, created_at, refresh_until) "
+                "VALUES (?, ?, ?, ?, 0)",
+                (key, body, json.dumps(stored), now)
+            )
+            self._expire(conn, now)
+        except Exception as e:
+            logger.error(f"Error writing cached result {key}: {str(e)}")
+
+    def copy_file(self, entry, field, destination):
+        """Copy the file kept for entry's field to destination; False if it is gone"""
+        path = entry.files.get(field)
+        if not path or not os.path.exists(path):
+            return False
+        # Replaced in one step, so a concurrent hit never serves half a file
+        partial = f"{destination}.{threading.get_ident()}.tmp"
+        shutil.copyfile(path, partial)
+        os.replace(partial, destination)
+        return True
+
+    def claim_refresh(self, key, lease_seconds=3600):
+        """True for exactly one caller until the entry is stored again or the lease runs out"""
+        now = time.time()
+        try:
+            return bool(self._connect().execute(
+                "UPDATE results SET refresh_until = ? WHERE key = ? AND refresh_until <= ?",
+                (now + lease_seconds, key, now)
+            ).rowcount)
+        except Exception as e:
+            logger.error(f"Error claiming refresh of cached result {key}: {str(e)}")
+            return False
+
+    def delete(self, key):
+        """Remove key and its files"""
+        conn = self._connect()
+        row = conn.execute("SELECT files FROM results WHERE key = ?", (key,)).fetchone()
+        conn.execute("DELETE FROM results WHERE key = ?", (key,))
+        self._remove_files(json.loads(row[0]) if row else {})
+
+    def _expire(self, conn, now):
+        """Drop entries too old to be served, with their files"""
+        expired = conn.execute(
+            "SELECT key, files FROM results WHERE created_at <= ?", (now - self.max_age,)
+        ).fetchall()
+        if expired:
+            conn.executemany("DELETE FROM results WHERE key = ?", [(key,) for key, _ in expired])
+            for _, files in expired:
+                self._remove_files(json.loads(files))
+            logger.info(f"Expired {len(expired)} cached results")
+
+    @staticmethod
+    def _remove_files(files):
+        for path in files.values():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def clear(self):
+        """Remove every cached result"""
+        for key, in self._connect().execute("SELECT key FROM results").fetchall():
+            self.delete(key)
+
+    def stats(self):
+        """Return the number of cached results and how many of them are fresh"""
+        entries, fresh = self._connect().execute(
+            "SELECT COUNT(*), COALESCE(SUM(created_at > ?), 0) FROM results",
+            (time.time() - self.ttl,)
+        ).fetchone()
+        return {'entries': entries, 'fresh': fresh}
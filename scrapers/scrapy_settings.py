@@ -6,22 +6,34 @@ NEWSPIDER_MODULE = 'scrapers'
 # Crawl responsibly by identifying yourself
 USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
 
-# Configure maximum concurrent requests
-CONCURRENT_REQUESTS = 1
+# Configure maximum concurrent requests; every site gets its own download
+# slot, so business websites are fetched side by side with the search pages
+CONCURRENT_REQUESTS = 8
 CONCURRENT_REQUESTS_PER_DOMAIN = 1
 
-# Configure a delay for requests for the same website
-DOWNLOAD_DELAY = 5
+# Configure a delay for requests for the same website (randomized 0.5x-1.5x)
+DOWNLOAD_DELAY = 1
 RANDOMIZE_DOWNLOAD_DELAY = True
 
+# Search pages keep their own slower slot; the spider exempts it from AutoThrottle
+DOWNLOAD_SLOTS = {
+    'www.yellowpages.com': {'concurrency': 1, 'delay': 7.5},
+}
+
+# 403/429/503 double the delay of the slot that sent them instead of sleeping
+# (see scrapers/middlewares.py); RetryMiddleware then reschedules the request
+SLOT_BACKOFF_HTTP_CODES = [403, 429, 503]
+SLOT_BACKOFF_MAX_DELAY = 60
+
 # Enable cookies
 COOKIES_ENABLED = True
 
 # Enable or disable downloader middlewares
 DOWNLOADER_MIDDLEWARES = {
     'scrapy.downloadermiddlewares.useragent.UserAgentMiddleware': None,
-    'scrapy_user_agents.middlewares.RandomUserAgentMiddleware': 400,
+    'scrapers.middlewares.SharedRandomUserAgentMiddleware': 400,
     'scrapy.downloadermiddlewares.retry.RetryMiddleware': 500,
+    'scrapers.middlewares.SlotBackoffMiddleware': 550,
     'scrapy.downloadermiddlewares.httpproxy.HttpProxyMiddleware': 750,
 }
 
@@ -61,21 +73,36 @@ COMPRESSION_ENABLED = True
 REDIRECT_ENABLED = True
 REDIRECT_MAX_TIMES = 5
 
-# Configure auto throttle
+# Configure auto throttle (business website slots; DOWNLOAD_DELAY is its floor)
 AUTOTHROTTLE_ENABLED = True
-AUTOTHROTTLE_START_DELAY = 5
+AUTOTHROTTLE_START_DELAY = 1
 AUTOTHROTTLE_MAX_DELAY = 60
 AUTOTHROTTLE_TARGET_CONCURRENCY = 1.0
 AUTOTHROTTLE_DEBUG = False
 
-# Configure download handlers
+# Configure download handlers: HTTP/1.1 keeps connections open and pools them
+# per host (up to CONCURRENT_REQUESTS_PER_DOMAIN), so consecutive search pages
+# reuse one TLS connection instead of a new handshake per request
 DOWNLOAD_HANDLERS = {
-    'http': 'scrapy.core.downloader.handlers.http.HTTP10DownloadHandler',
-    'https': 'scrapy.core.downloader.handlers.http.HTTP10DownloadHandler',
+    'http': 'scrapy.core.downloader.handlers.http11.HTTP11DownloadHandler',
+    'https': 'scrapy.core.downloader.handlers.http11.HTTP11DownloadHandler',
 }
 
 # Configure stats collection
 STATS_CLASS = 'scrapy.statscollectors.MemoryStatsCollector'
 
-# Configure item pipelines
-ITEM_PIPELINES = {} 
\ No newline at end of file
+# Configure item pipelines: items leave the crawl with the app's export field
+# names and are appended to a JSON Lines feed (scrapers/pipelines.py)
+ITEM_PIPELINES = {
+    'scrapers.pipelines.ExportFieldsPipeline': 100,
+    'scrapers.pipelines.JsonLinesFeedPipeline': 800,
+}
+
+# One feed file per crawl in this directory, unless the spider is given feed_path
+JSONL_FEED_DIR = None
+
+# Website details per business website, reused across runs and revalidated
+# with ETag/Last-Modified once older than the TTL (see scrapers/enrichment_cache.py)
+ENRICHMENT_CACHE_PATH = 'cache/enrichment.sqlite3'
+ENRICHMENT_CACHE_TTL_HOURS = 168
+ENRICHMENT_CACHE_MAX_STALE_DAYS = 30
@@ -0,0 +1,21 @@
+# "throughput" profile: the default settings with more parallelism, for
+# crawls where finishing quickly matters more than a light footprint.
+# Select it with CrawlRunner('scrapers.scrapy_settings_throughput'), the
+# app's 'scrapy_profile' setting, or SCRAPY_SETTINGS_MODULE for `scrapy crawl`.
+from scrapers.scrapy_settings import *  # noqa: F401,F403
+
+# Many business websites at once, each on its own keep-alive connection pool
+CONCURRENT_REQUESTS = 32
+CONCURRENT_REQUESTS_PER_DOMAIN = 2
+DOWNLOAD_DELAY = 0.25
+
+# yellowpages.com still gets its own, much smaller budget
+DOWNLOAD_SLOTS = {
+    'www.yellowpages.com': {'concurrency': 2, 'delay': 3},
+}
+
+AUTOTHROTTLE_START_DELAY = 0.25
+AUTOTHROTTLE_TARGET_CONCURRENCY = 2.0
+
+# DNS lookups for many distinct business domains run in the reactor thread pool
+REACTOR_THREADPOOL_MAXSIZE = 20
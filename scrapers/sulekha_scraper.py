@@ -3,14 +3,138 @@ import asyncio
 import aiohttp
 from urllib.parse import quote
 import logging
-from bs4 import BeautifulSoup
+from .http_client import get_session
+from .rate_limiter import HostRateLimiter
+from .parse_pool import run_parse
+from .html_parser import make_soup
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
+def parse_sulekha_page(html_content, search_query, backend=None):
+    """
+    Walk the h3 business headers of a Sulekha page and extract each listing.
+
+    Module-level so it can run in a ParsePool worker; returns every named
+    listing in page order (duplicates are filtered by the caller) together
+    with the messages of listings that failed to parse. The walk needs the
+    whole document, so a selectolax backend parses it with lxml.
+    """
+    businesses = []
+    errors = []
+
+    soup = make_soup(html_content, backend)
+
+    # Find all h3 headers that contain business names
+    listings = soup.find_all('h3')
+    for listing in listings:
+        try:
+            # Get the business name from h3
+            name = listing.text.strip()
+            
+            # Get the parent container for additional info
+            parent = listing.find_previous('p')
+            if not parent:
+                parent = listing.find_next('p')
+            
+            # Extract description and other details
+            description = ''
+            address = ''
+            phone = ''
+            
+            if parent:
+                # Try to find address in parent's siblings first
+                address_div = parent.find_next('div', class_='address')
+                if address_div:
+                    address = address_div.text.strip()
+                
+                # If no address div found, try to parse from text
+                if not address:
+                    text = parent.text.strip()
+                    lines = text.split('\n')
+                    
+                    # First try to find phone number
+                    for line in lines:
+                        line = line.strip()
+                        if any(char.isdigit() for char in line) and ('+' in line or line.count('-') > 1):
+                            phone = line
+                            break
+                    
+                    # Then try to find address using multiple methods
+                    address_keywords = ['street', 'road', 'area', 'near', 'beside', 'opposite', 'mumbai', 'maharashtra',
+                                      'building', 'floor', 'landmark', 'station', 'mall', 'market', 'complex', 'sector',
+                                      'nagar', 'colony', 'highway', 'junction', 'cross', 'main', 'phase', 'industrial',
+                                      'east', 'west', 'north', 'south', 'behind', 'next to', 'above', 'below']
+                    
+                    max_address_score = 0
+                    for line in lines:
+                        line = line.strip()
+                        if not line or line == phone:
+                            continue
+                            
+                        # Score the line based on address indicators
+                        score = 0
+                        line_lower = line.lower()
+                        
+                        # Check for address keywords
+                        keyword_count = sum(1 for keyword in address_keywords if keyword in line_lower)
+                        score += keyword_count * 2
+                        
+                        # Check for numbers (like building numbers)
+                        if any(char.isdigit() for char in line):
+                            score += 2
+                        
+                        # Check for PIN codes
+                        if re.search(r'\b\d{6}\b', line):
+                            score += 5
+                        
+                        # Check for typical address patterns
+                        if re.search(r'(no|shop|flat|office)\s*[#.:,]?\s*\d+', line_lower):
+                            score += 3
+                        
+                        # Penalize very short lines
+                        if len(line) < 15:
+                            score -= 2
+                        
+                        # Bonus for lines with commas (typical in addresses)
+                        score += line.count(',') * 0.5
+                        
+                        if score > max_address_score:
+                            max_address_score = score
+                            address = line
+                    
+                    # Find description (usually the longest non-address, non-phone line)
+                    max_length = 0
+                    for line in lines:
+                        line = line.strip()
+                        if line and line != phone and line != address and len(line) > max_length:
+                            max_length = len(line)
+                            description = line
+            
+            if name:
+                businesses.append({
+                    'Name': name,
+                    'Phone': phone,
+                    'Address': address,
+                    'Description': description,
+                    'Category': search_query
+                })
+        except Exception as e:
+            errors.append(str(e))
+
+    return {'businesses': businesses, 'errors': errors}
+
 class SulekhaScraper:
-    def __init__(self, scraper_api_key):
+    def __init__(self, scraper_api_key, cache=None, rate_limiter=None, parse_pool=None, parser_backend=None):
         self.scraper_api_key = scraper_api_key
+        # Optional ResponseCache shared with the rest of the app
+        self.cache = cache
+        # Per-host token buckets; pass the app's limiter to share its budget
+        self.rate_limiter = rate_limiter or HostRateLimiter()
+        # Pages are parsed off the event loop; without a ParsePool the loop's
+        # default thread executor is used
+        self.parse_pool = parse_pool
+        self.parser_backend = parser_backend
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
@@ -81,7 +205,35 @@ class SulekhaScraper:
         corrected_location_words = [self.location_corrections.get(word, word) for word in location_words]
         return '-'.join(corrected_location_words)
 
-    async def scrape(self, search_query, location=None):
+    async def _fetch_page(self, session, search_url):
+        """Fetch a page through ScraperAPI, using the response cache when available"""
+        if self.cache:
+            cached = self.cache.get(search_url)
+            if cached:
+                logger.info(f"Using cached response for {search_url}")
+                return cached
+
+        scraper_url = f'http://api.scraperapi.com?api_key={self.scraper_api_key}&url={quote(search_url)}&render=true'
+
+        await self.rate_limiter.acquire(scraper_url)
+        async with session.get(scraper_url, headers=self.headers) as response:
+            self.rate_limiter.record_response(scraper_url, response.status)
+            if response.status == 404:
+                logger.warning(f"Failed to fetch {search_url}. Status: 404 - Page not found, trying alternative URL pattern")
+                return None
+
+            if response.status != 200:
+                logger.warning(f"Failed to fetch {search_url}. Status: {response.status}")
+                return None
+
+            html_content = await response.text()
+
+        if self.cache:
+            self.cache.set(search_url, html_content)
+        return html_content
+
+    async def scrape(self, search_query, location=None, on_page=None):
+        """Scrape up to 5 result pages; on_page(platform, page, listings, businesses) gets each page's new rows"""
         data = []
 
         if not self.scraper_api_key:
@@ -118,138 +270,42 @@ class SulekhaScraper:
 
             logger.info(f"Attempting to scrape Sulekha with category: {display_query} in {display_location if display_location else 'all locations'}")
 
-            async with aiohttp.ClientSession() as session:
-                for search_url in search_urls:
-                    try:
-                        logger.info(f"Trying URL: {search_url}")
-                        scraper_url = f'http://api.scraperapi.com?api_key={self.scraper_api_key}&url={quote(search_url)}&render=true'
-
-                        async with session.get(scraper_url, headers=self.headers) as response:
-                            if response.status == 404:
-                                logger.warning(f"Failed to fetch {search_url}. Status: 404 - Page not found, trying alternative URL pattern")
-                                continue
-
-                            if response.status != 200:
-                                logger.warning(f"Failed to fetch {search_url}. Status: {response.status}")
-                                continue
-
-                            html_content = await response.text()
-                            soup = BeautifulSoup(html_content, 'html.parser')
-
-                            # Find all h3 headers that contain business names
-                            listings = soup.find_all('h3')
-                            for listing in listings:
-                                try:
-                                    # Get the business name from h3
-                                    name = listing.text.strip()
-                                    
-                                    # Get the parent container for additional info
-                                    parent = listing.find_previous('p')
-                                    if not parent:
-                                        parent = listing.find_next('p')
-                                    
-                                    # Extract description and other details
-                                    description = ''
-                                    address = ''
-                                    phone = ''
-                                    
-                                    if parent:
-                                        # Try to find address in parent's siblings first
-                                        address_div = parent.find_next('div', class_='address')
-                                        if address_div:
-                                            address = address_div.text.strip()
-                                        
-                                        # If no address div found, try to parse from text
-                                        if not address:
-                                            text = parent.text.strip()
-                                            lines = text.split('\n')
-                                            
-                                            # First try to find phone number
-                                            for line in lines:
-                                                line = line.strip()
-                                                if any(char.isdigit() for char in line) and ('+' in line or line.count('-') > 1):
-                                                    phone = line
-                                                    break
-                                            
-                                            # Then try to find address using multiple methods
-                                            address_keywords = ['street', 'road', 'area', 'near', 'beside', 'opposite', 'mumbai', 'maharashtra',
-                                                              'building', 'floor', 'landmark', 'station', 'mall', 'market', 'complex', 'sector',
-                                                              'nagar', 'colony', 'highway', 'junction', 'cross', 'main', 'phase', 'industrial',
-                                                              'east', 'west', 'north', 'south', 'behind', 'next to', 'above', 'below']
-                                            
-                                            max_address_score = 0
-                                            for line in lines:
-                                                line = line.strip()
-                                                if not line or line == phone:
-                                                    continue
-                                                    
-                                                # Score the line based on address indicators
-                                                score = 0
-                                                line_lower = line.lower()
-                                                
-                                                # Check for address keywords
-                                                keyword_count = sum(1 for keyword in address_keywords if keyword in line_lower)
-                                                score += keyword_count * 2
-                                                
-                                                # Check for numbers (like building numbers)
-                                                if any(char.isdigit() for char in line):
-                                                    score += 2
-                                                
-                                                # Check for PIN codes
-                                                if re.search(r'\b\d{6}\b', line):
-                                                    score += 5
-                                                
-                                                # Check for typical address patterns
-                                                if re.search(r'(no|shop|flat|office)\s*[#.:,]?\s*\d+', line_lower):
-                                                    score += 3
-                                                
-                                                # Penalize very short lines
-                                                if len(line) < 15:
-                                                    score -= 2
-                                                
-                                                # Bonus for lines with commas (typical in addresses)
-                                                score += line.count(',') * 0.5
-                                                
-                                                if score > max_address_score:
-                                                    max_address_score = score
-                                                    address = line
-                                            
-                                            # Find description (usually the longest non-address, non-phone line)
-                                            max_length = 0
-                                            for line in lines:
-                                                line = line.strip()
-                                                if line and line != phone and line != address and len(line) > max_length:
-                                                    max_length = len(line)
-                                                    description = line
-                                    
-                                    if name and not any(existing.get('Name') == name for existing in data):
-                                        business_data = {
-                                            'Name': name,
-                                            'Phone': phone,
-                                            'Address': address,
-                                            'Description': description,
-                                            'Category': search_query
-                                        }
-                                        data.append(business_data)
-                                        logger.info(f"Added business: {name}")
-                                except Exception as e:
-                                    logger.warning(f"Failed to parse listing: {e}")
-
-                            page_count = len(data)
-                            if page_count > 0:
-                                logger.info(f"Found {page_count} businesses on {search_url}")
-                            else:
-                                logger.info(f"No businesses found on {search_url}")
-                                
-                            # Don't break after first success, try all pages
-                            
-                            # Add a delay between pages to avoid rate limiting
-                            await asyncio.sleep(3)
-
-                    except Exception as e:
-                        logger.error(f"Error fetching {search_url}: {str(e)}")
+            session = get_session()
+            for page_number, search_url in enumerate(search_urls, 1):
+                try:
+                    logger.info(f"Trying URL: {search_url}")
+                    html_content = await self._fetch_page(session, search_url)
+                    if not html_content:
                         continue
 
+                    result = await run_parse(
+                        self.parse_pool, parse_sulekha_page, html_content, search_query, self.parser_backend
+                    )
+                    for error in result['errors']:
+                        logger.warning(f"Failed to parse listing: {error}")
+
+                    added = []
+                    for business_data in result['businesses']:
+                        name = business_data['Name']
+                        if not any(existing.get('Name') == name for existing in data):
+                            data.append(business_data)
+                            added.append(business_data)
+                            logger.info(f"Added business: {name}")
+                    if on_page:
+                        on_page('sulekha', page_number, len(result['businesses']), added)
+
+                    page_count = len(data)
+                    if page_count > 0:
+                        logger.info(f"Found {page_count} businesses on {search_url}")
+                    else:
+                        logger.info(f"No businesses found on {search_url}")
+                        
+                    # Don't break after first success, try all pages
+
+                except Exception as e:
+                    logger.error(f"Error fetching {search_url}: {str(e)}")
+                    continue
+
         except Exception as e:
             logger.error(f"Error during scraping: {str(e)}")
 
@@ -2,11 +2,9 @@ from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-import undetected_chromedriver as uc
-import subprocess
 import logging
 import time
 import re
@@ -15,13 +13,82 @@ import random
 import requests
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
+from .driver_pool import create_driver
+from .enrichment import HEADERS, CACHE_EXTRACTOR, normalize_url, parse_website, merge_details
 
 # Use existing logger from app.py without reconfiguring
 logger = logging.getLogger('scraper')
 
+# Listing selectors, tried in order (shared by the bulk and per-element extraction)
+NAME_SELECTORS = ['.business-name', 'a.business-name']
+PHONE_SELECTORS = ['.phones.phone.primary', '.phone']
+CATEGORY_SELECTORS = ['.categories', '.links']
+OWNER_SELECTORS = ['.owner-name', '.business-owner', '.contact-name', '.sales-info', '.about-business']
+MORE_INFO_SELECTORS = ['.more-info', '.view-details', '.business-info', '.show-more']
+
+# Common owner name patterns
+OWNER_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'Owner:\s*([^,\n]+)',
+    r'Proprietor:\s*([^,\n]+)',
+    r'Manager:\s*([^,\n]+)',
+    r'Contact:\s*([^,\n]+)',
+    r'Founded by\s*([^,\n]+)',
+    r'Established by\s*([^,\n]+)',
+    r'President:\s*([^,\n]+)',
+    r'CEO:\s*([^,\n]+)'
+)]
+
+# Reads every .result listing in the browser and returns one row of raw fields per
+# listing, replacing a dozen find_element round trips per listing with one call.
+# Text follows WebElement.text: elements that are not rendered read as ''.
+EXTRACT_LISTINGS_JS = """
+const selectors = arguments[0];
+function text(el) {
+    if (!el) return null;
+    if (!el.getClientRects().length || getComputedStyle(el).visibility === 'hidden') return '';
+    return el.innerText;
+}
+function first(root, list) {
+    for (const selector of list) {
+        const el = root.querySelector(selector);
+        if (el) return el;
+    }
+    return null;
+}
+return Array.from(document.querySelectorAll('.result')).map(el => {
+    const site = el.querySelector('a.track-visit-website');
+    return {
+        element: el,
+        name: text(first(el, selectors.name)),
+        phone: text(first(el, selectors.phone)),
+        street: text(el.querySelector('.street-address')),
+        locality: text(el.querySelector('.locality')),
+        adr: text(el.querySelector('.adr')),
+        website: site ? (site.hasAttribute('href') ? site.href : null) : '',
+        categories: text(first(el, selectors.categories)),
+        owner_texts: selectors.owner.map(selector => text(el.querySelector(selector))),
+        has_more_info: selectors.moreInfo.some(selector => el.querySelector(selector) !== null)
+    };
+});
+"""
+
 class YellowPagesScraper:
-    def __init__(self):
-        self.setup_driver()
+    def __init__(self, parser_backend=None, driver=None, bulk_extract=True, enrich_websites=True,
+                 enrichment_cache=None):
+        # HTML parser used for business websites (see scrapers.html_parser)
+        self.parser_backend = parser_backend
+        # Read all listings of a page with one execute_script call instead of per-element lookups
+        self.bulk_extract = bulk_extract
+        # Fetch business websites inline; False leaves it to an async WebsiteEnricher
+        self.enrich_websites = enrich_websites
+        # Optional EnrichmentCache shared with WebsiteEnricher
+        self.enrichment_cache = enrichment_cache
+        # A driver leased from a DriverPool belongs to the pool; otherwise launch our own
+        self.owns_driver = driver is None
+        if driver is None:
+            self.setup_driver()
+        else:
+            self.driver = driver
         # Dictionary of US state abbreviations
         self.us_states = {
             'alabama': 'AL', 'alaska': 'AK', 'arizona': 'AZ', 'arkansas': 'AR', 'california': 'CA',
@@ -39,210 +106,40 @@ class YellowPagesScraper:
         # Add reverse mapping (abbreviation to full name)
         self.us_states.update({v: v for v in self.us_states.values()})
         
-    def get_chrome_version(self):
-        try:
-            # Common Chrome installation paths
-            possible_paths = [
-                r"C:\Program Files\Google\Chrome\Application\chrome.exe",
-                r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
-                os.path.expanduser(r"~\AppData\Local\Google\Chrome\Application\chrome.exe")
-            ]
-            chrome_path = next((path for path in possible_paths if os.path.exists(path)), None)
-            
-            if not chrome_path:
-                raise FileNotFoundError("Chrome executable not found.")
-            
-            logger.info(f"Chrome executable found at: {chrome_path}")
-
-            # PowerShell command to fetch version
-            ps_cmd = f'powershell -NoProfile -Command "(Get-Item \\"{chrome_path}\\").VersionInfo.FileVersion"'
-            result = subprocess.run(ps_cmd, capture_output=True, text=True, shell=True)
-            version = result.stdout.strip()
-
-            if not version:
-                raise Exception("Failed to detect Chrome version via PowerShell.")
-
-            major_version = version.split('.')[0]
-            logger.info(f"Detected Chrome version: {version} (Major: {major_version})")
-            return major_version
-
-        except Exception as e:
-            logger.error(f"Error fetching Chrome version: {e}")
-            raise
-
     def setup_driver(self):
         try:
-            logger.info("Setting up undetected-chromedriver...")
-
-            options = uc.ChromeOptions()
-            options.add_argument('--no-sandbox')
-            options.add_argument('--disable-dev-shm-usage')
-            options.add_argument('--disable-gpu')
-            options.add_argument('--disable-extensions')
-            options.add_argument('--window-size=1920,1080')
-            options.add_argument('--ignore-certificate-errors')
-            options.add_argument('--log-level=3')
-            options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
-
-            # Create undetected-chromedriver instance
-            self.driver = uc.Chrome(
-                options=options,
-                headless=False,  # Headless mode often doesn't work well with undetected-chromedriver
-                use_subprocess=True,
-                version_main=int(self.get_chrome_version())
-            )
-            
-            self.driver.set_page_load_timeout(60)
-            self.driver.get('about:blank')
-            logger.info("Undetected-chromedriver is ready.")
-
+            self.driver = create_driver()
         except Exception as e:
             logger.error(f"WebDriver setup failed: {e}")
-            if hasattr(self, 'driver'):
-                self.driver.quit()
             raise
 
     def clean_text(self, text):
         return re.sub(r'\s+', ' ', text.strip()) if text else ""
 
-    def extract_email_addresses(self, text):
-        """Extract email addresses from text using regex."""
-        email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-        return list(set(re.findall(email_pattern, text)))
-
-    def extract_phone_numbers(self, text):
-        """Extract phone numbers from text using regex."""
-        phone_patterns = [
-            r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b',  # Standard US format
-            r'\(\d{3}\)\s*\d{3}[-.]?\d{4}',     # (123) 456-7890
-            r'\+1[-.]?\d{3}[-.]?\d{3}[-.]?\d{4}' # +1 format
-        ]
-        phones = []
-        for pattern in phone_patterns:
-            phones.extend(re.findall(pattern, text))
-        return list(set(phones))
-
-    def extract_license_numbers(self, text):
-        """Extract potential license numbers using common patterns."""
-        license_patterns = [
-            r'License\s*#?\s*(\w+[-\s]?\d+)',
-            r'License\s*Number\s*[:.]?\s*(\w+[-\s]?\d+)',
-            r'Lic\s*[:.#]?\s*(\w+[-\s]?\d+)',
-            r'Registration\s*#?\s*(\w+[-\s]?\d+)',
-            r'Cert\s*[:.#]?\s*(\w+[-\s]?\d+)'
-        ]
-        licenses = []
-        for pattern in license_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                licenses.append(match.group(1))
-        return list(set(licenses))
-
-    def extract_experience(self, text):
-        """Extract experience information using common patterns."""
-        experience_patterns = [
-            r'(\d+)\+?\s*years?\s*(of\s*)?experience',
-            r'(established|founded|serving\s*since)\s*in?\s*(\d{4})',
-            r'since\s*(\d{4})',
-            r'est\.\s*(\d{4})',
-            r'experience\s*[:of]*\s*(\d+)\+?\s*years?'
-        ]
-        experiences = []
-        for pattern in experience_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                if len(match.groups()) > 1 and match.group(2):
-                    # For patterns with year
-                    year = int(match.group(2))
-                    current_year = time.localtime().tm_year
-                    years = current_year - year
-                    experiences.append(f"{years} years (since {year})")
-                else:
-                    # For patterns with direct year mention
-                    experiences.append(f"{match.group(1)} years")
-        return list(set(experiences))
-
-    def extract_description(self, soup):
-        """Extract business description from common locations in the webpage."""
-        description = ""
-        
-        # Common description locations
-        description_selectors = [
-            'meta[name="description"]',
-            'meta[property="og:description"]',
-            '.about-us',
-            '.company-description',
-            '.business-description',
-            '#about',
-            '.about',
-            '.overview',
-            '.description',
-            '[id*="about"]',
-            '[class*="about"]',
-            '[id*="overview"]',
-            '[class*="overview"]'
-        ]
-        
-        # Try meta descriptions first
-        for selector in description_selectors[:2]:
-            meta = soup.select_one(selector)
-            if meta and meta.get('content'):
-                description = meta['content'].strip()
-                break
-        
-        # If no meta description, try content sections
-        if not description:
-            for selector in description_selectors[2:]:
-                elements = soup.select(selector)
-                for element in elements:
-                    text = element.get_text(strip=True)
-                    if len(text) > len(description):
-                        description = text
-        
-        return description
-
     def scrape_business_website(self, url):
-        """Scrape additional details from the business website."""
+        """Scrape additional details from the business website (blocking; see WebsiteEnricher)."""
         if not url:
             return {}
         
         try:
-            # Add http:// if not present
-            if not url.startswith(('http://', 'https://')):
-                url = 'https://' + url
+            url = normalize_url(url)
+            cache = self.enrichment_cache
+            entry = cache.lookup(url, CACHE_EXTRACTOR) if cache else None
+            if entry is not None and entry.fresh:
+                return dict(entry.details)
 
             logger.info(f"Scraping business website: {url}")
             
-            # Use requests with a timeout
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-            }
-            response = requests.get(url, headers=headers, timeout=15)
+            validators = entry.validators(url) if entry is not None else {}
+            response = requests.get(url, headers={**HEADERS, **validators}, timeout=15)
+            if response.status_code == 304 and validators:
+                cache.touch(url, CACHE_EXTRACTOR)
+                return dict(entry.details)
             response.raise_for_status()
-            
-            # Parse the webpage
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Get all text content
-            text_content = soup.get_text()
-            
-            # Extract various details
-            emails = self.extract_email_addresses(text_content)
-            phones = self.extract_phone_numbers(text_content)
-            licenses = self.extract_license_numbers(text_content)
-            experiences = self.extract_experience(text_content)
-            description = self.extract_description(soup)
-            
-            # Create result dictionary
-            details = {
-                'Website Description': description[:500] if description else "",  # Limit description length
-                'Additional Emails': ', '.join(emails) if emails else "",
-                'Additional Phones': ', '.join(phones) if phones else "",
-                'License Numbers': ', '.join(licenses) if licenses else "",
-                'Experience': ', '.join(experiences) if experiences else "",
-                'Website Status': 'Active'
-            }
-            
+            details = parse_website(response.text, self.parser_backend)
+            if cache:
+                cache.store(url, CACHE_EXTRACTOR, details,
+                            response.headers.get('ETag'), response.headers.get('Last-Modified'))
             return details
             
         except requests.RequestException as e:
@@ -337,206 +234,218 @@ class YellowPagesScraper:
             }
 
     def extract_business_details(self, business_element):
+        """Build the record for one .result element, one WebDriver call per field"""
         try:
-            # Get business name
-            name = ""
-            try:
-                name_elem = business_element.find_element(By.CSS_SELECTOR, '.business-name')
-                name = self.clean_text(name_elem.text)
-            except NoSuchElementException:
-                try:
-                    name_elem = business_element.find_element(By.CSS_SELECTOR, 'a.business-name')
-                    name = self.clean_text(name_elem.text)
-                except NoSuchElementException:
-                    logger.warning("Could not find business name")
-                    return None
-
-            # Get phone number
-            phone = ""
-            try:
-                phone_elem = business_element.find_element(By.CSS_SELECTOR, '.phones.phone.primary')
-                phone = self.clean_text(phone_elem.text)
-            except NoSuchElementException:
-                try:
-                    phone_elem = business_element.find_element(By.CSS_SELECTOR, '.phone')
-                    phone = self.clean_text(phone_elem.text)
-                except NoSuchElementException:
-                    pass
+            return self.details_from_fields(self.element_fields(business_element), business_element)
+        except Exception as e:
+            logger.error(f"Error extracting business details: {e}")
+            return None
 
-            # Get address components
-            address_line1 = ""
-            address_line2 = ""
-            try:
-                street = business_element.find_element(By.CSS_SELECTOR, '.street-address')
-                locality = business_element.find_element(By.CSS_SELECTOR, '.locality')
-                address_line1 = self.clean_text(street.text)
-                address_line2 = self.clean_text(locality.text)
-            except NoSuchElementException:
+    def element_fields(self, element):
+        """Raw listing fields read through find_element (same shape as EXTRACT_LISTINGS_JS rows)"""
+        def text_of(selectors):
+            for selector in selectors:
                 try:
-                    address_elem = business_element.find_element(By.CSS_SELECTOR, '.adr')
-                    full_address = self.clean_text(address_elem.text)
-                    # Split full address into two parts
-                    if ',' in full_address:
-                        parts = full_address.split(',', 1)
-                        address_line1 = parts[0].strip()
-                        address_line2 = parts[1].strip()
-                    else:
-                        address_line1 = full_address
+                    return element.find_element(By.CSS_SELECTOR, selector).text
                 except NoSuchElementException:
-                    pass
+                    continue
+            return None
 
-            # Parse address components
-            address_components = self.parse_address(address_line1, address_line2)
+        website = ""
+        try:
+            website = element.find_element(By.CSS_SELECTOR, 'a.track-visit-website').get_attribute('href')
+        except NoSuchElementException:
+            pass
+
+        return {
+            'name': text_of(NAME_SELECTORS),
+            'phone': text_of(PHONE_SELECTORS),
+            'street': text_of(['.street-address']),
+            'locality': text_of(['.locality']),
+            'adr': text_of(['.adr']),
+            'website': website,
+            'categories': text_of(CATEGORY_SELECTORS),
+            'owner_texts': [text_of([selector]) for selector in OWNER_SELECTORS],
+            'has_more_info': bool(element.find_elements(By.CSS_SELECTOR, ', '.join(MORE_INFO_SELECTORS))),
+        }
 
-            # Get website
-            website = ""
+    def extract_listings_bulk(self):
+        """Raw fields of every .result listing on the page in a single execute_script call"""
+        return self.driver.execute_script(EXTRACT_LISTINGS_JS, {
+            'name': NAME_SELECTORS,
+            'phone': PHONE_SELECTORS,
+            'categories': CATEGORY_SELECTORS,
+            'owner': OWNER_SELECTORS,
+            'moreInfo': MORE_INFO_SELECTORS,
+        }) or []
+
+    def find_owner_name(self, text):
+        for pattern in OWNER_PATTERNS:
+            match = pattern.search(text)
+            if match:
+                return match.group(1).strip()
+        return ""
+
+    def owner_from_more_info(self, business_element):
+        """Click "more info" style buttons and look for the owner in the expanded content"""
+        for selector in MORE_INFO_SELECTORS:
             try:
-                website_elem = business_element.find_element(By.CSS_SELECTOR, 'a.track-visit-website')
-                website = website_elem.get_attribute('href')
-            except NoSuchElementException:
-                pass
+                more_info_btn = business_element.find_element(By.CSS_SELECTOR, selector)
+                more_info_btn.click()
+                time.sleep(1)  # Wait for content to load
+
+                # Try to find owner information in expanded content
+                expanded_content = business_element.find_element(By.CSS_SELECTOR, '.expanded-info')
+                owner_name = self.find_owner_name(self.clean_text(expanded_content.text))
+                if owner_name:
+                    return owner_name
 
-            # Get categories
-            categories = ""
-            try:
-                categories_elem = business_element.find_element(By.CSS_SELECTOR, '.categories')
-                categories = self.clean_text(categories_elem.text)
             except NoSuchElementException:
-                try:
-                    categories_elem = business_element.find_element(By.CSS_SELECTOR, '.links')
-                    categories = self.clean_text(categories_elem.text)
-                except NoSuchElementException:
-                    pass
-
-            # Clean up categories - remove duplicates and redundant text
-            if categories:
-                # Split categories by common separators
-                category_list = [cat.strip() for cat in re.split(r'[,&]', categories)]
-                # Remove duplicates while preserving order
-                seen = set()
-                category_list = [cat for cat in category_list if not (cat in seen or seen.add(cat))]
-                # Join back with commas
-                categories = ', '.join(filter(None, category_list))
-
-            # Get business owner name
-            owner_name = ""
-            try:
-                # Try to find owner name in various possible locations
-                owner_selectors = [
-                    '.owner-name',
-                    '.business-owner',
-                    '.contact-name',
-                    '.sales-info',
-                    '.about-business'
-                ]
-                
-                for selector in owner_selectors:
-                    try:
-                        owner_elem = business_element.find_element(By.CSS_SELECTOR, selector)
-                        text = self.clean_text(owner_elem.text)
-                        
-                        # Look for common owner name patterns
-                        owner_patterns = [
-                            r'Owner:\s*([^,\n]+)',
-                            r'Proprietor:\s*([^,\n]+)',
-                            r'Manager:\s*([^,\n]+)',
-                            r'Contact:\s*([^,\n]+)',
-                            r'Founded by\s*([^,\n]+)',
-                            r'Established by\s*([^,\n]+)',
-                            r'President:\s*([^,\n]+)',
-                            r'CEO:\s*([^,\n]+)'
-                        ]
-                        
-                        for pattern in owner_patterns:
-                            match = re.search(pattern, text, re.IGNORECASE)
-                            if match:
-                                owner_name = match.group(1).strip()
-                                break
-                        
-                        if owner_name:
-                            break
-                            
-                    except NoSuchElementException:
-                        continue
-                        
-                # If we haven't found an owner name, try clicking on "more info" or similar buttons
-                if not owner_name:
-                    more_info_selectors = [
-                        '.more-info',
-                        '.view-details',
-                        '.business-info',
-                        '.show-more'
-                    ]
-                    
-                    for selector in more_info_selectors:
-                        try:
-                            more_info_btn = business_element.find_element(By.CSS_SELECTOR, selector)
-                            more_info_btn.click()
-                            time.sleep(1)  # Wait for content to load
-                            
-                            # Try to find owner information in expanded content
-                            expanded_content = business_element.find_element(By.CSS_SELECTOR, '.expanded-info')
-                            text = self.clean_text(expanded_content.text)
-                            
-                            for pattern in owner_patterns:
-                                match = re.search(pattern, text, re.IGNORECASE)
-                                if match:
-                                    owner_name = match.group(1).strip()
-                                    break
-                                    
-                            if owner_name:
-                                break
-                                
-                        except NoSuchElementException:
-                            continue
-                        except Exception as e:
-                            logger.warning(f"Error clicking more info button: {e}")
-                            continue
-                            
+                continue
             except Exception as e:
-                logger.warning(f"Error extracting owner name: {e}")
-
-            # Only return if we have at least a name
-            if name:
-                # Format state properly - ensure it's not empty by using the parsed state
-                state = address_components['State'].strip()
-                if not state and address_components['City']:
-                    # Try to extract state from city if it contains a comma
-                    city_parts = address_components['City'].split(',')
-                    if len(city_parts) > 1:
-                        state = city_parts[-1].strip()
-                
-                details = {
-                    'Name': name,
-                    'Phone': phone,
-                    'Address': f"{address_components['Street Address']}, {address_components['City']}, {state} {address_components['ZIP Code']}".strip(),
-                    'Website': website,
-                    'Categories': categories,
-                    'Owner Name': owner_name,
-                    'Source': 'yellowpages'
-                }
-                
-                # If website exists, scrape additional details
-                if website:
-                    website_details = self.scrape_business_website(website)
-                    # Only add non-empty website details
-                    for key, value in website_details.items():
-                        if value:  # Only add if value is not empty
-                            details[key] = value
-                
-                return details
+                logger.warning(f"Error clicking more info button: {e}")
+                continue
+        return ""
+
+    def details_from_fields(self, fields, business_element=None):
+        """Turn raw listing fields into the business record; None if the listing has no name"""
+        if fields['name'] is None:
+            logger.warning("Could not find business name")
             return None
+        name = self.clean_text(fields['name'])
+        phone = self.clean_text(fields['phone'])
+
+        # Get address components
+        address_line1 = ""
+        address_line2 = ""
+        if fields['street'] is not None and fields['locality'] is not None:
+            address_line1 = self.clean_text(fields['street'])
+            address_line2 = self.clean_text(fields['locality'])
+        elif fields['adr'] is not None:
+            full_address = self.clean_text(fields['adr'])
+            # Split full address into two parts
+            if ',' in full_address:
+                parts = full_address.split(',', 1)
+                address_line1 = parts[0].strip()
+                address_line2 = parts[1].strip()
+            else:
+                address_line1 = full_address
+
+        # Parse address components
+        address_components = self.parse_address(address_line1, address_line2)
+
+        website = fields['website']
+
+        # Clean up categories - remove duplicates and redundant text
+        categories = self.clean_text(fields['categories'])
+        if categories:
+            # Split categories by common separators
+            category_list = [cat.strip() for cat in re.split(r'[,&]', categories)]
+            # Remove duplicates while preserving order
+            seen = set()
+            category_list = [cat for cat in category_list if not (cat in seen or seen.add(cat))]
+            # Join back with commas
+            categories = ', '.join(filter(None, category_list))
+
+        # Get business owner name from the first owner section that names one
+        owner_name = ""
+        try:
+            for text in fields['owner_texts']:
+                if text is None:
+                    continue
+                owner_name = self.find_owner_name(self.clean_text(text))
+                if owner_name:
+                    break
+
+            # If we haven't found an owner name, try clicking on "more info" or similar buttons
+            if not owner_name and fields['has_more_info'] and business_element is not None:
+                owner_name = self.owner_from_more_info(business_element)
 
         except Exception as e:
-            logger.error(f"Error extracting business details: {e}")
+            logger.warning(f"Error extracting owner name: {e}")
+
+        # Only return if we have at least a name
+        if not name:
             return None
 
+        # Format state properly - ensure it's not empty by using the parsed state
+        state = address_components['State'].strip()
+        if not state and address_components['City']:
+            # Try to extract state from city if it contains a comma
+            city_parts = address_components['City'].split(',')
+            if len(city_parts) > 1:
+                state = city_parts[-1].strip()
+
+        details = {
+            'Name': name,
+            'Phone': phone,
+            'Address': f"{address_components['Street Address']}, {address_components['City']}, {state} {address_components['ZIP Code']}".strip(),
+            'Website': website,
+            'Categories': categories,
+            'Owner Name': owner_name,
+            'Source': 'yellowpages'
+        }
+
+        # If website exists, scrape additional details
+        if website and self.enrich_websites:
+            merge_details(details, self.scrape_business_website(website))
+
+        return details
+
+    def extract_page(self, page):
+        """Extract the current page; returns (records, listing count, mode, seconds spent reading the DOM)"""
+        if self.bulk_extract:
+            start = time.perf_counter()
+            try:
+                rows = self.extract_listings_bulk()
+            except WebDriverException as e:
+                logger.warning(f"Bulk extraction failed on page {page}, using per-element lookups: {e}")
+            else:
+                dom_seconds = time.perf_counter() - start
+                logger.info(f"Found {len(rows)} listings on page {page}")
+                page_results = []
+                for index, fields in enumerate(rows, 1):
+                    logger.info(f"Scraping business {index}/{len(rows)} on page {page}")
+                    try:
+                        data = self.details_from_fields(fields, fields.get('element'))
+                    except Exception as e:
+                        logger.error(f"Error extracting business details: {e}")
+                        data = None
+                    if data:
+                        page_results.append(data)
+                return page_results, len(rows), 'bulk', dom_seconds
+
+        start = time.perf_counter()
+        business_elements = self.driver.find_elements(By.CLASS_NAME, 'result')
+        logger.info(f"Found {len(business_elements)} listings on page {page}")
+        page_results = []
+        dom_seconds = time.perf_counter() - start
+        for index, element in enumerate(business_elements, 1):
+            logger.info(f"Scraping business {index}/{len(business_elements)} on page {page}")
+            # Website scraping happens inside extract_business_details; only count the DOM reads
+            field_start = time.perf_counter()
+            try:
+                fields = self.element_fields(element)
+            except Exception as e:
+                logger.error(f"Error extracting business details: {e}")
+                continue
+            dom_seconds += time.perf_counter() - field_start
+            try:
+                data = self.details_from_fields(fields, element)
+            except Exception as e:
+                logger.error(f"Error extracting business details: {e}")
+                data = None
+            if data:
+                page_results.append(data)
+        return page_results, len(business_elements), 'per-element', dom_seconds
+
     def random_delay(self, min_seconds=2, max_seconds=5):
         """Add a random delay between actions"""
         delay = random.uniform(min_seconds, max_seconds)
         time.sleep(delay)
 
-    def scrape_yellowpages(self, search_query, location, min_results=100):
+    def scrape_yellowpages(self, search_query, location, min_results=100, on_page=None):
+        """Scrape result pages until min_results; on_page(platform, page, listings, businesses) gets each page's rows"""
         results = []
         page = 1
         try:
@@ -555,21 +464,22 @@ class YellowPagesScraper:
                     self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
                     time.sleep(2)
 
-                    business_elements = self.driver.find_elements(By.CLASS_NAME, 'result')
-                    if not business_elements:
+                    extract_start = time.perf_counter()
+                    page_results, listing_count, mode, dom_seconds = self.extract_page(page)
+                    if not listing_count:
                         logger.warning(f"No listings found on page {page}")
                         break
-
-                    logger.info(f"Found {len(business_elements)} listings on page {page}")
-
-                    for index, element in enumerate(business_elements, 1):
-                        logger.info(f"Scraping business {index}/{len(business_elements)} on page {page}")
-                        data = self.extract_business_details(element)
-                        if data:
-                            results.append(data)
+                    results.extend(page_results)
+                    logger.info(
+                        f"Page {page}: {len(page_results)} businesses from {listing_count} listings "
+                        f"({mode} extraction: {dom_seconds:.2f}s DOM, "
+                        f"{time.perf_counter() - extract_start:.2f}s including websites)"
+                    )
+                    if on_page:
+                        on_page('yellowpages', page, listing_count, page_results)
 
                     # End if fewer than 30 results on a page (YellowPages default)
-                    if len(business_elements) < 30:
+                    if listing_count < 30:
                         logger.info("Fewer listings found on this page – assuming last page.")
                         break
 
@@ -592,9 +502,9 @@ class YellowPagesScraper:
             time.sleep(1)
 
     def cleanup(self):
-        """Clean up resources by closing the browser."""
+        """Clean up resources by closing the browser (pooled drivers are left to the pool)."""
         try:
-            if hasattr(self, 'driver'):
+            if self.owns_driver and hasattr(self, 'driver'):
                 self.driver.quit()
                 logger.info("WebDriver closed.")
         except Exception as e:
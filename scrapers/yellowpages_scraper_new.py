@@ -1,96 +1,95 @@
-import os
-import json
 import logging
-import tempfile
-from scrapy.crawler import CrawlerProcess
-from scrapy.utils.project import get_project_settings
-from scrapy import signals
-from scrapy.signalmanager import dispatcher
+import threading
+from .crawl_runner import CrawlRunner, CrawlError
 from .yellowpages_spider import YellowPagesSpider
 
 logger = logging.getLogger('yellowpages_scraper')
 
+# Scrapy settings modules by profile name
+SETTINGS_PROFILES = {
+    'default': 'scrapers.scrapy_settings',
+    'throughput': 'scrapers.scrapy_settings_throughput',
+}
+
+# One crawler process per profile, shared by every scraper object
+_runners = {}
+_runner_lock = threading.Lock()
+
+
+def get_crawl_runner(profile='default'):
+    """Return the shared CrawlRunner of a settings profile, created on first use"""
+    if profile not in SETTINGS_PROFILES:
+        raise ValueError(f"Unknown Scrapy settings profile: {profile}")
+    with _runner_lock:
+        if profile not in _runners:
+            _runners[profile] = CrawlRunner(SETTINGS_PROFILES[profile])
+        return _runners[profile]
+
+
 class YellowPagesScraper:
-    def __init__(self):
-        """Initialize the YellowPages scraper with Scrapy settings"""
-        # Set up Scrapy settings
-        settings_module_path = 'scrapers.scrapy_settings'
-        os.environ.setdefault('SCRAPY_SETTINGS_MODULE', settings_module_path)
-        
-        self.settings = get_project_settings()
+    def __init__(self, runner=None, profile='default'):
+        """Scrapy-based YellowPages scraper; crawls run in the profile's shared crawler process"""
+        self.runner = runner or get_crawl_runner(profile)
         self.results = []
-        
-        # Create a temporary directory for HTTP cache
-        self.temp_dir = tempfile.mkdtemp()
-        self.settings.set('HTTPCACHE_DIR', os.path.join(self.temp_dir, 'httpcache'))
-        
-        # Initialize the crawler process
-        self.process = CrawlerProcess(self.settings)
-    
-    def collect_item(self, item, response, spider):
-        """Callback method to collect scraped items"""
-        self.results.append(dict(item))
-    
-    def scrape_yellowpages(self, search_query, location, min_results=100):
+        self.stats = {}
+
+    def scrape_yellowpages(self, search_query, location, min_results=100, on_item=None, timeout=None,
+                           feed_path=None, jobdir=None):
         """
         Scrape YellowPages using Scrapy spider
-        
+
+        Items come out of the crawl's pipelines already in the export schema
+        ('Name', 'Phone', 'Address', ...).
+
         Args:
             search_query (str): The search term to look for
             location (str): The location to search in
             min_results (int): Minimum number of results to gather
-            
+            on_item (callable): Called with each item as soon as it is scraped;
+                items are then not kept in memory here
+            timeout (float): Seconds to wait for the crawl; None waits until it ends
+            feed_path (str): JSON Lines file the crawl appends every item to
+            jobdir (str): Makes the crawl resumable: its scheduler state and
+                checkpoint are kept here, and running it again with the same
+                jobdir and feed_path carries on where it stopped
+
         Returns:
-            list: List of dictionaries containing business information
+            list: List of dictionaries containing business information,
+            or None when on_item receives the items
         """
+        results = [] if on_item is None else None
+        collect_item = results.append if on_item is None else on_item
+        spider_args = {'feed_path': feed_path} if feed_path else {}
+
         try:
             logger.info(f"Starting YellowPages scraping for '{search_query}' in '{location}'")
-            
-            # Reset results for new search
-            self.results = []
-            
-            # Connect the item scraped signal
-            dispatcher.connect(self.collect_item, signal=signals.item_scraped)
-            
-            # Run the spider with parameters
-            self.process.crawl(
+
+            # Only this call waits; the crawler process keeps running other crawls
+            crawl = self.runner.crawl(
                 YellowPagesSpider,
+                on_item=collect_item,
                 search_query=search_query,
                 location=location,
-                min_results=min_results
+                settings={'JOBDIR': jobdir} if jobdir else None,
+                min_results=min_results,
+                **spider_args
             )
-            self.process.start()
-            
-            logger.info(f"Scraping completed. Found {len(self.results)} results")
-            
-            return self.results
-            
+            try:
+                stats = crawl.wait(timeout)
+            except CrawlError:
+                if not crawl.finished:
+                    crawl.cancel()
+                raise
+
+            self.results = results if results is not None else []
+            self.stats = stats
+            logger.info(f"Scraping completed. Found {crawl.items} results ({stats.get('finish_reason', 'finished')})")
+
+            return results
+
         except Exception as e:
             logger.error(f"Error during scraping: {e}")
             raise
-        
-        finally:
-            # Clean up temporary directory
-            try:
-                import shutil
-                if os.path.exists(self.temp_dir):
-                    shutil.rmtree(self.temp_dir)
-            except Exception as e:
-                logger.warning(f"Error cleaning up temporary directory: {e}")
-            
-            # Disconnect the signal
-            try:
-                dispatcher.disconnect(self.collect_item, signal=signals.item_scraped)
-            except Exception as e:
-                logger.warning(f"Error disconnecting signal: {e}")
-    
+
     def cleanup(self):
-        """Clean up resources"""
-        try:
-            # Clean up temporary directory
-            import shutil
-            if os.path.exists(self.temp_dir):
-                shutil.rmtree(self.temp_dir)
-                logger.info("Cleanup completed")
-        except Exception as e:
-            logger.error(f"Error during cleanup: {e}") 
\ No newline at end of file
+        """Nothing to release: the crawler process is shared and stays up for the next crawl"""
@@ -4,8 +4,8 @@ from scrapy.exceptions import CloseSpider
 import re
 import logging
 from urllib.parse import urlencode
-import random
-import time
+from .enrichment_cache import EnrichmentCache
+from .crawl_checkpoint import CrawlCheckpoint, business_key
 
 logger = logging.getLogger('yellowpages_spider')
 
@@ -15,13 +15,13 @@ class YellowPagesSpider(CrawlSpider):
     
     custom_settings = {
         'ROBOTSTXT_OBEY': False,  # YellowPages blocks based on robots.txt
-        'CONCURRENT_REQUESTS': 1,  # Reduce concurrent requests
-        'DOWNLOAD_DELAY': random.uniform(5, 10),  # Random delay between requests
+        # Pacing comes from the download slots in scrapy_settings, not from sleeping
         'COOKIES_ENABLED': True,  # Enable cookies
         'DOWNLOADER_MIDDLEWARES': {
             'scrapy.downloadermiddlewares.useragent.UserAgentMiddleware': None,
-            'scrapy_user_agents.middlewares.RandomUserAgentMiddleware': 400,
+            'scrapers.middlewares.SharedRandomUserAgentMiddleware': 400,
             'scrapy.downloadermiddlewares.retry.RetryMiddleware': 500,
+            'scrapers.middlewares.SlotBackoffMiddleware': 550,
             'scrapy.downloadermiddlewares.httpproxy.HttpProxyMiddleware': 750,
         },
         'RETRY_ENABLED': True,
@@ -30,6 +30,13 @@ class YellowPagesSpider(CrawlSpider):
         'HTTPCACHE_ENABLED': False  # Disable cache to avoid stale responses
     }
 
+    # Rows of this spider's website details in the EnrichmentCache
+    enrichment_extractor = 'yellowpages_spider'
+
+    # Search pages keep the fixed delay of their DOWNLOAD_SLOTS entry; AutoThrottle
+    # would otherwise shrink it towards the (short) page latency
+    search_meta = {'dont_retry': False, 'autothrottle_dont_adjust_delay': True}
+
     def __init__(self, search_query=None, location=None, min_results=100, *args, **kwargs):
         super(YellowPagesSpider, self).__init__(*args, **kwargs)
         self.search_query = search_query
@@ -37,6 +44,27 @@ class YellowPagesSpider(CrawlSpider):
         self.min_results = int(min_results)
         self.results_count = 0
         self.start_urls = [self.get_search_url(1)]
+        self.enrichment_cache = None
+        # Set when the crawl runs with a JOBDIR and can be resumed
+        self.checkpoint = None
+        self.search_pages = set()
+
+    @classmethod
+    def from_crawler(cls, crawler, *args, **kwargs):
+        spider = super(YellowPagesSpider, cls).from_crawler(crawler, *args, **kwargs)
+        path = crawler.settings.get('ENRICHMENT_CACHE_PATH')
+        if path:
+            spider.enrichment_cache = EnrichmentCache(
+                path,
+                ttl_hours=crawler.settings.getfloat('ENRICHMENT_CACHE_TTL_HOURS', 168),
+                max_stale_days=crawler.settings.getfloat('ENRICHMENT_CACHE_MAX_STALE_DAYS', 30)
+            )
+        jobdir = crawler.settings.get('JOBDIR')
+        if jobdir:
+            # Runs before the scheduler opens, so stale Scrapy state can still be dropped
+            spider.checkpoint = CrawlCheckpoint(jobdir, getattr(spider, 'feed_path', None))
+            spider.results_count = len(spider.checkpoint.emitted)
+        return spider
 
     def get_search_url(self, page):
         """Generate search URL for YellowPages"""
@@ -47,6 +75,11 @@ class YellowPagesSpider(CrawlSpider):
         }
         return f'https://www.yellowpages.com/search?{urlencode(params)}'
 
+    async def start(self):
+        """Scrapy 2.13+ entry point; older versions call start_requests directly"""
+        for request in self.start_requests():
+            yield request
+
     def start_requests(self):
         """Override start_requests to add headers"""
         headers = {
@@ -67,29 +100,48 @@ class YellowPagesSpider(CrawlSpider):
             'Referer': 'https://www.google.com/'
         }
         
-        for url in self.start_urls:
-            yield scrapy.Request(
-                url,
-                headers=headers,
-                callback=self.parse,
-                dont_filter=True,
-                meta={'dont_retry': False}
-            )
+        urls = self.start_urls
+        if self.checkpoint is not None and self.checkpoint.resuming:
+            # Scrapy's saved queue carries on by itself; after an unclean stop
+            # the search pages that still had listings to emit are requested again
+            urls = self.checkpoint.unfinished_pages
+            self.search_pages.update(self.checkpoint.pages)
+            logger.info(f"Resuming crawl with {len(self.checkpoint.pages)} unfinished page(s), "
+                        f"{self.results_count} results already saved")
+
+        for url in urls:
+            yield self.search_request(url, headers)
+
+    def search_request(self, url, headers=None, dont_filter=True):
+        self.search_pages.add(url)
+        if self.checkpoint is not None:
+            self.checkpoint.page_requested(url)
+        return scrapy.Request(
+            url,
+            headers=headers,
+            callback=self.parse,
+            dont_filter=dont_filter,
+            meta={**self.search_meta, 'search_url': url}
+        )
 
     def parse(self, response):
         """Parse the search results page"""
         # Check if we got a 403 error
         if response.status == 403:
+            # SlotBackoffMiddleware has already lengthened this site's delay, so
+            # the scheduler holds the retry back without blocking other requests
             logger.warning("Received 403 error, retrying with delay...")
-            time.sleep(random.uniform(10, 15))  # Add longer delay
-            yield scrapy.Request(
-                response.url,
-                callback=self.parse,
-                dont_filter=True,
-                meta={'dont_retry': False}
-            )
+            yield self.search_request(response.meta.get('search_url', response.url))
             return
 
+        page_url = response.meta.get('search_url', response.url)
+        try:
+            yield from self.parse_listings(response, page_url)
+        finally:
+            if self.checkpoint is not None:
+                self.checkpoint.page_parsed(page_url)
+
+    def parse_listings(self, response, page_url):
         businesses = response.css('.result')
         
         if not businesses:
@@ -116,73 +168,135 @@ class YellowPagesSpider(CrawlSpider):
             item = {k: v for k, v in item.items() if v}
             
             if item.get('name'):  # Only yield if we have at least a business name
+                if self.checkpoint is not None and self.checkpoint.seen(business_key(item['name'], item.get('phone'))):
+                    continue  # Emitted before this crawl was resumed
+
                 self.results_count += 1
                 
                 # If website exists, follow it to get more details
-                if item.get('website'):
-                    yield scrapy.Request(
-                        item['website'],
-                        callback=self.parse_business_website,
-                        meta={
-                            'item': item,
-                            'dont_retry': False,
-                            'download_timeout': 30
-                        },
-                        errback=self.handle_website_error,
-                        dont_filter=True,
-                        headers=response.request.headers  # Reuse the same headers
-                    )
+                cached = None
+                if item.get('website') and self.enrichment_cache is not None:
+                    cached = self.enrichment_cache.lookup(item['website'], self.enrichment_extractor)
+                if cached is not None and cached.fresh:
+                    # Seen on an earlier run recently enough; skip the website entirely
+                    item.update(cached.details)
+                    yield from self.emit(item, page_url)
+                elif item.get('website'):
+                    if self.checkpoint is not None:
+                        self.checkpoint.request_added(page_url)
+                    yield self.website_request(item, response.request.headers, cached, page_url)
                 else:
-                    yield item
-
-            # Add random delay between business processing
-            time.sleep(random.uniform(1, 3))
+                    yield from self.emit(item, page_url)
 
         # Follow pagination if we need more results
         if self.results_count < self.min_results:
             next_page = response.css('a.next::attr(href)').get()
-            if next_page:
-                # Add random delay before next page
-                time.sleep(random.uniform(5, 8))
-                yield response.follow(
-                    next_page,
-                    callback=self.parse,
+            # A resumed crawl may already have this page queued
+            if next_page and response.urljoin(next_page) not in self.search_pages:
+                # The yellowpages.com slot delay spaces out the next page
+                yield self.search_request(
+                    response.urljoin(next_page),
                     headers=response.request.headers,  # Reuse the same headers
-                    meta={'dont_retry': False}
+                    dont_filter=False
                 )
 
+    def emit(self, item, page_url, from_request=False):
+        """Yield item unless a resumed crawl already emitted it, and record it in the checkpoint"""
+        if self.checkpoint is None:
+            yield item
+            return
+        if self.checkpoint.item_emitted(business_key(item.get('name'), item.get('phone'))):
+            yield item
+        if from_request:
+            self.checkpoint.request_done(page_url)
+
+    def website_request(self, item, headers, cached=None, page_url=None):
+        """Request for a business website, conditional when a cached entry can be revalidated"""
+        headers = headers.copy()  # Reuse the same headers
+        meta = {
+            'item': item,
+            'search_url': page_url,
+            'dont_retry': False,
+            'download_timeout': 30
+        }
+        validators = cached.validators(item['website']) if cached is not None else {}
+        if validators:
+            headers.update(validators)
+            meta['cache_entry'] = cached
+            meta['handle_httpstatus_list'] = [304]
+        return scrapy.Request(
+            item['website'],
+            callback=self.parse_business_website,
+            meta=meta,
+            errback=self.handle_website_error,
+            dont_filter=True,
+            headers=headers
+        )
+
     def parse_business_website(self, response):
         """Extract additional information from business website"""
         item = response.meta['item']
-        
+        cached = response.meta.get('cache_entry')
+
+        if response.status == 304 and cached is not None:
+            # Unchanged since it was cached; the stored details are still right
+            self.enrichment_cache.touch(item['website'], self.enrichment_extractor)
+            item.update(cached.details)
+            yield from self.emit(item, response.meta.get('search_url'), from_request=True)
+            return
+
+        details = self.extract_website_details(response)
+        item.update(details)
+        if self.enrichment_cache is not None:
+            self.enrichment_cache.store(
+                item['website'], self.enrichment_extractor, details,
+                self.header_text(response, 'ETag'), self.header_text(response, 'Last-Modified')
+            )
+
+        yield from self.emit(item, response.meta.get('search_url'), from_request=True)
+
+    def extract_website_details(self, response):
+        """Emails, phones, description and social links found on a business website"""
+        details = {}
+
         # Extract email addresses
         emails = self.extract_emails(response.text)
         if emails:
-            item['additional_emails'] = emails
+            details['additional_emails'] = emails
 
         # Extract additional phone numbers
         phones = self.extract_phones(response.text)
         if phones:
-            item['additional_phones'] = phones
+            details['additional_phones'] = phones
 
         # Extract business description
         description = self.extract_description(response)
         if description:
-            item['website_description'] = description
+            details['website_description'] = description
 
         # Extract social media links
         social_links = self.extract_social_links(response)
         if social_links:
-            item['social_media'] = social_links
+            details['social_media'] = social_links
+
+        return details
 
-        yield item
+    @staticmethod
+    def header_text(response, name):
+        value = response.headers.get(name)
+        return value.decode('latin-1') if value else None
 
     def handle_website_error(self, failure):
         """Handle errors when scraping business websites"""
         item = failure.request.meta['item']
         item['website_status'] = 'error'
         item['website_error'] = str(failure.value)
-        return item
+        yield from self.emit(item, failure.request.meta.get('search_url'), from_request=True)
+
+    def closed(self, reason):
+        if self.checkpoint is not None:
+            # Scrapy has written its queue and fingerprints by now; a resume may use them
+            self.checkpoint.close(clean=True)
 
     def extract_text(self, selector, css_path):
         """Extract and clean text using CSS selector"""
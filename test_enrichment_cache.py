@@ -0,0 +1,72 @@
+import asyncio
+
+from aiohttp import web
+
+from scrapers.enrichment import WebsiteEnricher
+from scrapers.enrichment_cache import EnrichmentCache, site_key
+from scrapers.http_client import close_session
+
+DETAILS = {'Additional Emails': 'alpha@example.com', 'Website Status': 'Active'}
+
+
+def test_site_key_separates_pages_on_a_shared_host():
+    assert site_key('https://www.facebook.com/alpha-plumbing') != site_key('https://facebook.com/beta-roofing')
+    assert site_key('sites.google.com/view/alpha') == 'sites.google.com/view/alpha'
+    # A business's own site is the same entry however it is written
+    assert site_key('https://www.alpha.com/') == site_key('http://alpha.com') == 'alpha.com'
+
+
+def test_pages_on_the_same_host_do_not_share_details(tmp_path):
+    cache = EnrichmentCache(str(tmp_path / 'enrichment.sqlite3'))
+    cache.store('https://facebook.com/alpha-plumbing', 'app', DETAILS)
+
+    assert cache.lookup('https://facebook.com/beta-roofing', 'app') is None
+    assert cache.lookup('https://www.facebook.com/alpha-plumbing/', 'app').details == DETAILS
+
+
+def test_lookup_ignores_entries_keyed_by_host_alone(tmp_path):
+    cache = EnrichmentCache(str(tmp_path / 'enrichment.sqlite3'))
+    # A row written when entries were keyed by host only
+    cache._connect().execute(
+        "INSERT INTO enrichment (domain, extractor, url, details, fetched_at) VALUES (?, ?, ?, ?, strftime('%s'))",
+        ('linktr.ee', 'app', 'https://linktr.ee/alpha', '{}')
+    )
+    assert cache.lookup('https://linktr.ee', 'app') is None
+
+
+def test_enricher_fetches_each_page_on_a_shared_host(tmp_path):
+    pages = {
+        '/alpha-plumbing': 'Contact alpha@example.com',
+        '/beta-roofing': 'Contact beta@example.com',
+    }
+    requested = []
+
+    async def page(request):
+        requested.append(request.path)
+        return web.Response(text=f'<html><body>{pages[request.path]}</body></html>', content_type='text/html')
+
+    async def run():
+        app = web.Application()
+        app.router.add_get('/{name}', page)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port = runner.addresses[0][1]
+        enricher = WebsiteEnricher(cache=EnrichmentCache(str(tmp_path / 'enrichment.sqlite3')))
+        try:
+            alpha = await enricher.fetch_details(f'http://127.0.0.1:{port}/alpha-plumbing')
+            beta = await enricher.fetch_details(f'http://127.0.0.1:{port}/beta-roofing')
+            alpha_again = await enricher.fetch_details(f'http://127.0.0.1:{port}/alpha-plumbing')
+        finally:
+            await close_session()
+            await runner.cleanup()
+        return alpha, beta, alpha_again
+
+    alpha, beta, alpha_again = asyncio.run(run())
+
+    assert alpha['Additional Emails'] == 'alpha@example.com'
+    assert beta['Additional Emails'] == 'beta@example.com'
+    assert alpha_again == alpha
+    # The second business's page is fetched, the repeat of the first comes from the cache
+    assert requested == ['/alpha-plumbing', '/beta-roofing']